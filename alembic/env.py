@@ -1,54 +1,44 @@
+import asyncio
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
-import os
 import sys
 from pathlib import Path
 
-# Get the absolute path to the app directory
-app_dir = str(Path(__file__).parent.parent / "app")
-if app_dir not in sys.path:
-    sys.path.insert(0, app_dir)
+# Make the project root importable, so `import app...` works from any cwd
+project_dir = str(Path(__file__).parent.parent)
+if project_dir not in sys.path:
+    sys.path.insert(0, project_dir)
 
-try:
-    from app.database.base import Base
-    from app.config import settings
-    print(f"✅ Loaded Base metadata and settings")
-except ImportError as e:
-    print(f"⚠️  Warning: Could not load app models: {e}")
-    Base = None
-    settings = None
+from app.config import settings
+from app.database.database import Base
+from app.database.migrations import include_object
+# Register every table on Base.metadata for autogenerate
+from app.models import comments, friendships, likes, posts, roles, search, timeline, trending, users  # noqa: F401
 
 # this is the Alembic Config object
 config = context.config
 
-# Interpret the config file for Python logging
-if config.config_file_name is not None:
+# Interpret the config file for Python logging (not when the app runs us)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # Model's MetaData object for 'autogenerate' support
-if Base is not None:
-    target_metadata = Base.metadata
-else:
-    target_metadata = None
+target_metadata = Base.metadata
 
-# Set the database URL from settings
-if settings is not None:
-    db_url = settings.get_db_url
-else:
-    # Fallback to SQLite
-    db_url = "sqlite:///betony.db"
 
-config.set_main_option('sqlalchemy.url', db_url)
+# The app's database, not the placeholder URL in alembic.ini
+db_url = settings.get_db_url
+config.set_main_option("sqlalchemy.url", db_url)
 
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
-    url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url,
+        url=db_url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,29 +47,37 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
-    configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = db_url
-    
-    # For SQLite, use StaticPool to avoid threading issues
-    connectable = engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.StaticPool,
-        echo=False,
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        compare_type=True,
+        compare_server_default=True,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, 
-            target_metadata=target_metadata,
-            compare_type=True,
-            compare_server_default=True,
-        )
+    with context.begin_transaction():
+        context.run_migrations()
 
-        with context.begin_transaction():
-            context.run_migrations()
+
+async def run_async_migrations() -> None:
+    """The URL is async (aiosqlite / asyncpg): run the migrations through run_sync"""
+    connectable = create_async_engine(db_url, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode."""
+    # Startup (app/database/migrations.py) passes in a connection of the shared engine
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,40 @@
+"""Add posts.comments_count and backfill the post counters
+
+Revision ID: 002_post_counters
+Revises: 001_initial
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "002_post_counters"
+down_revision: Union[str, None] = "001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'posts',
+        sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    print("✅ Added column: posts.comments_count")
+
+    # Counters were never maintained before this revision
+    op.execute(
+        """
+        UPDATE posts SET
+            likes_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id),
+            comments_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+        """
+    )
+    print("✅ Backfilled posts.likes_count and posts.comments_count")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.drop_column('comments_count')
+    print("✅ Dropped column: posts.comments_count")
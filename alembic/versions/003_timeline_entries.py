@@ -0,0 +1,56 @@
+"""Add the fan-out-on-write home timeline table
+
+Revision ID: 003_timeline_entries
+Revises: 002_post_counters
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003_timeline_entries"
+down_revision: Union[str, None] = "002_post_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'timeline_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    op.create_index('ix_timeline_entries_user_created', 'timeline_entries', ['user_id', 'created_at', 'post_id'])
+    op.create_index('ix_timeline_entries_user_author', 'timeline_entries', ['user_id', 'author_id'])
+    print("✅ Created table: timeline_entries")
+
+    # Seed every reader's timeline with their own and their friends' posts
+    op.execute(
+        """
+        INSERT INTO timeline_entries (user_id, post_id, author_id, created_at)
+        SELECT readers.reader_id, posts.id, posts.user_id, posts.created_at
+        FROM posts
+        JOIN (
+            SELECT user_id AS author_id, user_id AS reader_id FROM posts GROUP BY user_id
+            UNION SELECT user_id, friend_id FROM friendships
+            UNION SELECT friend_id, user_id FROM friendships
+        ) AS readers ON readers.author_id = posts.user_id
+        """
+    )
+    print("✅ Backfilled timeline_entries")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timeline_entries_user_author', table_name='timeline_entries')
+    op.drop_index('ix_timeline_entries_user_created', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
+    print("✅ Dropped table: timeline_entries")
@@ -0,0 +1,25 @@
+"""Index likes by (user_id, post_id) for the per-viewer liked_by_me lookup
+
+Revision ID: 004_likes_user_post_index
+Revises: 003_timeline_entries
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "004_likes_user_post_index"
+down_revision: Union[str, None] = "003_timeline_entries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_likes_user_post', 'likes', ['user_id', 'post_id'])
+    print("✅ Created index: ix_likes_user_post")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_likes_user_post', table_name='likes')
+    print("✅ Dropped index: ix_likes_user_post")
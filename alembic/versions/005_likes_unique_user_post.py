@@ -0,0 +1,67 @@
+"""Make (user_id, post_id) unique on likes for the atomic like toggle
+
+Revision ID: 005_likes_unique_user_post
+Revises: 004_likes_user_post_index
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005_likes_unique_user_post"
+down_revision: Union[str, None] = "004_likes_user_post_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 001's UniqueConstraint('user_id', 'post_id') is unnamed; on SQLite batch
+# mode needs a name to drop it by
+NAMING_CONVENTION = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _unique_constraint(table: str, columns: list[str]) -> str | None:
+    """Name to drop the unique constraint on exactly `columns` by, None if there is none"""
+    for constraint in sa.inspect(op.get_bind()).get_unique_constraints(table):
+        if constraint['column_names'] == columns:
+            return constraint['name'] or NAMING_CONVENTION['uq'] % {'table_name': table, 'column_0_name': columns[0]}
+    return None
+
+
+def upgrade() -> None:
+    # Databases built with create_all had no constraint: keep the oldest like of each pair
+    op.execute(
+        """
+        DELETE FROM likes
+        WHERE id NOT IN (SELECT MIN(id) FROM likes GROUP BY user_id, post_id)
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts SET likes_count = (
+            SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id
+        )
+        """
+    )
+    print("✅ Removed duplicate likes")
+
+    # The named index replaces 001's constraint instead of duplicating it;
+    # create_all databases never had the constraint
+    constraint = _unique_constraint('likes', ['user_id', 'post_id'])
+    if constraint is not None:
+        with op.batch_alter_table('likes', naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(constraint, type_='unique')
+        print(f"✅ Dropped unique constraint: {constraint}")
+
+    op.drop_index('ix_likes_user_post', table_name='likes')
+    op.create_index('uq_likes_user_post', 'likes', ['user_id', 'post_id'], unique=True)
+    print("✅ Created unique index: uq_likes_user_post")
+
+
+def downgrade() -> None:
+    op.drop_index('uq_likes_user_post', table_name='likes')
+    op.create_index('ix_likes_user_post', 'likes', ['user_id', 'post_id'])
+    # Back to 001's table constraint
+    with op.batch_alter_table('likes', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_unique_constraint('uq_likes_user_id', ['user_id', 'post_id'])
+    print("✅ Dropped unique index: uq_likes_user_post, restored the unique constraint")
@@ -0,0 +1,115 @@
+"""Add FTS5 full-text indexes over posts and comments (GIN tsvector indexes on PostgreSQL)
+
+Revision ID: 006_search_fts
+Revises: 005_likes_unique_user_post
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006_search_fts"
+down_revision: Union[str, None] = "005_likes_unique_user_post"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKENIZE = "unicode61 remove_diacritics 2"
+PREFIX = "2 3"
+
+# Must match posts_tsvector()/comments_tsvector() in app/models/search.py
+POSTS_TSVECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'B')"
+)
+COMMENTS_TSVECTOR = "to_tsvector('simple', coalesce(content, ''))"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(f"CREATE INDEX ix_posts_search ON posts USING gin (({POSTS_TSVECTOR}))")
+        op.execute(f"CREATE INDEX ix_comments_search ON comments USING gin (({COMMENTS_TSVECTOR}))")
+        print("✅ Created GIN indexes: ix_posts_search, ix_comments_search")
+        return
+
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE posts_fts USING fts5(
+            title, content, content='posts', content_rowid='id',
+            tokenize='{TOKENIZE}', prefix='{PREFIX}'
+        )
+        """
+    )
+    op.execute("INSERT INTO posts_fts(posts_fts, rank) VALUES('rank', 'bm25(10.0, 1.0)')")
+    op.execute(
+        """
+        CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+        """
+    )
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES('rebuild')")
+    print("✅ Created and filled: posts_fts")
+
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE comments_fts USING fts5(
+            content, content='comments', content_rowid='id',
+            tokenize='{TOKENIZE}', prefix='{PREFIX}'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_fts_ai AFTER INSERT ON comments BEGIN
+            INSERT INTO comments_fts(rowid, content) VALUES (new.id, new.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_fts_ad AFTER DELETE ON comments BEGIN
+            INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_fts_au AFTER UPDATE OF content ON comments BEGIN
+            INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO comments_fts(rowid, content) VALUES (new.id, new.content);
+        END
+        """
+    )
+    op.execute("INSERT INTO comments_fts(comments_fts) VALUES('rebuild')")
+    print("✅ Created and filled: comments_fts")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_comments_search")
+        op.execute("DROP INDEX IF EXISTS ix_posts_search")
+        print("✅ Dropped full-text indexes")
+        return
+
+    for trigger in ("comments_fts_au", "comments_fts_ad", "comments_fts_ai",
+                    "posts_fts_au", "posts_fts_ad", "posts_fts_ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS comments_fts")
+    op.execute("DROP TABLE IF EXISTS posts_fts")
+    print("✅ Dropped full-text indexes")
@@ -0,0 +1,42 @@
+"""Add precomputed trending scores and the updated_at index the recompute walks
+
+Revision ID: 007_post_scores
+Revises: 006_search_fts
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007_post_scores"
+down_revision: Union[str, None] = "006_search_fts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'post_scores',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+        sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_post_scores_score', 'post_scores', ['score', 'post_id'])
+    print("✅ Created table: post_scores")
+
+    op.create_index('ix_posts_updated_at', 'posts', ['updated_at'])
+    print("✅ Created index: ix_posts_updated_at")
+    # Scores are filled by the first background recompute after startup
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_updated_at', table_name='posts')
+    op.drop_index('ix_post_scores_score', table_name='post_scores')
+    op.drop_table('post_scores')
+    print("✅ Dropped table: post_scores")
@@ -0,0 +1,78 @@
+"""Index every hot query path: likes, comments, feed pages and friendships
+
+Revision ID: 008_hot_path_indexes
+Revises: 007_post_scores
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008_hot_path_indexes"
+down_revision: Union[str, None] = "007_post_scores"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 001's UniqueConstraint('user_id', 'friend_id') is unnamed; on SQLite batch
+# mode needs a name to drop it by
+NAMING_CONVENTION = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _unique_constraint(table: str, columns: list[str]) -> str | None:
+    """Name to drop the unique constraint on exactly `columns` by, None if there is none"""
+    for constraint in sa.inspect(op.get_bind()).get_unique_constraints(table):
+        if constraint['column_names'] == columns:
+            return constraint['name'] or NAMING_CONVENTION['uq'] % {'table_name': table, 'column_0_name': columns[0]}
+    return None
+
+
+def upgrade() -> None:
+    # post_id first: per-post like lists and counts become a range scan, the
+    # ON CONFLICT (user_id, post_id) of the like toggle still matches it
+    op.drop_index('uq_likes_user_post', table_name='likes')
+    op.create_index('uq_likes_post_user', 'likes', ['post_id', 'user_id'], unique=True)
+    op.create_index('ix_likes_user_created', 'likes', ['user_id', 'created_at'])
+    print("✅ Created indexes: uq_likes_post_user, ix_likes_user_created")
+
+    op.create_index('ix_comments_post_created', 'comments', ['post_id', 'created_at'])
+    op.create_index('ix_comments_user_created', 'comments', ['user_id', 'created_at'])
+    print("✅ Created indexes: ix_comments_post_created, ix_comments_user_created")
+
+    op.create_index('ix_posts_created_id', 'posts', ['created_at', 'id'])
+    op.create_index('ix_posts_user_created', 'posts', ['user_id', 'created_at'])
+    print("✅ Created indexes: ix_posts_created_id, ix_posts_user_created")
+
+    # Nothing stopped a repeated friend request before: keep the oldest row of each pair
+    op.execute(
+        """
+        DELETE FROM friendships
+        WHERE id NOT IN (SELECT MIN(id) FROM friendships GROUP BY user_id, friend_id)
+        """
+    )
+    print("✅ Removed duplicate friendships")
+    # The named index replaces 001's identical constraint instead of stacking on it
+    constraint = _unique_constraint('friendships', ['user_id', 'friend_id'])
+    if constraint is not None:
+        with op.batch_alter_table('friendships', naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(constraint, type_='unique')
+        print(f"✅ Dropped unique constraint: {constraint}")
+    op.create_index('uq_friendships_user_friend', 'friendships', ['user_id', 'friend_id'], unique=True)
+    op.create_index('ix_friendships_friend_created', 'friendships', ['friend_id', 'created_at'])
+    print("✅ Created indexes: uq_friendships_user_friend, ix_friendships_friend_created")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_friendships_friend_created', table_name='friendships')
+    op.drop_index('uq_friendships_user_friend', table_name='friendships')
+    with op.batch_alter_table('friendships', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_unique_constraint('uq_friendships_user_id', ['user_id', 'friend_id'])
+    op.drop_index('ix_posts_user_created', table_name='posts')
+    op.drop_index('ix_posts_created_id', table_name='posts')
+    op.drop_index('ix_comments_user_created', table_name='comments')
+    op.drop_index('ix_comments_post_created', table_name='comments')
+    op.drop_index('ix_likes_user_created', table_name='likes')
+    op.drop_index('uq_likes_post_user', table_name='likes')
+    op.create_index('uq_likes_user_post', 'likes', ['user_id', 'post_id'], unique=True)
+    print("✅ Dropped hot path indexes")
@@ -0,0 +1,56 @@
+"""Add the columns the models have but 001 never created
+
+Databases used to be created with create_all, which took the columns from
+the models, so nothing noticed: users/roles created_at and updated_at,
+roles.description, likes/friendships updated_at. Startup now builds the
+schema with these migrations, so they have to match the models.
+
+Revision ID: 009_model_timestamps
+Revises: 008_hot_path_indexes
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009_model_timestamps"
+down_revision: Union[str, None] = "008_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MISSING = {
+    'users': ['created_at', 'updated_at'],
+    'roles': ['description', 'created_at', 'updated_at'],
+    'likes': ['updated_at'],
+    'friendships': ['updated_at'],
+}
+
+
+def _column(name: str) -> sa.Column:
+    if name == 'description':
+        return sa.Column('description', sa.String(length=255), nullable=True)
+    return sa.Column(name, sa.DateTime(), nullable=False, server_default=sa.func.now())
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in MISSING.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        columns = [name for name in columns if name not in existing]
+        if not columns:
+            continue
+        # SQLite can't ADD COLUMN ... NOT NULL DEFAULT CURRENT_TIMESTAMP: rebuild the table
+        with op.batch_alter_table(table, recreate='always' if op.get_bind().dialect.name == 'sqlite' else 'auto') as batch:
+            for name in columns:
+                batch.add_column(_column(name))
+        print(f"✅ Added to {table}: {', '.join(columns)}")
+
+
+def downgrade() -> None:
+    for table, columns in MISSING.items():
+        with op.batch_alter_table(table) as batch:
+            for name in columns:
+                batch.drop_column(name)
+    print("✅ Dropped model timestamp columns")
@@ -0,0 +1,43 @@
+"""Store each user's friendship count for the timeline push/pull decision
+
+Revision ID: 010_user_friendships_count
+Revises: 009_model_timestamps
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010_user_friendships_count"
+down_revision: Union[str, None] = "009_model_timestamps"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('friendships_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    print("✅ Added column: users.friendships_count")
+
+    op.execute(
+        """
+        UPDATE users SET friendships_count =
+            (SELECT COUNT(*) FROM friendships WHERE friendships.user_id = users.id)
+            + (SELECT COUNT(*) FROM friendships WHERE friendships.friend_id = users.id)
+        """
+    )
+    print("✅ Backfilled users.friendships_count")
+
+    op.create_index('ix_users_friendships_count', 'users', ['friendships_count'])
+    print("✅ Created index: ix_users_friendships_count")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_friendships_count', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('friendships_count')
+    print("✅ Dropped column: users.friendships_count")
@@ -0,0 +1,43 @@
+"""Track post activity apart from updated_at for the trending recompute
+
+Like and comment counter bumps used to move posts.updated_at, and the
+trending recompute walked ix_posts_updated_at to find touched posts. Bumps
+now set activity_at instead and updated_at only changes on edits.
+
+Revision ID: 011_post_activity_at
+Revises: 010_user_friendships_count
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011_post_activity_at"
+down_revision: Union[str, None] = "010_user_friendships_count"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable: SQLite can only ADD COLUMN with a constant default, and
+    # rebuilding posts would drop its FTS triggers
+    op.add_column('posts', sa.Column('activity_at', sa.DateTime(), nullable=True))
+    print("✅ Added column: posts.activity_at")
+
+    # Until now updated_at carried the activity
+    op.execute("UPDATE posts SET activity_at = updated_at")
+    print("✅ Backfilled posts.activity_at")
+
+    op.drop_index('ix_posts_updated_at', table_name='posts')
+    op.create_index('ix_posts_activity_at', 'posts', ['activity_at'])
+    print("✅ Replaced index: ix_posts_updated_at -> ix_posts_activity_at")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_activity_at', table_name='posts')
+    op.create_index('ix_posts_updated_at', 'posts', ['updated_at'])
+    # In place (SQLite 3.35+), not batch: a rebuild would drop the FTS triggers
+    op.drop_column('posts', 'activity_at')
+    print("✅ Dropped column: posts.activity_at")
@@ -1,6 +1,6 @@
 from sqladmin import Admin, ModelView
 from sqlalchemy.ext.asyncio import AsyncEngine
-from fastapi import FastAPI
+from starlette.applications import Starlette
 import logging
 
 from app.models.users import UserModel
@@ -65,7 +65,10 @@ class FriendshipAdmin(ModelView, model=FriendshipModel):
     column_sortable_list = [FriendshipModel.id, FriendshipModel.created_at]
 
 
-def setup_admin(app: FastAPI, engine: AsyncEngine):
+VIEWS = (RoleAdmin, UserAdmin, PostAdmin, CommentAdmin, LikeAdmin, FriendshipAdmin)
+
+
+def setup_admin(app: Starlette, engine: AsyncEngine) -> Admin:
     """
     Setup SQLAdmin with the FastAPI app
     Access at: http://localhost:8000/admin
@@ -79,12 +82,8 @@ def setup_admin(app: FastAPI, engine: AsyncEngine):
         )
         
         # Register all model views
-        admin.add_view(RoleAdmin)
-        admin.add_view(UserAdmin)
-        admin.add_view(PostAdmin)
-        admin.add_view(CommentAdmin)
-        admin.add_view(LikeAdmin)
-        admin.add_view(FriendshipAdmin)
+        for view in VIEWS:
+            admin.add_view(view)
         
         logger.info("✅ SQLAdmin initialized successfully")
         print("✅ SQLAdmin models registered")
@@ -95,3 +94,8 @@ def setup_admin(app: FastAPI, engine: AsyncEngine):
         import traceback
         traceback.print_exc()
         raise
+
+
+def build_admin(engine: AsyncEngine) -> Starlette:
+    """The admin as a standalone ASGI app, for app/lazy_admin.py to serve under /admin"""
+    return setup_admin(Starlette(), engine).admin
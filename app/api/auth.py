@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from pydantic import BaseModel
 from starlette.responses import Response
 import traceback
 import json
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.future import select
 
 from app.api.dependencies import DBDep, get_current_user
@@ -13,6 +13,7 @@ from app.schemes.users import SUserAddRequest
 from app.models.posts import PostModel
 from app.models.friendships import FriendshipModel
 from app.models.likes import LikeModel
+from app.services.timeline import friendship_added_task, friendship_removed_task
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -235,26 +236,28 @@ async def get_friends(db: DBDep, current_user: UserModel = Depends(get_current_u
     try:
         print(f"[API] Getting friends for user {current_user.id}")
         
-        # Get all friendships where current user is involved
+        # Friends on either side of the friendship, loaded with the friendships in one query
+        friend_id = case(
+            (FriendshipModel.user_id == current_user.id, FriendshipModel.friend_id),
+            else_=FriendshipModel.user_id,
+        )
         result = await db.session.execute(
-            select(FriendshipModel).where(
+            select(UserModel)
+            .join(FriendshipModel, UserModel.id == friend_id)
+            .where(
                 (FriendshipModel.user_id == current_user.id) | (FriendshipModel.friend_id == current_user.id)
             )
+            .order_by(FriendshipModel.id)
         )
-        friendships = result.scalars().all()
         
         friends = []
-        for friendship in friendships:
-            # Get the friend's ID (the other person in the friendship)
-            friend_id = friendship.friend_id if friendship.user_id == current_user.id else friendship.user_id
-            friend = await db.session.get(UserModel, friend_id)
-            if friend:
-                friends.append({
-                    "id": friend.id,
-                    "name": friend.name,
-                    "email": friend.email,
-                    "is_admin": bool(friend.is_admin) if friend.is_admin is not None else False,
-                })
+        for friend in result.scalars():
+            friends.append({
+                "id": friend.id,
+                "name": friend.name,
+                "email": friend.email,
+                "is_admin": bool(friend.is_admin) if friend.is_admin is not None else False,
+            })
         
         return friends
     except Exception as e:
@@ -267,7 +270,12 @@ async def get_friends(db: DBDep, current_user: UserModel = Depends(get_current_u
 
 
 @router.post("/users/{user_id}/friend")
-async def add_friend(db: DBDep, user_id: int, current_user: UserModel = Depends(get_current_user)) -> dict:
+async def add_friend(
+    db: DBDep,
+    user_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: UserModel = Depends(get_current_user),
+) -> dict:
     """Add a friend"""
     try:
         print(f"[API] Adding friend {user_id} for user {current_user.id}")
@@ -302,7 +310,9 @@ async def add_friend(db: DBDep, user_id: int, current_user: UserModel = Depends(
         # Create friendship
         friendship = FriendshipModel(user_id=current_user.id, friend_id=user_id)
         db.session.add(friendship)
+        await db.friendships.bump_counts(current_user.id, user_id, 1)
         await db.commit()
+        background_tasks.add_task(friendship_added_task, current_user.id, user_id)
         
         return {"status": "OK", "message": "Friend added successfully"}
     except HTTPException:
@@ -318,7 +328,12 @@ async def add_friend(db: DBDep, user_id: int, current_user: UserModel = Depends(
 
 
 @router.delete("/users/{user_id}/friend")
-async def remove_friend(db: DBDep, user_id: int, current_user: UserModel = Depends(get_current_user)) -> dict:
+async def remove_friend(
+    db: DBDep,
+    user_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: UserModel = Depends(get_current_user),
+) -> dict:
     """Remove a friend"""
     try:
         print(f"[API] Removing friend {user_id} for user {current_user.id}")
@@ -339,7 +354,9 @@ async def remove_friend(db: DBDep, user_id: int, current_user: UserModel = Depen
             )
         
         await db.session.delete(friendship)
+        await db.friendships.bump_counts(friendship.user_id, friendship.friend_id, -1)
         await db.commit()
+        background_tasks.add_task(friendship_removed_task, current_user.id, user_id)
         
         return {"status": "OK", "message": "Friend removed successfully"}
     except HTTPException:
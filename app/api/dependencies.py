@@ -1,25 +1,101 @@
 from typing import Annotated
 
 from fastapi import Depends, Request
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from app.database.database import async_session_maker
+from app.database.database import async_session_maker, read_session_maker
 from app.exceptions.auth import (
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
     NoAccessTokenHTTPError,
 )
+from app.exceptions.exceptions import InvalidInclude
 from app.services.auth import AuthService
 from app.database.db_manager import DBManager
 from app.models.users import UserModel
+from app.utils.pagination import Keyset, decode_cursor
 
 
 class PaginationParams(BaseModel):
-    page: int | None = Field(default=1, ge=1)
-    per_page: int | None = Field(default=5, ge=1, le=30)
+    """
+    Keyset pagination with an offset fallback.
+    Passing `cursor` (an empty value for the first page) switches the endpoint
+    to cursor mode, which answers with `{items, next_cursor}`.
+    Without it the legacy `skip`/`limit` list is returned.
+    """
+    cursor: str | None = None
+    skip: int = Field(default=0, ge=0)
+    limit: int = Field(default=100, ge=1, le=500)
+
+    _before: Keyset | None = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        # Decoded while resolving the dependency so a bad cursor is a 400
+        if self.cursor:
+            self._before = decode_cursor(self.cursor)
+
+    @property
+    def is_keyset(self) -> bool:
+        return self.cursor is not None
+
+    @property
+    def before(self) -> Keyset | None:
+        return self._before
+
+    @property
+    def fetch_limit(self) -> int:
+        # One extra row tells whether there is a next page
+        return self.limit + 1 if self.is_keyset else self.limit
+
+
+class CommentPaginationParams(PaginationParams):
+    """Comment listings keep the 20 per page they had before cursors"""
+    limit: int = Field(default=20, ge=1, le=500)
+
+
+class UnboundedPaginationParams(PaginationParams):
+    """
+    For lists that had no limit before cursors (/likes/user/{id}): the legacy
+    list still returns everything unless `limit` is passed, cursor pages
+    default to 100.
+    """
+    limit: int | None = Field(default=None, ge=1, le=500)
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.limit is None and self.is_keyset:
+            self.limit = 100
 
 
 PaginationDep = Annotated[PaginationParams, Depends()]
+CommentPaginationDep = Annotated[CommentPaginationParams, Depends()]
+UnboundedPaginationDep = Annotated[UnboundedPaginationParams, Depends()]
+
+
+FEED_INCLUDES = {"comments_preview"}
+
+
+class FeedIncludeParams(BaseModel):
+    """Optional extras embedded in feed pages, e.g. `include=comments_preview&preview_size=3`"""
+    include: str | None = None
+    preview_size: int = Field(default=3, ge=1, le=20)
+
+    def model_post_init(self, __context) -> None:
+        if self.include and self._parts() - FEED_INCLUDES:
+            raise InvalidInclude(sorted(self._parts() - FEED_INCLUDES))
+
+    def _parts(self) -> set[str]:
+        return {part.strip() for part in (self.include or "").split(",") if part.strip()}
+
+    @property
+    def comments_preview(self) -> int:
+        """Comments to embed per post, 0 when not requested"""
+        if "comments_preview" in self._parts():
+            return self.preview_size
+        return 0
+
+
+FeedIncludeDep = Annotated[FeedIncludeParams, Depends()]
 
 
 def get_token(request: Request) -> str:
@@ -66,8 +142,33 @@ def get_current_user_id(token: str = Depends(get_token)) -> int:
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
-async def get_db():
-    async with DBManager(session_factory=async_session_maker) as db:
+def get_viewer_id(request: Request) -> int | None:
+    """User id for public endpoints: None for guests and bad tokens, never a 401"""
+    auth_header = request.headers.get("Authorization")
+    token = None
+    if auth_header:
+        parts = auth_header.split()
+        if len(parts) == 2 and parts[0].lower() == "bearer":
+            token = parts[1]
+    token = token or request.cookies.get("access_token")
+    if not token:
+        return None
+    return AuthService.verify_token(token)
+
+
+ViewerIdDep = Annotated[int | None, Depends(get_viewer_id)]
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def get_db(request: Request):
+    """Safe methods read through the read pool, everything else goes through the writer queue"""
+    if request.method in READ_METHODS:
+        manager = DBManager(session_factory=read_session_maker, side="read")
+    else:
+        manager = DBManager(session_factory=async_session_maker)
+    async with manager as db:
         yield db
 
 
@@ -0,0 +1,68 @@
+from fastapi import APIRouter
+
+from app.database.database import engine, read_engine, sqlite_profile
+from app.database.sqlite_profile import read_pragmas
+from app.database.writer import write_queue
+from app.services.like_buffer import like_buffer
+from app.services.trending import trending_recomputer
+from app.utils.cache import feed_cache
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/cache")
+async def get_cache_stats() -> dict:
+    """Hit/miss/eviction statistics of the in-process feed page cache"""
+    return feed_cache.snapshot()
+
+
+@router.get("/like-buffer")
+async def get_like_buffer_stats() -> dict:
+    """Pending intents and flush statistics of the write-behind like buffer"""
+    return like_buffer.snapshot()
+
+
+@router.get("/trending")
+async def get_trending_stats() -> dict:
+    """When trending scores were last recomputed and how many posts that touched"""
+    return {
+        "interval_seconds": trending_recomputer.interval_seconds,
+        "last_run_at": trending_recomputer.last_run_at,
+        "last_touched": trending_recomputer.last_touched,
+    }
+
+
+@router.get("/sqlite")
+async def get_sqlite_profile() -> dict:
+    """Configured connection profile next to the PRAGMAs a pooled connection reports"""
+    if engine.dialect.name != "sqlite":
+        return {"profile": None, "backend": engine.dialect.name}
+    return {
+        "profile": sqlite_profile.name,
+        "configured": sqlite_profile.pragmas(),
+        "actual": await read_pragmas(engine),
+    }
+
+
+@router.get("/database")
+async def get_database_stats() -> dict:
+    """Backend, driver and connection pool usage of the writer and reader engines"""
+    return {
+        "backend": engine.dialect.name,
+        "driver": engine.dialect.driver,
+        "pools": {
+            side: {
+                "size": target.pool.size(),
+                "checked_out": target.pool.checkedout(),
+                "overflow": target.pool.overflow(),
+                "idle": target.pool.checkedin(),
+            }
+            for side, target in (("write", engine), ("read", read_engine))
+        },
+    }
+
+
+@router.get("/writer")
+async def get_writer_stats() -> dict:
+    """Depth of the single-writer queue and how long write units waited for their turn"""
+    return write_queue.snapshot()
@@ -1,10 +1,11 @@
 """Friends API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy import select, func
 
 from app.api.dependencies import DBDep, get_current_user
 from app.models.users import UserModel
 from app.models.friendships import FriendshipModel
+from app.services.timeline import friendship_added_task, friendship_removed_task
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -13,6 +14,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 async def add_friend(
     user_id: int,
     db: DBDep,
+    background_tasks: BackgroundTasks,
     current_user: UserModel = Depends(get_current_user),
 ) -> dict:
     """
@@ -56,7 +58,9 @@ async def add_friend(
             friend_id=user_id
         )
         db.session.add(friendship)
+        await db.friendships.bump_counts(current_user.id, user_id, 1)
         await db.session.commit()
+        background_tasks.add_task(friendship_added_task, current_user.id, user_id)
         
         return {
             "status": "OK",
@@ -81,6 +85,7 @@ async def add_friend(
 async def remove_friend(
     user_id: int,
     db: DBDep,
+    background_tasks: BackgroundTasks,
     current_user: UserModel = Depends(get_current_user),
 ):
     """
@@ -102,7 +107,9 @@ async def remove_friend(
         
         # Delete friendship
         await db.session.delete(friendship)
+        await db.friendships.bump_counts(current_user.id, user_id, -1)
         await db.session.commit()
+        background_tasks.add_task(friendship_removed_task, current_user.id, user_id)
         
         return None
     except HTTPException:
@@ -125,26 +132,20 @@ async def get_my_friends(
     """
     try:
         result = await db.session.execute(
-            select(FriendshipModel).where(
-                FriendshipModel.user_id == current_user.id
-            )
+            select(FriendshipModel, UserModel)
+            .join(UserModel, UserModel.id == FriendshipModel.friend_id)
+            .where(FriendshipModel.user_id == current_user.id)
+            .order_by(FriendshipModel.id)
         )
-        friendships = result.scalars().all()
         
         friends = []
-        for friendship in friendships:
-            # Get friend details
-            friend_result = await db.session.execute(
-                select(UserModel).where(UserModel.id == friendship.friend_id)
-            )
-            friend = friend_result.scalars().first()
-            if friend:
-                friends.append({
-                    "id": friend.id,
-                    "name": friend.name,
-                    "email": friend.email,
-                    "added_at": friendship.created_at.isoformat(),
-                })
+        for friendship, friend in result:
+            friends.append({
+                "id": friend.id,
+                "name": friend.name,
+                "email": friend.email,
+                "added_at": friendship.created_at.isoformat(),
+            })
         
         return friends
     except Exception as e:
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import DBDep, get_current_user
+from app.api.dependencies import DBDep, PaginationDep, get_current_user
 from app.services.friendships import FriendshipService
+from app.services.timeline import friendship_added_task
 from app.schemes.friendships import FriendshipResponse
 from app.models.users import UserModel
+from app.schemes.pagination import CursorPage
+from app.utils.pagination import paginate
 
 router = APIRouter(prefix="/friendships", tags=["friendships"])
 
@@ -38,6 +41,7 @@ async def get_my_friendships(
 async def add_friend(
     friend_id: int,
     db: DBDep,
+    background_tasks: BackgroundTasks,
     current_user: UserModel = Depends(get_current_user),
 ):
     """Add a friend (bidirectional)"""
@@ -62,6 +66,7 @@ async def add_friend(
         friendship = await service.add_friend(current_user.id, friend_id)
         await service.add_friend(friend_id, current_user.id)
         await db.commit()
+        background_tasks.add_task(friendship_added_task, current_user.id, friend_id)
         
         return {
             "id": friendship.id,
@@ -95,18 +100,22 @@ async def remove_friend_by_id(
 
 @router.get(
     "/user/{user_id}",
-    response_model=list[dict],
+    response_model=list[dict] | CursorPage[dict],
 )
 async def get_user_friendships(
     user_id: int,
     db: DBDep,
-    skip: int = 0,
-    limit: int = 100,
+    pagination: PaginationDep,
 ):
     """Get friendships for a specific user"""
     service = FriendshipService(db)
-    friendships = await service.get_user_friends(user_id, skip, limit)
-    return [
+    friendships = await service.get_user_friends(
+        user_id, pagination.skip, pagination.fetch_limit, pagination.before
+    )
+    next_cursor = None
+    if pagination.is_keyset:
+        friendships, next_cursor = paginate(friendships, pagination.limit, lambda f: (f.created_at, f.id))
+    items = [
         {
             "id": f.id,
             "user_id": f.user_id,
@@ -114,6 +123,9 @@ async def get_user_friendships(
         }
         for f in friendships
     ]
+    if pagination.is_keyset:
+        return CursorPage[dict](items=items, next_cursor=next_cursor)
+    return items
 
 
 @router.get(
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 import traceback
 
-from app.api.dependencies import DBDep, get_current_user
+from app.api.dependencies import DBDep, UnboundedPaginationDep, get_current_user
 from app.services.likes import LikeService
 from app.models.users import UserModel
+from app.schemes.pagination import CursorPage
+from app.utils.pagination import paginate
 
 router = APIRouter(prefix="/likes", tags=["likes"])
 
@@ -88,17 +90,23 @@ async def get_like(
 
 @router.get(
     "/user/{user_id}",
-    response_model=list[dict],
+    response_model=list[dict] | CursorPage[dict],
 )
 async def get_user_likes(
     user_id: int,
     db: DBDep,
+    pagination: UnboundedPaginationDep,
 ):
     """Get all likes by a user"""
     try:
         service = LikeService(db)
-        likes = await service.get_user_likes(user_id)
-        return [
+        likes = await service.get_user_likes(
+            user_id, pagination.skip, pagination.fetch_limit, pagination.before
+        )
+        next_cursor = None
+        if pagination.is_keyset:
+            likes, next_cursor = paginate(likes, pagination.limit, lambda l: (l.created_at, l.id))
+        items = [
             {
                 "id": like.id,
                 "post_id": like.post_id,
@@ -107,6 +115,9 @@ async def get_user_likes(
             }
             for like in likes
         ]
+        if pagination.is_keyset:
+            return CursorPage[dict](items=items, next_cursor=next_cursor)
+        return items
     except Exception as e:
         print(f"[API] Error getting user likes: {e}")
         traceback.print_exc()
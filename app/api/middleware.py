@@ -0,0 +1,51 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.nplusone import find_repeats
+from app.database.query_stats import collect_queries
+
+
+class QueryStatsMiddleware:
+    """
+    Access log line with the request's SQL statistics; with `headers` on
+    (debug), also Server-Timing and X-DB-Queries on the response, and with
+    `n_plus_one_threshold` a warning for every query shape repeated more
+    than that. Plain ASGI so the statistics context is the one the endpoint
+    and its tasks run in.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool = False, n_plus_one_threshold: int = 0):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        with collect_queries(trace=self.n_plus_one_threshold > 0) as stats:
+            async def send_with_stats(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if self.headers:
+                        headers = MutableHeaders(scope=message)
+                        headers.append("Server-Timing", stats.server_timing())
+                        headers.append("X-DB-Queries", str(stats.count))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(f"[API] {scope['method']} {scope['path']} {status} {elapsed_ms:.1f} ms "
+                      f"db_queries={stats.count} db_ms={stats.duration_ms:.1f} db_rows={stats.rows}")
+                if self.n_plus_one_threshold > 0:
+                    for repeat in find_repeats(stats, self.n_plus_one_threshold):
+                        print(f"[API] ⚠️  N+1 in {scope['method']} {scope['path']}: {repeat.describe()}")
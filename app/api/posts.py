@@ -1,18 +1,43 @@
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status, Query, HTTPException
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 import traceback
 
-from app.api.dependencies import DBDep, get_current_user
+from app.api.dependencies import (
+    CommentPaginationDep,
+    DBDep,
+    FeedIncludeDep,
+    PaginationDep,
+    ViewerIdDep,
+    get_current_user,
+)
 from app.services.posts import PostService
 from app.services.comments import CommentService
 from app.services.likes import LikeService
-from app.schemes.posts import PostCreate, PostUpdate, PostResponse
+from app.services.timeline import TimelineService, fan_out_post_task
+from app.services.trending import TrendingService
+from app.schemes.posts import PostCreate, PostUpdate, PostResponse, PostBatchResponse
 from app.schemes.comments import CommentCreate, CommentResponse
+from app.schemes.likes import LikeState, LikeStateResponse
+from app.schemes.pagination import CursorPage
 from app.models.users import UserModel
-from app.exceptions.exceptions import PostNotFound, CommentNotFound, Forbidden, AlreadyLiked
+from app.exceptions.exceptions import PostNotFound, CommentNotFound, Forbidden, AlreadyLiked, InvalidCursor
+from app.utils.cache import GLOBAL_FEED, USER_FEED, CachedPage, feed_cache
+from app.utils.http_cache import (
+    cache_headers,
+    etag_matches,
+    last_modified,
+    not_modified,
+    page_etag,
+    post_etag,
+)
+from app.utils.pagination import paginate
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+POSTS_BATCH_MAX_IDS = 300
+
 
 @router.post(
     "/",
@@ -22,6 +47,7 @@ router = APIRouter(prefix="/posts", tags=["posts"])
 async def create_post(
     post_data: PostCreate,
     db: DBDep,
+    background_tasks: BackgroundTasks,
     current_user: UserModel = Depends(get_current_user),
 ):
     """Create a new post"""
@@ -30,6 +56,7 @@ async def create_post(
         print(f"[API] Post data: title='{post_data.title}', content_length={len(post_data.content)}")
         service = PostService(db)
         post = await service.create_post(post_data, current_user.id)
+        background_tasks.add_task(fan_out_post_task, post.id)
         print(f"[API] Post created successfully with ID {post.id}")
         return post
     except Exception as e:
@@ -41,21 +68,98 @@ async def create_post(
         )
 
 
+def _posts_page(posts: list[PostResponse], pagination) -> list[PostResponse] | CursorPage[PostResponse]:
+    if not pagination.is_keyset:
+        return posts or []
+    items, next_cursor = paginate(posts, pagination.limit, lambda p: (p.created_at, p.id))
+    return CursorPage[PostResponse](items=items, next_cursor=next_cursor)
+
+
+_post_list = TypeAdapter(list[PostResponse])
+
+
+def _page_items(page) -> list[PostResponse]:
+    return page.items if isinstance(page, CursorPage) else page
+
+
+def _with_items(page, items: list[PostResponse]):
+    """The same page (list or CursorPage) holding other items"""
+    if isinstance(page, CursorPage):
+        return CursorPage[PostResponse](items=items, next_cursor=page.next_cursor)
+    return items
+
+
+def _render_page(request: Request, page) -> CachedPage:
+    """ETag and Last-Modified of a page, plus its body unless the client already has it"""
+    items = _page_items(page)
+    next_cursor = page.next_cursor if isinstance(page, CursorPage) else None
+    etag = page_etag(items, next_cursor)
+    modified = last_modified(items)
+    if etag_matches(request, etag):
+        return CachedPage(etag, modified, None, page)
+    body = page.model_dump_json().encode() if isinstance(page, CursorPage) else _post_list.dump_json(page)
+    return CachedPage(etag, modified, body, page)
+
+
+def _page_response(request: Request, rendered: CachedPage) -> Response:
+    headers = cache_headers(request, rendered.etag, rendered.last_modified)
+    if rendered.body is None or etag_matches(request, rendered.etag):
+        return not_modified(headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
+
+async def _viewer_page_response(request: Request, db, viewer_id: int, page) -> Response:
+    """Re-render a shared page with the viewer's `liked_by_me` flags"""
+    items = await PostService(db).with_liked_by_me(_page_items(page), viewer_id)
+    return _page_response(request, _render_page(request, _with_items(page, items)))
+
+
+async def _build_page(db, posts: list[PostResponse], pagination, includes):
+    """Trim a fetch to one page and embed the requested extras"""
+    page = _posts_page(posts, pagination)
+    items = await PostService(db).with_comments_preview(_page_items(page), includes.comments_preview)
+    return _with_items(page, items)
+
+
+async def _cached_posts_page(
+    request: Request, db, viewer_id: int | None, feed: str, user_id: int | None, pagination, includes, load
+) -> Response:
+    """Serve a feed page from the in-process cache, building and storing it on a miss"""
+    key = feed_cache.make_key(
+        feed, user_id, pagination.skip, pagination.cursor, pagination.limit, includes.comments_preview
+    )
+    cached = feed_cache.get(key)
+    if cached is None:
+        generation = feed_cache.generation
+        cached = _render_page(request, await _build_page(db, await load(), pagination, includes))
+        if cached.body is not None:
+            feed_cache.set(key, cached, [p.id for p in _page_items(cached.page)], generation)
+    if viewer_id is not None:
+        return await _viewer_page_response(request, db, viewer_id, cached.page)
+    return _page_response(request, cached)
+
+
 @router.get(
     "/user/{user_id}",
-    response_model=list[PostResponse],
+    response_model=list[PostResponse] | CursorPage[PostResponse],
 )
 async def get_user_posts(
     user_id: int,
+    request: Request,
     db: DBDep,
-    skip: int = 0,
-    limit: int = 100,
+    pagination: PaginationDep,
+    includes: FeedIncludeDep,
+    viewer_id: ViewerIdDep,
 ):
     """Get all posts by a specific user"""
     try:
         service = PostService(db)
-        posts = await service.get_user_posts(user_id, skip, limit)
-        return posts or []
+        return await _cached_posts_page(
+            request, db, viewer_id, USER_FEED, user_id, pagination, includes,
+            lambda: service.get_user_posts(
+                user_id, pagination.skip, pagination.fetch_limit, pagination.before
+            ),
+        )
     except Exception as e:
         print(f"[API] Error getting user posts: {e}")
         raise HTTPException(
@@ -64,13 +168,114 @@ async def get_user_posts(
         )
 
 
+@router.get(
+    "/timeline",
+    response_model=list[PostResponse] | CursorPage[PostResponse],
+)
+async def get_timeline(
+    request: Request,
+    db: DBDep,
+    pagination: PaginationDep,
+    includes: FeedIncludeDep,
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Home timeline: posts of the current user and their friends"""
+    try:
+        service = TimelineService(db)
+        posts = await service.get_timeline(
+            current_user.id, pagination.skip, pagination.fetch_limit, pagination.before
+        )
+        page = await _build_page(db, posts, pagination, includes)
+        items = await PostService(db).with_liked_by_me(_page_items(page), current_user.id)
+        return _page_response(request, _render_page(request, _with_items(page, items)))
+    except Exception as e:
+        print(f"[API] Error getting timeline: {e}")
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get timeline"
+        )
+
+
+@router.get(
+    "/trending",
+    response_model=CursorPage[PostResponse],
+)
+async def get_trending(
+    db: DBDep,
+    includes: FeedIncludeDep,
+    viewer_id: ViewerIdDep,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    """Posts ranked by recent, time-decayed likes and comments"""
+    try:
+        service = TrendingService(db)
+        posts, next_cursor = await service.get_trending(limit, cursor)
+        posts = await PostService(db).with_comments_preview(posts, includes.comments_preview)
+        posts = await PostService(db).with_liked_by_me(posts, viewer_id)
+        return CursorPage[PostResponse](items=posts, next_cursor=next_cursor)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"[API] Error getting trending posts: {e}")
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get trending posts"
+        )
+
+
+@router.get(
+    "/batch",
+    response_model=PostBatchResponse,
+)
+async def get_posts_batch(
+    db: DBDep,
+    includes: FeedIncludeDep,
+    viewer_id: ViewerIdDep,
+    ids: list[str] = Query(..., description="Post ids, comma separated and/or repeated"),
+):
+    """Resolve many posts at once, in the requested order"""
+    try:
+        post_ids = list(dict.fromkeys(
+            int(part) for value in ids for part in value.split(",") if part.strip()
+        ))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be integers"
+        )
+    if not post_ids or len(post_ids) > POSTS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Between 1 and {POSTS_BATCH_MAX_IDS} ids are allowed"
+        )
+    try:
+        service = PostService(db)
+        items, missing = await service.get_posts_batch(post_ids)
+        items = await service.with_comments_preview(items, includes.comments_preview)
+        items = await service.with_liked_by_me(items, viewer_id)
+        return PostBatchResponse(items=items, missing=missing)
+    except Exception as e:
+        print(f"[API] Error getting posts batch: {e}")
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get posts"
+        )
+
+
 @router.get(
     "/{post_id}",
     response_model=PostResponse,
 )
 async def get_post(
     post_id: int,
+    request: Request,
+    response: Response,
     db: DBDep,
+    viewer_id: ViewerIdDep,
 ):
     """Get a specific post by ID"""
     try:
@@ -81,6 +286,11 @@ async def get_post(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found"
             )
+        [post] = await service.with_liked_by_me([post], viewer_id)
+        headers = cache_headers(request, post_etag(post), last_modified([post]))
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
         return post
     except HTTPException:
         raise
@@ -94,21 +304,32 @@ async def get_post(
 
 @router.get(
     "/",
-    response_model=list[PostResponse],
+    response_model=list[PostResponse] | CursorPage[PostResponse],
 )
 async def get_all_posts(
+    request: Request,
     db: DBDep,
-    skip: int = 0,
-    limit: int = 100,
+    pagination: PaginationDep,
+    includes: FeedIncludeDep,
+    viewer_id: ViewerIdDep,
     user_id: int = Query(None),
 ):
     """Get all posts with optional filtering by user"""
     try:
         service = PostService(db)
         if user_id:
-            return await service.get_user_posts(user_id, skip, limit)
-        posts = await service.get_all_posts(skip, limit)
-        return posts or []
+            return await _cached_posts_page(
+                request, db, viewer_id, USER_FEED, user_id, pagination, includes,
+                lambda: service.get_user_posts(
+                    user_id, pagination.skip, pagination.fetch_limit, pagination.before
+                ),
+            )
+        return await _cached_posts_page(
+            request, db, viewer_id, GLOBAL_FEED, None, pagination, includes,
+            lambda: service.get_all_posts(
+                pagination.skip, pagination.fetch_limit, pagination.before
+            ),
+        )
     except Exception as e:
         print(f"[API] Error getting posts: {e}")
         raise HTTPException(
@@ -187,17 +408,23 @@ async def delete_post(
 # ===== COMMENTS =====
 @router.get(
     "/{post_id}/comments",
-    response_model=list[dict],
+    response_model=list[dict] | CursorPage[dict],
 )
 async def get_post_comments(
     post_id: int,
     db: DBDep,
+    pagination: CommentPaginationDep,
 ):
     """Get all comments for a post"""
     try:
         service = CommentService(db)
-        comments = await service.get_post_comments(post_id)
-        return [
+        comments = await service.get_post_comments(
+            post_id, pagination.skip, pagination.fetch_limit, pagination.before
+        )
+        next_cursor = None
+        if pagination.is_keyset:
+            comments, next_cursor = paginate(comments, pagination.limit, lambda c: (c.created_at, c.id))
+        items = [
             {
                 "id": c.id,
                 "post_id": c.post_id,
@@ -208,6 +435,9 @@ async def get_post_comments(
             }
             for c in comments
         ]
+        if pagination.is_keyset:
+            return CursorPage[dict](items=items, next_cursor=next_cursor)
+        return items
     except Exception as e:
         print(f"[API] Error getting comments: {e}")
         traceback.print_exc()
@@ -331,6 +561,34 @@ async def like_post(
         )
 
 
+@router.put(
+    "/{post_id}/like",
+    response_model=LikeStateResponse,
+)
+async def set_like(
+    post_id: int,
+    state: LikeState,
+    db: DBDep,
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Set the like to an explicit state and return the resulting count"""
+    try:
+        service = LikeService(db)
+        return await service.set_like(post_id, current_user.id, state.liked)
+    except PostNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    except Exception as e:
+        print(f"[API] Error setting like: {e}")
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to set like"
+        )
+
+
 @router.delete(
     "/{post_id}/like",
     status_code=status.HTTP_204_NO_CONTENT,
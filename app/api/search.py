@@ -0,0 +1,38 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, status
+import traceback
+
+from app.api.dependencies import DBDep
+from app.exceptions.exceptions import InvalidCursor
+from app.schemes.pagination import CursorPage
+from app.schemes.search import SearchHit
+from app.services.search import SearchService
+
+router = APIRouter(tags=["search"])
+
+
+@router.get(
+    "/search",
+    response_model=CursorPage[SearchHit],
+)
+async def search(
+    db: DBDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text; every word is matched as a prefix"),
+    scope: Literal["all", "posts", "comments"] = "all",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    """Full-text search over posts and comments, best matches first"""
+    try:
+        service = SearchService(db)
+        return await service.search(q, scope, limit, cursor)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"[API] Error searching for {q!r}: {e}")
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Search failed"
+        )
@@ -1,19 +1,105 @@
 import os
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import URL
 
 class Settings(BaseSettings):
+    # "sqlite": DB_NAME is the database file. "postgresql" (asyncpg): DB_NAME is
+    # the database on DB_HOST:DB_PORT. DB_URL, when set, is used as is.
+    DB_BACKEND: Literal["sqlite", "postgresql"] = "sqlite"
     DB_NAME: str = "betony.db"
+    DB_HOST: str = "localhost"
+    DB_PORT: int = 5432
+    DB_USER: str = "postgres"
+    DB_PASS: str = ""
+    DB_URL: str = ""
+    # Connection pool of the writer engine (the read engine uses DB_READ_POOL_SIZE);
+    # DB_POOL_RECYCLE_SECONDS replaces connections older than that, -1 never
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # asyncpg prepares every statement server-side; this many stay prepared per
+    # connection. 0 re-prepares each time, which PgBouncer in transaction mode needs
+    DB_STATEMENT_CACHE_SIZE: int = 100
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Development checks: on startup, EXPLAIN QUERY PLAN every @explain-registered
+    # repository query and warn about full table scans (app/database/query_advisor.py),
+    # and send Server-Timing / X-DB-Queries with every response (app/api/middleware.py)
+    DEBUG: bool = False
+    # Per-request SQL statement count, time and rows in the access log; implied by DEBUG
+    DB_QUERY_STATS: bool = False
+    # Development: log every request that runs one query shape more than this
+    # many times (N+1), with the lines that issued it; 0 disables
+    DB_N_PLUS_ONE_THRESHOLD: int = 0
+    # PRAGMA preset applied to every SQLite connection, see app/database/sqlite_profile.py
+    SQLITE_PROFILE: Literal["durable", "balanced", "throughput"] = "balanced"
+    # GET requests read through a separate pool of query_only connections;
+    # writes are serialized through one queue, see app/database/writer.py
+    DB_READ_POOL_SIZE: int = 8
+    DB_WRITE_BUSY_RETRIES: int = 5
+    DB_WRITE_BUSY_BACKOFF_MS: float = 20.0
+    # Connections opened per pool at startup, so first requests don't pay for connect
+    DB_POOL_PREWARM: int = 2
+
+    # Demo users, posts, likes and comments (app/services/data_init.py), created at
+    # startup unless already there; in the background so traffic isn't held up
+    SEED_SAMPLE_DATA: bool = False
+    SEED_IN_BACKGROUND: bool = True
+
+    # SQLAdmin at /admin: "lazy" imports and builds it on the first /admin
+    # request, "eager" at startup, "off" leaves it out (API-only workers)
+    ADMIN_MODE: Literal["lazy", "eager", "off"] = "lazy"
+
+    # Home timeline: entries kept per reader, and the friend count above
+    # which an author's posts are merged in on read instead of pushed on write
+    TIMELINE_MAX_ENTRIES: int = 800
+    TIMELINE_FANOUT_MAX_FRIENDS: int = 1000
+
+    # Serialized /posts/ pages kept in memory; 0 disables the cache
+    FEED_CACHE_MAX_PAGES: int = 256
+    FEED_CACHE_TTL_SECONDS: float = 30.0
+    # Browser/proxy freshness for guest (unauthenticated) post and feed reads
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 10
+    # Write-behind like buffer for PUT /posts/{id}/like: intents are written in
+    # one transaction every LIKE_BUFFER_FLUSH_MS or LIKE_BUFFER_MAX_EVENTS.
+    # LIKE_BUFFER_LOG_PATH, when set, is an append-only intent log replayed on start
+    LIKE_BUFFER_ENABLED: bool = False
+    LIKE_BUFFER_FLUSH_MS: int = 250
+    LIKE_BUFFER_MAX_EVENTS: int = 1000
+    LIKE_BUFFER_LOG_PATH: str = ""
+    # /posts/trending: engagement in the last TRENDING_WINDOW_HOURS, halved every
+    # TRENDING_HALF_LIFE_HOURS, rescored every TRENDING_RECOMPUTE_SECONDS (0 disables)
+    TRENDING_HALF_LIFE_HOURS: float = 12.0
+    TRENDING_WINDOW_HOURS: float = 72.0
+    TRENDING_RECOMPUTE_SECONDS: float = 60.0
+    TRENDING_BATCH_SIZE: int = 500
     
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env"),
         extra="ignore"  # Ignore extra fields
     )
     
+    @property
+    def query_stats_enabled(self) -> bool:
+        return self.DEBUG or self.DB_QUERY_STATS or self.DB_N_PLUS_ONE_THRESHOLD > 0
+
     @property
     def get_db_url(self):
+        if self.DB_URL:
+            return self.DB_URL
+        if self.DB_BACKEND == "postgresql":
+            return URL.create(
+                "postgresql+asyncpg",
+                username=self.DB_USER,
+                password=self.DB_PASS or None,
+                host=self.DB_HOST,
+                port=self.DB_PORT,
+                database=self.DB_NAME,
+                query={"prepared_statement_cache_size": str(self.DB_STATEMENT_CACHE_SIZE)},
+            ).render_as_string(hide_password=False)
         return f"sqlite+aiosqlite:///{self.DB_NAME}"
 
     @property
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import NullPool, func, make_url, text
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
@@ -9,13 +9,53 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
+from app.database.query_stats import track_queries
+from app.database.sqlite_profile import (
+    PROFILES,
+    apply_profile,
+    make_read_only,
+    use_explicit_begin,
+)
+
+
+
+def engine_options(pool_size: int) -> dict:
+    """Pool settings from Settings, plus the asyncpg statement cache on PostgreSQL"""
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    if make_url(settings.get_db_url).get_backend_name() == "postgresql":
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
 
-engine = create_async_engine(settings.get_db_url)
+
+# Writer side: every write unit of work, queued through app/database/writer.py on SQLite
+engine = create_async_engine(settings.get_db_url, **engine_options(settings.DB_POOL_SIZE))
+
+# Reader side: GET requests, never takes the write lock (read-only transactions on PostgreSQL)
+read_engine = create_async_engine(
+    settings.get_db_url,
+    execution_options={"postgresql_readonly": True} if engine.dialect.name == "postgresql" else {},
+    **engine_options(settings.DB_READ_POOL_SIZE),
+)
 
 engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
 
+sqlite_profile = PROFILES[settings.SQLITE_PROFILE]
+apply_profile(engine, sqlite_profile)
+apply_profile(engine_null_pool, sqlite_profile)
+apply_profile(read_engine, sqlite_profile)
+make_read_only(read_engine)
+use_explicit_begin(engine)
+if settings.query_stats_enabled:
+    track_queries(engine)
+    track_queries(read_engine)
+
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+read_session_maker = async_sessionmaker(bind=read_engine, expire_on_commit=False)
 async_session_maker_null_pool = async_sessionmaker(
     bind=engine_null_pool, expire_on_commit=False
 )
@@ -1,32 +1,244 @@
-from app.database.database import async_session_maker
+from typing import Literal
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.database import async_session_maker, engine, read_engine
+from app.database.writer import write_queue
 from app.repositories.roles import RolesRepository
 from app.repositories.users import UsersRepository
 from app.repositories.posts import PostRepository
 from app.repositories.comments import CommentRepository
 from app.repositories.likes import LikeRepository
 from app.repositories.friendships import FriendshipRepository
+from app.repositories.timeline import TimelineRepository
+from app.repositories.search import SearchRepository
+from app.repositories.trending import TrendingRepository
+
+
+REPOSITORIES = {
+    "users": UsersRepository,
+    "roles": RolesRepository,
+    "posts": PostRepository,
+    "comments": CommentRepository,
+    "likes": LikeRepository,
+    "friendships": FriendshipRepository,
+    "timeline": TimelineRepository,
+    "search": SearchRepository,
+    "trending": TrendingRepository,
+}
+
+# Write engines whose sessions read through a read pool until they first write
+READ_BINDS = {engine: read_engine}
+
+
+class _ClaimFirst:
+    """begin()/begin_nested() of a WriterSession: claim the writer, then start the transaction"""
+
+    def __init__(self, claim, transaction):
+        self._claim = claim
+        self._transaction = transaction
+
+    async def __aenter__(self):
+        await self._claim()
+        return await self._transaction.__aenter__()
+
+    async def __aexit__(self, *args):
+        return await self._transaction.__aexit__(*args)
+
+
+class _WriterSyncSession(Session):
+    """Sends every statement to `read_bind` while one is set"""
+
+    read_bind = None
+
+    def get_bind(self, *args, **kwargs):
+        if self.read_bind is not None:
+            return self.read_bind
+        return super().get_bind(*args, **kwargs)
+
+
+class WriterSession(AsyncSession):
+    """
+    Write-side session on SQLite. Nothing that writes runs before `claim`
+    (DBManager.begin_write) has taken the writer slot and BEGIN IMMEDIATE:
+    flushes, commits of pending changes, explicit connections, transactions
+    and savepoints, and every statement that isn't a SELECT. Until then
+    SELECTs and loads go through `read_bind`, a query_only read pool on the
+    same database, so a request that only reads never queues for the writer.
+    Without a read_bind every statement claims.
+    """
+
+    sync_session_class = _WriterSyncSession
+
+    def __init__(self, *args, claim, read_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._claim = claim
+        self.sync_session.read_bind = read_bind
+
+    def _reads_only(self) -> bool:
+        # Pending changes would be autoflushed by the next query
+        return self.sync_session.read_bind is not None and not (self.new or self.dirty or self.deleted)
+
+    async def _claim_unless_read(self, statement=None) -> None:
+        if not self._reads_only() or (statement is not None and not getattr(statement, "is_select", False)):
+            await self._claim()
+
+    async def execute(self, statement, *args, **kwargs):
+        await self._claim_unless_read(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self._claim_unless_read(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        await self._claim_unless_read(statement)
+        return await super().scalars(statement, *args, **kwargs)
+
+    async def stream(self, statement, *args, **kwargs):
+        await self._claim_unless_read(statement)
+        return await super().stream(statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._claim_unless_read()
+        return await super().get(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        await self._claim_unless_read()
+        return await super().refresh(*args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        await self._claim()
+        return await super().delete(*args, **kwargs)
+
+    async def merge(self, *args, **kwargs):
+        await self._claim()
+        return await super().merge(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        await self._claim()
+        return await super().flush(*args, **kwargs)
+
+    async def commit(self):
+        # A unit of work that only read just ends its read transaction
+        await self._claim_unless_read()
+        return await super().commit()
+
+    async def connection(self, *args, **kwargs):
+        await self._claim()
+        return await super().connection(*args, **kwargs)
+
+    async def run_sync(self, *args, **kwargs):
+        await self._claim()
+        return await super().run_sync(*args, **kwargs)
+
+    def begin(self):
+        return _ClaimFirst(self._claim, super().begin())
+
+    def begin_nested(self):
+        return _ClaimFirst(self._claim, super().begin_nested())
 
 
 class DBManager:
-    def __init__(self, session_factory: async_session_maker):
+    """
+    One unit of work. `side` says which engine it runs on: "read" sessions
+    come from read_session_maker and cannot write; "write" ones (the default)
+    wait for the single-writer slot and start with BEGIN IMMEDIATE on SQLite.
+
+    Nothing happens on entry. The session is created on first use and each
+    repository on first access, and on SQLite the write side claims the
+    writer slot (begin_write) only when its session is about to write, so a
+    request that never gets that far (a 401, a failed validation, a like
+    that only goes into the like buffer) costs no turn in the writer queue.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_session_maker,
+        side: Literal["read", "write"] = "write",
+    ):
         self.session_factory = session_factory
+        self.side = side
+        self._session = None
+        self._holds_writer = False
+        self._writing = False
+
+    @property
+    def session(self):
+        if self._session is None:
+            bind = self.session_factory.kw["bind"]
+            if self.side == "write" and bind.dialect.name == "sqlite":
+                read_bind = READ_BINDS.get(bind)
+                self._session = WriterSession(
+                    claim=self.begin_write,
+                    read_bind=read_bind.sync_engine if read_bind is not None else None,
+                    **self.session_factory.kw,
+                )
+            else:
+                self._session = self.session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        repository = REPOSITORIES.get(name)
+        if repository is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        instance = repository(self.session)
+        # Cached on the instance, later lookups don't reach __getattr__
+        setattr(self, name, instance)
+        return instance
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-        
-        # Initialize all repositories
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
-        self.posts = PostRepository(self.session)
-        self.comments = CommentRepository(self.session)
-        self.likes = LikeRepository(self.session)
-        self.friendships = FriendshipRepository(self.session)
-        
         return self
 
+    async def begin_write(self):
+        """
+        Wait for the writer slot and open the transaction with BEGIN IMMEDIATE.
+        Awaited by the session before its first statement; later calls, and
+        calls on sessions that aren't WriterSessions, do nothing.
+        """
+        if self._writing or not isinstance(self.session, WriterSession):
+            return
+        # Set first: _begin_immediate goes through the session again
+        self._writing = True
+        sync_session = self.session.sync_session
+        read_bind, sync_session.read_bind = sync_session.read_bind, None
+        try:
+            if not self._holds_writer:
+                self._holds_writer = await write_queue.acquire()
+            await write_queue.retry_busy(self._begin_immediate)
+        except BaseException:
+            self._writing = False
+            sync_session.read_bind = read_bind
+            raise
+
     async def __aexit__(self, *args):
-        await self.session.rollback()
-        await self.session.close()
+        await self._close()
+
+    async def _begin_immediate(self):
+        try:
+            await self.session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+        except OperationalError:
+            await self.session.rollback()
+            raise
+
+    async def _close(self):
+        try:
+            if self._session is not None:
+                if self._session.in_transaction():
+                    # Rolls back whatever is left and returns the connection
+                    await self._session.close()
+                else:
+                    # Nothing to roll back; detach loaded objects like close() would
+                    self._session.expunge_all()
+        finally:
+            if self._holds_writer:
+                self._holds_writer = False
+                write_queue.release()
 
     async def commit(self):
         await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
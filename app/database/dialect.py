@@ -0,0 +1,33 @@
+"""
+The few statements that are spelled differently on SQLite and PostgreSQL
+
+Repositories stay backend-agnostic by asking for these with their session.
+"""
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+HOUR_BUCKET_SQLITE = "%Y-%m-%d %H:00:00"
+HOUR_BUCKET_POSTGRESQL = "YYYY-MM-DD HH24:00:00"
+
+
+def dialect_name(session: AsyncSession) -> str:
+    return session.bind.dialect.name
+
+
+def upsert(session: AsyncSession, model):
+    """INSERT supporting on_conflict_do_nothing / on_conflict_do_update on either backend"""
+    if dialect_name(session) == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def hour_bucket(session: AsyncSession, column):
+    """`column` truncated to the hour, as 'YYYY-MM-DD HH:00:00' text"""
+    if dialect_name(session) == "postgresql":
+        # Inlined, not bound: GROUP BY must repeat the SELECT expression exactly
+        return func.to_char(
+            func.date_trunc(literal_column("'hour'"), column),
+            literal_column(f"'{HOUR_BUCKET_POSTGRESQL}'"),
+        )
+    return func.strftime(HOUR_BUCKET_SQLITE, column)
@@ -0,0 +1,78 @@
+"""
+N+1 query detection
+
+Statements are reduced to a fingerprint (literals, bind markers and IN
+lists stripped), so "SELECT ... WHERE users.id = ?" run for each of twenty
+friends is one shape seen twenty times. A unit of work that runs any shape
+more than `threshold` times is reported with the lines that issued it.
+
+In tests, use the `n_plus_one` fixture (tests/conftest.py) or
+`detect_n_plus_one()` with statement tracking on; in development set
+DB_N_PLUS_ONE_THRESHOLD and every offending request is logged.
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from app.database.query_stats import QueryStats, collect_queries
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND = re.compile(r"\$\d+|%\(\w+\)s|:\w+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    shape = _STRING.sub("?", statement)
+    shape = _BIND.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class RepeatedQuery:
+    fingerprint: str
+    count: int
+    call_sites: Counter
+
+    def describe(self) -> str:
+        sites = ", ".join(f"{site} ×{n}" for site, n in self.call_sites.most_common())
+        return f"{self.count}× {self.fingerprint}\n    from {sites}"
+
+
+class NPlusOneError(AssertionError):
+    def __init__(self, repeats: list[RepeatedQuery], threshold: int):
+        self.repeats = repeats
+        details = "\n".join(repeat.describe() for repeat in repeats)
+        super().__init__(f"Query shapes run more than {threshold} times:\n{details}")
+
+
+def find_repeats(stats: QueryStats, threshold: int) -> list[RepeatedQuery]:
+    """Shapes in a traced QueryStats that ran more than `threshold` times, most frequent first"""
+    sites: dict[str, Counter] = {}
+    for statement, site in zip(stats.statements, stats.call_sites):
+        if statement.startswith(("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+            continue
+        sites.setdefault(fingerprint(statement), Counter())[site] += 1
+    repeats = [
+        RepeatedQuery(shape, sum(counter.values()), counter)
+        for shape, counter in sites.items()
+        if sum(counter.values()) > threshold
+    ]
+    return sorted(repeats, key=lambda repeat: repeat.count, reverse=True)
+
+
+@contextmanager
+def detect_n_plus_one(threshold: int = 3):
+    """
+    Raise NPlusOneError if a query shape runs more than `threshold` times in
+    the block. Statements are only seen on engines passed to track_queries().
+    """
+    with collect_queries(trace=True) as stats:
+        yield stats
+    repeats = find_repeats(stats, threshold)
+    if repeats:
+        raise NPlusOneError(repeats, threshold)
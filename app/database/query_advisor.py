@@ -0,0 +1,97 @@
+"""
+EXPLAIN QUERY PLAN advisor, run at startup when Settings.DEBUG is on
+
+Repository methods on hot paths carry @explain(...) with sample arguments.
+The advisor calls each of them once inside a transaction that is rolled back,
+captures every statement it executes, and asks SQLite for the plan. A plain
+"SCAN <table>" (no index) on a mapped table is reported with the method and
+the SQL, so a missing index shows up before the table grows.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+
+# Stands in for cursors and time windows in sample arguments
+SAMPLE_TIME = datetime(2024, 1, 1)
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+_QUERIES = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def explain(*args, **kwargs):
+    """Register a sample call of a repository method; stack for several variants"""
+    def decorator(method):
+        samples = getattr(method, "_explain_samples", [])
+        method._explain_samples = [(args, kwargs), *samples]
+        return method
+    return decorator
+
+
+@dataclass
+class ScanWarning:
+    query: str
+    table: str
+    detail: str
+    statement: str
+
+
+def registered_calls(db) -> list[tuple[str, object, tuple, dict]]:
+    """(name, bound method, args, kwargs) for every @explain sample on the manager's repositories"""
+    from app.database.db_manager import REPOSITORIES
+
+    calls = []
+    for repo in (getattr(db, name) for name in REPOSITORIES):
+        for method_name in dir(type(repo)):
+            method = getattr(type(repo), method_name, None)
+            for args, kwargs in getattr(method, "_explain_samples", []):
+                calls.append((f"{type(repo).__name__}.{method_name}", getattr(repo, method_name), args, kwargs))
+    return calls
+
+
+async def advise(session_factory, tables: set[str]) -> list[ScanWarning]:
+    """Run every registered query and return the full scans of `tables` found in their plans"""
+    from app.database.db_manager import DBManager
+
+    warnings = []
+    async with DBManager(session_factory=session_factory) as db:
+        if db.session.bind.dialect.name != "sqlite":
+            print("[ADVISOR] EXPLAIN QUERY PLAN is SQLite-only, skipped")
+            return warnings
+        conn = await db.session.connection()
+        sync_conn = conn.sync_connection
+        for name, method, args, kwargs in registered_calls(db):
+            captured = []
+
+            def _capture(connection, cursor, statement, parameters, context, executemany):
+                if connection is sync_conn and statement.lstrip().upper().startswith(_QUERIES):
+                    captured.append((statement, parameters[0] if executemany else parameters))
+
+            event.listen(sync_conn, "before_cursor_execute", _capture)
+            try:
+                async with db.session.begin_nested():
+                    await method(*args, **kwargs)
+            except Exception as e:
+                print(f"[ADVISOR] {name} failed with sample arguments: {e}")
+            finally:
+                event.remove(sync_conn, "before_cursor_execute", _capture)
+
+            for statement, parameters in captured:
+                plan = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                for row in plan:
+                    detail = row[-1]
+                    match = _SCAN.match(detail)
+                    if match and match.group(1) in tables:
+                        warning = ScanWarning(name, match.group(1), detail, " ".join(statement.split()))
+                        if warning not in warnings:
+                            warnings.append(warning)
+    return warnings
+
+
+async def run_advisor(session_factory, tables: set[str]) -> list[ScanWarning]:
+    warnings = await advise(session_factory, tables)
+    for warning in warnings:
+        print(f"[ADVISOR] ⚠️  {warning.query}: {warning.detail}\n          {warning.statement}")
+    print(f"[ADVISOR] Checked query plans, {len(warnings)} full table scan(s)")
+    return warnings
@@ -0,0 +1,122 @@
+"""
+Per-request SQL statistics: statement count, time spent in the database, rows
+
+track_queries(engine) hooks before/after_cursor_execute. Statements are only
+counted while a QueryStats is active in the current context (a request, see
+app/api/middleware.py, or a `collect_queries()` block), so background work
+outside a request is ignored. Nothing is registered unless Settings.DEBUG,
+Settings.DB_QUERY_STATS or Settings.DB_N_PLUS_ONE_THRESHOLD is on, so a
+disabled build pays nothing per query.
+
+With `trace`, each statement also records the line of project code that
+issued it, for the N+1 report in app/database/nplusone.py.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SKIPPED_DIRS = (os.path.dirname(os.path.abspath(__file__)) + os.sep, os.sep + "site-packages" + os.sep)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+    # Rows returned by SELECTs plus rows changed by writes
+    rows: int = 0
+    statements: list[str] | None = field(default=None, repr=False)
+    call_sites: list[str] | None = field(default=None, repr=False)
+
+    def record(self, statement: str, duration_ms: float, rows: int) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.rows += rows
+        if self.statements is not None:
+            self.statements.append(statement)
+        if self.call_sites is not None:
+            self.call_sites.append(call_site())
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_ms:.2f};desc="{self.count} queries, {self.rows} rows"'
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def call_site() -> str:
+    """
+    "path:line in function" of the innermost project frame outside
+    app/database. Statements run in SQLAlchemy's greenlet, so when its stack
+    runs out the walk continues in the parent greenlet, where the awaiting
+    repository and endpoint coroutines are.
+    """
+    import greenlet
+
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(PROJECT_DIR) and not any(skipped in filename for skipped in _SKIPPED_DIRS):
+                return f"{os.path.relpath(filename, PROJECT_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return "<unknown>"
+        frame = current.gr_frame
+
+
+@contextmanager
+def collect_queries(keep_statements: bool = False, trace: bool = False):
+    """Count the statements run in this block (and the tasks it starts)"""
+    stats = QueryStats(
+        statements=[] if keep_statements or trace else None,
+        call_sites=[] if trace else None,
+    )
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    if cursor.description is not None:
+        # The async drivers buffer the whole result at execute time
+        rows = len(getattr(cursor, "_rows", ()))
+    else:
+        rows = max(cursor.rowcount, 0)
+    stats.record(statement, (time.perf_counter() - started) * 1000, rows)
+
+
+def track_queries(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def untrack_queries(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.remove(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(sync_engine, "after_cursor_execute", _after_cursor_execute)
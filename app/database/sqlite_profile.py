@@ -0,0 +1,118 @@
+"""
+SQLite connection profiles
+
+Every new DBAPI connection gets the PRAGMAs of the profile named by
+Settings.SQLITE_PROFILE, applied in a SQLAlchemy "connect" event so pooled,
+null-pooled and script engines all behave the same.
+
+durable     WAL + synchronous=FULL: every commit survives power loss
+balanced    WAL + synchronous=NORMAL: a power cut can lose the last commits,
+            never corrupts; bigger cache and memory-mapped reads
+throughput  WAL + synchronous=OFF: fastest; an OS crash can corrupt the file,
+            use for benchmarks and disposable data only
+"""
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    name: str
+    journal_mode: str
+    synchronous: str
+    # Negative values are KiB, as PRAGMA cache_size expects
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+    busy_timeout: int
+
+    def pragmas(self) -> dict:
+        values = asdict(self)
+        values.pop("name")
+        return values
+
+
+PROFILES = {
+    "durable": SQLiteProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        cache_size=-16_000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+        busy_timeout=10_000,
+    ),
+    "balanced": SQLiteProfile(
+        name="balanced",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64_000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5_000,
+    ),
+    "throughput": SQLiteProfile(
+        name="throughput",
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size=-256_000,
+        mmap_size=1024 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=2_000,
+    ),
+}
+
+
+def apply_profile(engine: AsyncEngine, profile: SQLiteProfile) -> None:
+    """Run the profile's PRAGMAs on every connection the engine opens"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in profile.pragmas().items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+
+def make_read_only(engine: AsyncEngine) -> None:
+    """Reject writes on every connection of a read engine"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def use_explicit_begin(engine: AsyncEngine) -> None:
+    """
+    Let SQLAlchemy emit BEGIN instead of the sqlite3 module, so a transaction
+    can ask for BEGIN IMMEDIATE with the `sqlite_begin` execution option
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        mode = conn.get_execution_options().get("sqlite_begin")
+        conn.exec_driver_sql(f"BEGIN {mode}" if mode else "BEGIN")
+
+
+async def read_pragmas(engine: AsyncEngine) -> dict:
+    """What a pooled connection actually runs with"""
+    async with engine.connect() as conn:
+        return {
+            pragma: (await conn.exec_driver_sql(f"PRAGMA {pragma}")).scalar()
+            for pragma in SQLiteProfile.__dataclass_fields__
+            if pragma != "name"
+        }
@@ -0,0 +1,127 @@
+"""
+Single-writer queue for SQLite
+
+SQLite allows one write transaction at a time. Instead of letting concurrent
+units of work race for the file lock (and stall for busy_timeout, or fail
+with "database is locked"), write-side DBManagers wait their turn here in
+FIFO order and then open their transaction with BEGIN IMMEDIATE, so the lock
+is taken up front and never has to be upgraded mid-transaction.
+
+A unit of work nested in one that already holds the slot (a background task
+of the same request, say) goes straight through instead of deadlocking.
+SQLITE_BUSY from other processes is retried with exponential backoff.
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+
+SQLITE_BUSY = 5
+
+_holder: ContextVar[object | None] = ContextVar("write_queue_holder", default=None)
+
+
+def is_busy(error: OperationalError) -> bool:
+    code = getattr(error.orig, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF == SQLITE_BUSY
+    return "database is locked" in str(error.orig)
+
+
+@dataclass
+class WriteQueueStats:
+    transactions: int = 0
+    reentrant: int = 0
+    max_depth: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    busy_retries: int = 0
+    busy_failures: int = 0
+
+
+class WriteQueue:
+    def __init__(self, busy_retries: int, busy_backoff_ms: float):
+        self.busy_retries = busy_retries
+        self.busy_backoff_ms = busy_backoff_ms
+        self.stats = WriteQueueStats()
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._owner: object | None = None
+        self._waiting = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        # One lock per event loop, test runs start a new loop per test
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop, self._owner, self._waiting = asyncio.Lock(), loop, None, 0
+        return self._lock
+
+    @property
+    def depth(self) -> int:
+        """Units of work waiting for the slot right now"""
+        return self._waiting
+
+    async def acquire(self) -> bool:
+        """Wait for the writer slot; False when the current context already holds it"""
+        if self._owner is not None and _holder.get() is self._owner:
+            self.stats.reentrant += 1
+            return False
+
+        lock = self._get_lock()
+        self._waiting += 1
+        self.stats.max_depth = max(self.stats.max_depth, self._waiting)
+        started = time.perf_counter()
+        try:
+            await lock.acquire()
+        finally:
+            self._waiting -= 1
+
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.stats.transactions += 1
+        self.stats.total_wait_ms += waited_ms
+        self.stats.max_wait_ms = max(self.stats.max_wait_ms, waited_ms)
+        self._owner = object()
+        _holder.set(self._owner)
+        return True
+
+    def release(self) -> None:
+        self._owner = None
+        self._lock.release()
+
+    async def retry_busy(self, operation):
+        """Await `operation()`, retrying SQLITE_BUSY with jittered exponential backoff"""
+        attempt = 0
+        while True:
+            try:
+                return await operation()
+            except OperationalError as e:
+                if not is_busy(e):
+                    raise
+                if attempt >= self.busy_retries:
+                    self.stats.busy_failures += 1
+                    raise
+            self.stats.busy_retries += 1
+            delay = self.busy_backoff_ms * 2 ** attempt * random.uniform(0.5, 1.5)
+            attempt += 1
+            print(f"[DB] Database busy, retry {attempt}/{self.busy_retries} in {delay:.0f} ms")
+            await asyncio.sleep(delay / 1000)
+
+    def snapshot(self) -> dict:
+        stats = asdict(self.stats)
+        stats["avg_wait_ms"] = self.stats.total_wait_ms / self.stats.transactions if self.stats.transactions else 0.0
+        return {
+            "depth": self.depth,
+            "busy_retry_limit": self.busy_retries,
+            **stats,
+        }
+
+
+write_queue = WriteQueue(
+    busy_retries=settings.DB_WRITE_BUSY_RETRIES,
+    busy_backoff_ms=settings.DB_WRITE_BUSY_BACKOFF_MS,
+)
@@ -71,3 +71,19 @@ class UserNotFound(HTTPException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+class InvalidInclude(HTTPException):
+    def __init__(self, unknown: list[str]):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown include: {', '.join(unknown)}"
+        )
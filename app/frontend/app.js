@@ -293,7 +293,8 @@ async function createPostElement(post) {
   const date = new Date(post.created_at).toLocaleDateString('ru-RU');
   const isMyPost = currentUser?.id === post.user_id;
   const isFriend = friendIds.has(post.user_id);
-  const isLiked = await isPostLiked(post.id);
+  // Feeds resolve liked_by_me server-side; fall back only when it is absent
+  const isLiked = post.liked_by_me ?? await isPostLiked(post.id);
   const isOwnProfile = currentUser?.id === post.user_id;
   
   // Admin or post author can delete
@@ -540,38 +541,32 @@ async function toggleLike(postId) {
       return;
     }
     
-    const isLiked = await isPostLiked(postId);
+    const isLiked = btn.classList.contains('liked');
     
     const response = await fetch(`${API_URL}/posts/${postId}/like`, {
-      method: isLiked ? 'DELETE' : 'POST',
-      headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      method: 'PUT',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${localStorage.getItem('token')}`
+      },
+      body: JSON.stringify({ liked: !isLiked })
     });
     
     if (response.ok) {
-      // Немедленно обновляем кнопку БЕЗ перезагрузки
-      if (isLiked) {
-        // Убираем лайк
-        btn.classList.remove('liked');
-        btn.style.background = '';
-        btn.style.color = '';
-        btn.style.borderColor = '';
-      } else {
-        // Добавляем лайк
+      // Ответ уже содержит новое состояние и счётчик
+      const state = await response.json();
+      if (state.liked) {
         btn.classList.add('liked');
         btn.style.background = 'rgba(236, 72, 153, 0.2)';
         btn.style.color = 'var(--secondary)';
         btn.style.borderColor = 'rgba(236, 72, 153, 0.3)';
+      } else {
+        btn.classList.remove('liked');
+        btn.style.background = '';
+        btn.style.color = '';
+        btn.style.borderColor = '';
       }
-      
-      // Получаем обновлённый счётчик
-      const getPost = await fetch(`${API_URL}/posts/${postId}`, {
-        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
-      });
-      
-      if (getPost.ok) {
-        const post = await getPost.json();
-        likesCountEl.textContent = `❤️ ${post.likes_count || 0} лайков`;
-      }
+      likesCountEl.textContent = `❤️ ${state.likes_count} лайков`;
     } else {
       console.error('Error toggling like:', response.status);
       alert('❌ Ошибка при добавлении лайка');
@@ -603,7 +598,8 @@ async function loadFavorites() {
       
       let favoredPosts = [];
       for (const post of allPosts) {
-        const isLiked = await isPostLiked(post.id);
+        // /posts/ fills liked_by_me for a signed-in user, so this rarely costs a request
+        const isLiked = post.liked_by_me ?? await isPostLiked(post.id);
         if (isLiked) {
           favoredPosts.push(post);
         }
@@ -0,0 +1,39 @@
+"""
+/admin mount that imports and builds SQLAdmin on the first request
+
+app/admin.py pulls in sqladmin, WTForms and Jinja2 and registers a ModelView
+per table, which every worker would pay for at boot although only operators
+open /admin. Settings.ADMIN_MODE picks this stub ("lazy"), building the
+admin at startup ("eager") or no admin at all ("off").
+"""
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class LazyAdmin:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self._app = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._app is not None
+
+    @property
+    def routes(self) -> list:
+        # Mount.routes reads this, so url_for("admin:...") resolves once built
+        return self._app.routes if self._app is not None else []
+
+    def load(self):
+        # Synchronous: concurrent first requests cannot interleave here
+        if self._app is None:
+            started = time.perf_counter()
+            from app.admin import build_admin
+
+            self._app = build_admin(self.engine)
+            print(f"[ADMIN] SQLAdmin loaded on first request in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return self._app
+
+    async def __call__(self, scope, receive, send):
+        await self.load()(scope, receive, send)
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Text, ForeignKey, DateTime
+from sqlalchemy import String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.database.database import Base
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
 class CommentModel(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # A post's comments and previews, newest first; a user's comments
+        Index("ix_comments_post_created", "post_id", "created_at"),
+        Index("ix_comments_user_created", "user_id", "created_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
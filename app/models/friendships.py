@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.database.database import Base
@@ -10,6 +10,12 @@ if TYPE_CHECKING:
 
 class FriendshipModel(Base):
     __tablename__ = "friendships"
+    __table_args__ = (
+        # One row per direction; also serves "friends of user_id"
+        Index("uq_friendships_user_friend", "user_id", "friend_id", unique=True),
+        # Incoming requests and the reverse side of friend lookups
+        Index("ix_friendships_friend_created", "friend_id", "created_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.database.database import Base
@@ -11,6 +11,13 @@ if TYPE_CHECKING:
 
 class LikeModel(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # One like per (user, post); post_id leads so a post's likes are a range scan,
+        # and the per-viewer "liked by me" lookup probes (post_id, user_id) pairs
+        Index("uq_likes_post_user", "post_id", "user_id", unique=True),
+        # A user's likes, newest first
+        Index("ix_likes_user_created", "user_id", "created_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
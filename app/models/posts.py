@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Text, ForeignKey, DateTime, Integer
+from sqlalchemy import String, Text, ForeignKey, DateTime, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.database.database import Base
@@ -12,6 +12,13 @@ if TYPE_CHECKING:
 
 class PostModel(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Creation, likes and comments move activity_at: the trending recompute finds touched posts here
+        Index("ix_posts_activity_at", "activity_at"),
+        # Feed pages walk (created_at, id) backwards, globally and per author
+        Index("ix_posts_created_id", "created_at", "id"),
+        Index("ix_posts_user_created", "user_id", "created_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -19,7 +26,11 @@ class PostModel(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Last creation, like or comment; counter bumps set it and leave updated_at to edits.
+    # Nullable only because SQLite adds it to existing tables with a plain ALTER TABLE
+    activity_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow)
     likes_count: Mapped[int] = mapped_column(Integer, default=0)
+    comments_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     user: Mapped["UserModel"] = relationship(back_populates="posts")
     comments: Mapped[list["CommentModel"]] = relationship(back_populates="post", cascade="all, delete-orphan")
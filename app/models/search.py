@@ -0,0 +1,108 @@
+"""
+FTS5 full-text indexes over posts (title, content) and comments (content)
+
+Both are external-content tables: the text stays in posts/comments and the
+FTS tables only hold the inverted index, kept in sync by triggers. The
+update triggers fire on text columns only, so counter updates never touch
+the index. unicode61 case-folds Cyrillic as well as Latin, and the prefix
+indexes keep prefix queries such as "прив*" cheap.
+
+On PostgreSQL the same text is indexed with GIN expression indexes over
+tsvectors ('simple' configuration, no stemming, like unicode61), title
+weighted above content; no triggers are needed.
+
+The DDL is attached to the mapped tables, so `create_all` builds the indexes
+too. Existing databases get them from the 006 migration or
+rebuild_search_index.py.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.comments import CommentModel
+from app.models.posts import PostModel
+
+TOKENIZE = "unicode61 remove_diacritics 2"
+PREFIX = "2 3"
+
+POSTS_FTS = "posts_fts"
+COMMENTS_FTS = "comments_fts"
+
+# A title hit weighs ten times a body hit
+POSTS_BM25_WEIGHTS = "10.0, 1.0"
+
+POSTS_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id',
+        tokenize='{TOKENIZE}', prefix='{PREFIX}'
+    )""",
+    f"INSERT INTO posts_fts(posts_fts, rank) VALUES('rank', 'bm25({POSTS_BM25_WEIGHTS})')",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+COMMENTS_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+        content, content='comments', content_rowid='id',
+        tokenize='{TOKENIZE}', prefix='{PREFIX}'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_ai AFTER INSERT ON comments BEGIN
+        INSERT INTO comments_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_ad AFTER DELETE ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_au AFTER UPDATE OF content ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO comments_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+SEARCH_DDL = POSTS_FTS_DDL + COMMENTS_FTS_DDL
+
+TS_CONFIG = "simple"
+# ts_rank weights are {D, C, B, A}: title (A) counts ten times content (B)
+TS_RANK_WEIGHTS = "{0.1, 0.2, 0.1, 1.0}"
+
+
+def posts_tsvector(prefix: str = "") -> str:
+    """The indexed expression; queries must repeat it verbatim, `prefix` being a table alias"""
+    return (
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({prefix}title, '')), 'A') || "
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({prefix}content, '')), 'B')"
+    )
+
+
+def comments_tsvector(prefix: str = "") -> str:
+    return f"to_tsvector('{TS_CONFIG}', coalesce({prefix}content, ''))"
+
+
+POSTS_TS_DDL = [f"CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING gin (({posts_tsvector()}))"]
+COMMENTS_TS_DDL = [f"CREATE INDEX IF NOT EXISTS ix_comments_search ON comments USING gin (({comments_tsvector()}))"]
+SEARCH_DDL_POSTGRESQL = POSTS_TS_DDL + COMMENTS_TS_DDL
+
+
+def rebuild_statements() -> list[str]:
+    """Re-read every row of the content tables, then merge the index b-trees"""
+    return [
+        f"INSERT INTO {table}({table}) VALUES('{command}')"
+        for table in (POSTS_FTS, COMMENTS_FTS)
+        for command in ("rebuild", "optimize")
+    ]
+
+
+for _table, _fts, _ddl, _ts_ddl in (
+    (PostModel.__table__, POSTS_FTS, POSTS_FTS_DDL, POSTS_TS_DDL),
+    (CommentModel.__table__, COMMENTS_FTS, COMMENTS_FTS_DDL, COMMENTS_TS_DDL),
+):
+    for _statement in _ddl:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(_table, "before_drop", DDL(f"DROP TABLE IF EXISTS {_fts}").execute_if(dialect="sqlite"))
+    for _statement in _ts_ddl:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,19 @@
+from sqlalchemy import ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.database.database import Base
+
+
+class TimelineEntryModel(Base):
+    """Materialized home timeline: one row per (reader, post) pushed on write"""
+    __tablename__ = "timeline_entries"
+    __table_args__ = (
+        Index("ix_timeline_entries_user_created", "user_id", "created_at", "post_id"),
+        Index("ix_timeline_entries_user_author", "user_id", "author_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id"), primary_key=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # Copy of posts.created_at so the timeline is ordered without touching posts
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
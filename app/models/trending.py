@@ -0,0 +1,18 @@
+from sqlalchemy import ForeignKey, DateTime, Float, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.database.database import Base
+
+
+class PostScoreModel(Base):
+    """Precomputed trending score of a post, refreshed by the background recompute"""
+    __tablename__ = "post_scores"
+    __table_args__ = (
+        # /posts/trending is a backward range scan of this index
+        Index("ix_post_scores_score", "score", "post_id"),
+    )
+
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id"), primary_key=True)
+    # log2 of the time-decayed engagement, see app.services.trending.hot_score
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Float, ForeignKey
+from sqlalchemy import String, Float, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -14,11 +14,19 @@ if TYPE_CHECKING:
 
 class UserModel(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # The few authors above TIMELINE_FANOUT_MAX_FRIENDS, pulled on timeline reads
+        Index("ix_users_friendships_count", "friendships_count"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(300), nullable=False)
     is_admin: Mapped[bool] = mapped_column(default=False, nullable=False)
+    # Friendship rows touching the user, either direction; moved with every
+    # friendship write, so timeline push vs pull is decided without a COUNT
+    friendships_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
     role: Mapped["RoleModel"] = relationship(back_populates="users")
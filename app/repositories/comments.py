@@ -1,7 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.database.query_advisor import SAMPLE_TIME, explain
 from app.models.comments import CommentModel
+from app.models.users import UserModel
+from app.repositories.posts import PostRepository
 from app.schemes.comments import CommentCreate, CommentUpdate
 
 
@@ -17,6 +23,7 @@ class CommentRepository:
         )
         self.session.add(db_comment)
         await self.session.flush()
+        await PostRepository(self.session).increment_comments(post_id)
         await self.session.refresh(db_comment, ["user"])
         return db_comment
 
@@ -28,25 +35,72 @@ class CommentRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_post_comments(self, post_id: int, skip: int = 0, limit: int = 20) -> list[CommentModel]:
-        result = await self.session.execute(
+    @explain(1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_post_comments(
+        self, post_id: int, skip: int = 0, limit: int = 20, before: tuple[datetime, int] | None = None
+    ) -> list[CommentModel]:
+        query = (
             select(CommentModel)
             .where(CommentModel.post_id == post_id)
             .options(selectinload(CommentModel.user))
-            .offset(skip)
+        )
+        if before is not None:
+            query = query.where(tuple_(CommentModel.created_at, CommentModel.id) < tuple_(*before))
+        else:
+            query = query.offset(skip)
+        result = await self.session.execute(
+            query
             .limit(limit)
-            .order_by(CommentModel.created_at.desc())
+            .order_by(CommentModel.created_at.desc(), CommentModel.id.desc())
         )
         return result.scalars().all()
 
-    async def get_user_comments(self, user_id: int, skip: int = 0, limit: int = 20) -> list[CommentModel]:
+    @explain([1, 2, 3], 3)
+    async def get_previews(self, post_ids: list[int], size: int) -> list:
+        """Latest `size` comments of every listed post with author names, in one windowed query"""
+        if not post_ids:
+            return []
+        ranked = (
+            select(
+                CommentModel.id,
+                CommentModel.post_id,
+                CommentModel.user_id,
+                CommentModel.content,
+                CommentModel.created_at,
+                UserModel.name.label("author_username"),
+                func.row_number()
+                .over(
+                    partition_by=CommentModel.post_id,
+                    order_by=(CommentModel.created_at.desc(), CommentModel.id.desc()),
+                )
+                .label("rn"),
+            )
+            .outerjoin(UserModel, UserModel.id == CommentModel.user_id)
+            .where(CommentModel.post_id.in_(post_ids))
+            .subquery()
+        )
         result = await self.session.execute(
+            select(ranked).where(ranked.c.rn <= size).order_by(ranked.c.post_id, ranked.c.rn)
+        )
+        return result.mappings().all()
+
+    @explain(1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_user_comments(
+        self, user_id: int, skip: int = 0, limit: int = 20, before: tuple[datetime, int] | None = None
+    ) -> list[CommentModel]:
+        query = (
             select(CommentModel)
             .where(CommentModel.user_id == user_id)
             .options(selectinload(CommentModel.user))
-            .offset(skip)
+        )
+        if before is not None:
+            query = query.where(tuple_(CommentModel.created_at, CommentModel.id) < tuple_(*before))
+        else:
+            query = query.offset(skip)
+        result = await self.session.execute(
+            query
             .limit(limit)
-            .order_by(CommentModel.created_at.desc())
+            .order_by(CommentModel.created_at.desc(), CommentModel.id.desc())
         )
         return result.scalars().all()
 
@@ -67,4 +121,5 @@ class CommentRepository:
         
         await self.session.delete(db_comment)
         await self.session.flush()
+        await PostRepository(self.session).decrement_comments(db_comment.post_id)
         return True
@@ -1,6 +1,11 @@
+from datetime import datetime
+
+from sqlalchemy import tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.database.query_advisor import SAMPLE_TIME, explain
 from app.models.friendships import FriendshipModel
+from app.models.users import UserModel
 from app.schemes.friendships import FriendshipCreate
 
 
@@ -14,10 +19,22 @@ class FriendshipRepository:
             friend_id=friend_id
         )
         self.session.add(db_friendship)
+        await self.bump_counts(user_id, friend_id, 1)
         await self.session.commit()
         await self.session.refresh(db_friendship)
         return db_friendship
 
+    async def bump_counts(self, user_id: int, friend_id: int, delta: int) -> None:
+        """Move users.friendships_count of both ends of one friendship row, in the caller's transaction"""
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id.in_((user_id, friend_id)))
+            # A friend count is not a profile edit: leave updated_at alone
+            .values(friendships_count=UserModel.friendships_count + delta, updated_at=UserModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @explain(1, 2)
     async def get_friendship(self, user_id: int, friend_id: int) -> FriendshipModel | None:
         result = await self.session.execute(
             select(FriendshipModel)
@@ -26,16 +43,23 @@ class FriendshipRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_user_friends(self, user_id: int, skip: int = 0, limit: int = 20) -> list[FriendshipModel]:
+    @explain(1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_user_friends(
+        self, user_id: int, skip: int = 0, limit: int = 20, before: tuple[datetime, int] | None = None
+    ) -> list[FriendshipModel]:
+        query = select(FriendshipModel).where(FriendshipModel.user_id == user_id)
+        if before is not None:
+            query = query.where(tuple_(FriendshipModel.created_at, FriendshipModel.id) < tuple_(*before))
+        else:
+            query = query.offset(skip)
         result = await self.session.execute(
-            select(FriendshipModel)
-            .where(FriendshipModel.user_id == user_id)
-            .offset(skip)
+            query
             .limit(limit)
-            .order_by(FriendshipModel.created_at.desc())
+            .order_by(FriendshipModel.created_at.desc(), FriendshipModel.id.desc())
         )
         return result.scalars().all()
 
+    @explain(1)
     async def get_user_incoming_friendships(self, friend_id: int, skip: int = 0, limit: int = 20) -> list[FriendshipModel]:
         result = await self.session.execute(
             select(FriendshipModel)
@@ -52,6 +76,7 @@ class FriendshipRepository:
             return False
         
         await self.session.delete(friendship)
+        await self.bump_counts(friendship.user_id, friendship.friend_id, -1)
         await self.session.commit()
         return True
 
@@ -61,5 +86,6 @@ class FriendshipRepository:
             return False
         
         await self.session.delete(friendship)
+        await self.bump_counts(user_id, friend_id, -1)
         await self.session.commit()
         return True
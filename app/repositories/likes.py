@@ -1,7 +1,23 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.database.dialect import upsert
+from app.database.query_advisor import SAMPLE_TIME, explain
 from app.models.likes import LikeModel
+from app.repositories.posts import PostRepository
+
+
+# Rows per multi-row statement, well under SQLite's bound-parameter limit (and PostgreSQL's)
+WRITE_CHUNK_SIZE = 500
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 class LikeRepository:
@@ -12,9 +28,68 @@ class LikeRepository:
         db_like = LikeModel(user_id=user_id, post_id=post_id)
         self.session.add(db_like)
         await self.session.flush()
+        await PostRepository(self.session).increment_likes(post_id)
         await self.session.refresh(db_like, ["user"])
         return db_like
 
+    @explain(1, 1, True)
+    @explain(1, 1, False)
+    async def set_like(self, user_id: int, post_id: int, liked: bool) -> int | None:
+        """
+        Idempotently put a like into the desired state.
+        Returns the post's likes_count afterwards, or None if the post does not exist.
+        Two statements either way: the like write and the counter update (or read).
+        """
+        if liked:
+            result = await self.session.execute(
+                upsert(self.session, LikeModel)
+                .values(user_id=user_id, post_id=post_id)
+                .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+                .returning(LikeModel.id)
+            )
+        else:
+            result = await self.session.execute(
+                delete(LikeModel)
+                .where((LikeModel.user_id == user_id) & (LikeModel.post_id == post_id))
+                .returning(LikeModel.id)
+            )
+        posts = PostRepository(self.session)
+        if result.scalar_one_or_none() is None:
+            return await posts.get_likes_count(post_id)
+        if liked:
+            return await posts.increment_likes(post_id)
+        return await posts.decrement_likes(post_id)
+
+    async def apply_intents(
+        self,
+        likes: list[tuple[int, int]],
+        unlikes: list[tuple[int, int]],
+    ) -> Counter:
+        """
+        Write a batch of (user_id, post_id) like/unlike intents and keep likes_count in step.
+        Counters move by the rows actually inserted or deleted, so intents that are
+        already satisfied cost nothing. Returns the applied change per post.
+        """
+        changes = Counter()
+        for chunk in _chunks(likes, WRITE_CHUNK_SIZE):
+            result = await self.session.execute(
+                upsert(self.session, LikeModel)
+                .values([{"user_id": user_id, "post_id": post_id} for user_id, post_id in chunk])
+                .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+                .returning(LikeModel.post_id)
+            )
+            changes.update(result.scalars().all())
+        for chunk in _chunks(unlikes, WRITE_CHUNK_SIZE):
+            result = await self.session.execute(
+                delete(LikeModel)
+                .where(tuple_(LikeModel.user_id, LikeModel.post_id).in_(chunk))
+                .returning(LikeModel.post_id)
+            )
+            changes.subtract(result.scalars().all())
+        await PostRepository(self.session).add_to_likes(changes)
+        return changes
+
+    @explain(1, 1)
     async def get_like(self, user_id: int, post_id: int) -> LikeModel | None:
         result = await self.session.execute(
             select(LikeModel)
@@ -23,6 +98,18 @@ class LikeRepository:
         )
         return result.scalar_one_or_none()
 
+    @explain(1, [1, 2, 3])
+    async def get_liked_post_ids(self, user_id: int, post_ids: list[int]) -> set[int]:
+        """Which of the given posts the user has liked, in one indexed lookup"""
+        if not post_ids:
+            return set()
+        result = await self.session.execute(
+            select(LikeModel.post_id)
+            .where(LikeModel.user_id == user_id)
+            .where(LikeModel.post_id.in_(post_ids))
+        )
+        return set(result.scalars().all())
+
     async def get_like_by_id(self, like_id: int) -> LikeModel | None:
         result = await self.session.execute(
             select(LikeModel)
@@ -31,6 +118,7 @@ class LikeRepository:
         )
         return result.scalar_one_or_none()
 
+    @explain(1)
     async def get_post_likes(self, post_id: int) -> list[LikeModel]:
         result = await self.session.execute(
             select(LikeModel)
@@ -40,12 +128,27 @@ class LikeRepository:
         )
         return result.scalars().all()
 
-    async def get_user_likes(self, user_id: int) -> list[LikeModel]:
-        result = await self.session.execute(
+    @explain(1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_user_likes(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int | None = None,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[LikeModel]:
+        query = (
             select(LikeModel)
             .where(LikeModel.user_id == user_id)
             .options(selectinload(LikeModel.user))
-            .order_by(LikeModel.created_at.desc())
+        )
+        if before is not None:
+            query = query.where(tuple_(LikeModel.created_at, LikeModel.id) < tuple_(*before))
+        elif skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.session.execute(
+            query.order_by(LikeModel.created_at.desc(), LikeModel.id.desc())
         )
         return result.scalars().all()
 
@@ -55,6 +158,7 @@ class LikeRepository:
             return False
         await self.session.delete(like)
         await self.session.flush()
+        await PostRepository(self.session).decrement_likes(like.post_id)
         return True
 
     async def delete_like_by_user_post(self, user_id: int, post_id: int) -> bool:
@@ -63,6 +167,7 @@ class LikeRepository:
             return False
         await self.session.delete(like)
         await self.session.flush()
+        await PostRepository(self.session).decrement_likes(post_id)
         return True
 
     async def get_like_by_post_and_user(self, post_id: int, user_id: int) -> LikeModel | None:
@@ -1,7 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.database.query_advisor import SAMPLE_TIME, explain
+from app.models.comments import CommentModel
+from app.models.likes import LikeModel
 from app.models.posts import PostModel
+from app.models.users import UserModel
 from app.schemes.posts import PostCreate, PostUpdate
 
 
@@ -20,6 +27,7 @@ class PostRepository:
         await self.session.refresh(db_post, ["user"])
         return db_post
 
+    @explain(1)
     async def get_post_by_id(self, post_id: int) -> PostModel | None:
         result = await self.session.execute(
             select(PostModel)
@@ -28,6 +36,7 @@ class PostRepository:
         )
         return result.scalar_one_or_none()
 
+    @explain(skip=0, limit=20)
     async def get_all_posts(self, skip: int = 0, limit: int = 10) -> list[PostModel]:
         result = await self.session.execute(
             select(PostModel)
@@ -38,6 +47,7 @@ class PostRepository:
         )
         return result.scalars().all()
 
+    @explain(1, skip=0, limit=20)
     async def get_user_posts(self, user_id: int, skip: int = 0, limit: int = 10) -> list[PostModel]:
         result = await self.session.execute(
             select(PostModel)
@@ -49,6 +59,57 @@ class PostRepository:
         )
         return result.scalars().all()
 
+    @staticmethod
+    def feed_query():
+        """Posts joined to their authors; counters come from the denormalized columns"""
+        return (
+            select(
+                PostModel,
+                UserModel.name.label("author_name"),
+                UserModel.email.label("author_email"),
+            )
+            .outerjoin(UserModel, UserModel.id == PostModel.user_id)
+        )
+
+    @explain(limit=20)
+    @explain(limit=20, before=(SAMPLE_TIME, 1))
+    @explain(user_id=1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_feed(
+        self,
+        user_id: int | None = None,
+        skip: int = 0,
+        limit: int = 10,
+        before: tuple[datetime, int] | None = None,
+    ) -> list:
+        """One statement per page: (post, author_name, author_email) rows"""
+        query = self.feed_query()
+        if user_id is not None:
+            query = query.where(PostModel.user_id == user_id)
+        if before is not None:
+            query = query.where(tuple_(PostModel.created_at, PostModel.id) < tuple_(*before))
+        else:
+            query = query.offset(skip)
+        result = await self.session.execute(
+            query
+            .limit(limit)
+            .order_by(PostModel.created_at.desc(), PostModel.id.desc())
+        )
+        return result.all()
+
+    @explain([1, 2, 3])
+    async def get_feed_posts(self, post_ids: list[int]) -> list:
+        """Feed rows for an explicit set of ids, in no particular order"""
+        result = await self.session.execute(
+            self.feed_query().where(PostModel.id.in_(post_ids))
+        )
+        return result.all()
+
+    async def get_feed_post(self, post_id: int):
+        result = await self.session.execute(
+            self.feed_query().where(PostModel.id == post_id)
+        )
+        return result.one_or_none()
+
     async def update_post(self, post_id: int, post_data: PostUpdate) -> PostModel | None:
         db_post = await self.get_post_by_id(post_id)
         if not db_post:
@@ -72,18 +133,92 @@ class PostRepository:
         await self.session.commit()
         return True
 
-    async def increment_likes(self, post_id: int) -> PostModel | None:
-        db_post = await self.get_post_by_id(post_id)
-        if db_post:
-            db_post.likes_count += 1
-            await self.session.commit()
-            await self.session.refresh(db_post, ["user"])
-        return db_post
+    async def _bump(self, post_id: int, column, delta: int) -> int | None:
+        """
+        Atomic `SET col = col + delta` inside the caller's transaction; the new value, None if no post.
+        Moves activity_at, not updated_at: a like or comment is not an edit of the post.
+        """
+        result = await self.session.execute(
+            update(PostModel)
+            .where(PostModel.id == post_id)
+            .values({
+                column: column + delta,
+                PostModel.activity_at: datetime.utcnow(),
+                PostModel.updated_at: PostModel.updated_at,
+            })
+            .returning(column)
+        )
+        return result.scalar_one_or_none()
 
-    async def decrement_likes(self, post_id: int) -> PostModel | None:
-        db_post = await self.get_post_by_id(post_id)
-        if db_post and db_post.likes_count > 0:
-            db_post.likes_count -= 1
-            await self.session.commit()
-            await self.session.refresh(db_post, ["user"])
-        return db_post
+    async def increment_likes(self, post_id: int) -> int | None:
+        return await self._bump(post_id, PostModel.likes_count, 1)
+
+    async def decrement_likes(self, post_id: int) -> int | None:
+        return await self._bump(post_id, PostModel.likes_count, -1)
+
+    @explain(1)
+    async def get_likes_count(self, post_id: int) -> int | None:
+        result = await self.session.execute(
+            select(PostModel.likes_count).where(PostModel.id == post_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def add_to_likes(self, deltas: dict[int, int]) -> None:
+        """Apply many likes_count changes with one executemany UPDATE"""
+        params = [{"b_post_id": post_id, "b_delta": delta} for post_id, delta in deltas.items() if delta]
+        if not params:
+            return
+        posts = PostModel.__table__
+        await self.session.execute(
+            update(posts)
+            .where(posts.c.id == bindparam("b_post_id"))
+            .values(
+                likes_count=posts.c.likes_count + bindparam("b_delta"),
+                activity_at=datetime.utcnow(),
+                updated_at=posts.c.updated_at,
+            ),
+            params,
+        )
+
+    async def increment_comments(self, post_id: int) -> None:
+        await self._bump(post_id, PostModel.comments_count, 1)
+
+    async def decrement_comments(self, post_id: int) -> None:
+        await self._bump(post_id, PostModel.comments_count, -1)
+
+    async def get_id_window(self, after_id: int, size: int) -> tuple[int, int] | None:
+        """First and last post id of the next `size` posts after `after_id`"""
+        ids = (
+            select(PostModel.id)
+            .where(PostModel.id > after_id)
+            .order_by(PostModel.id)
+            .limit(size)
+            .subquery()
+        )
+        result = await self.session.execute(select(func.min(ids.c.id), func.max(ids.c.id)))
+        first, last = result.one()
+        if first is None:
+            return None
+        return first, last
+
+    async def reconcile_counters(self, first_id: int, last_id: int) -> int:
+        """Recompute likes_count/comments_count for an id range, return how many rows drifted"""
+        likes = (
+            select(func.count(LikeModel.id))
+            .where(LikeModel.post_id == PostModel.id)
+            .scalar_subquery()
+        )
+        comments = (
+            select(func.count(CommentModel.id))
+            .where(CommentModel.post_id == PostModel.id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(PostModel)
+            .where(PostModel.id.between(first_id, last_id))
+            .where((PostModel.likes_count != likes) | (PostModel.comments_count != comments))
+            # A repaired counter is neither an edit nor new activity
+            .values(likes_count=likes, comments_count=comments, updated_at=PostModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,132 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.dialect import dialect_name
+from app.models.search import (
+    POSTS_BM25_WEIGHTS,
+    SEARCH_DDL,
+    SEARCH_DDL_POSTGRESQL,
+    TS_CONFIG,
+    TS_RANK_WEIGHTS,
+    comments_tsvector,
+    posts_tsvector,
+    rebuild_statements,
+)
+
+SNIPPET_TOKENS = 12
+
+# bm25() is spelled out rather than read through the `rank` column: FTS5 fails
+# a cached statement using `rank` once after another connection rewrites
+# the rank config, which rebuild() does
+_POST_HITS = f"""
+    SELECT 'post' AS kind, p.id AS id, p.id AS post_id, p.user_id AS user_id,
+           u.name AS author_name, p.title AS title,
+           snippet(posts_fts, -1, '<mark>', '</mark>', '…', :tokens) AS snippet,
+           bm25(posts_fts, {POSTS_BM25_WEIGHTS}) AS score, p.created_at AS created_at
+    FROM posts_fts
+    JOIN posts p ON p.id = posts_fts.rowid
+    LEFT JOIN users u ON u.id = p.user_id
+    WHERE posts_fts MATCH :match
+"""
+
+_COMMENT_HITS = """
+    SELECT 'comment' AS kind, c.id AS id, c.post_id AS post_id, c.user_id AS user_id,
+           u.name AS author_name, p.title AS title,
+           snippet(comments_fts, 0, '<mark>', '</mark>', '…', :tokens) AS snippet,
+           bm25(comments_fts) AS score, c.created_at AS created_at
+    FROM comments_fts
+    JOIN comments c ON c.id = comments_fts.rowid
+    JOIN posts p ON p.id = c.post_id
+    LEFT JOIN users u ON u.id = c.user_id
+    WHERE comments_fts MATCH :match
+"""
+
+# PostgreSQL: negated ts_rank so that, as with bm25(), smaller is better
+_HEADLINE = f"StartSel=<mark>, StopSel=</mark>, MaxWords={SNIPPET_TOKENS}, MinWords=3"
+
+_POST_HITS_POSTGRESQL = f"""
+    SELECT 'post' AS kind, p.id AS id, p.id AS post_id, p.user_id AS user_id,
+           u.name AS author_name, p.title AS title,
+           ts_headline('{TS_CONFIG}', p.title || ' ' || p.content, q, '{_HEADLINE}') AS snippet,
+           (-ts_rank('{TS_RANK_WEIGHTS}', {posts_tsvector("p.")}, q))::float8 AS score,
+           p.created_at AS created_at
+    FROM posts p
+    CROSS JOIN to_tsquery('{TS_CONFIG}', :match) AS q
+    LEFT JOIN users u ON u.id = p.user_id
+    WHERE ({posts_tsvector("p.")}) @@ q
+"""
+
+_COMMENT_HITS_POSTGRESQL = f"""
+    SELECT 'comment' AS kind, c.id AS id, c.post_id AS post_id, c.user_id AS user_id,
+           u.name AS author_name, p.title AS title,
+           ts_headline('{TS_CONFIG}', c.content, q, '{_HEADLINE}') AS snippet,
+           (-ts_rank({comments_tsvector("c.")}, q))::float8 AS score,
+           c.created_at AS created_at
+    FROM comments c
+    CROSS JOIN to_tsquery('{TS_CONFIG}', :match) AS q
+    JOIN posts p ON p.id = c.post_id
+    LEFT JOIN users u ON u.id = c.user_id
+    WHERE {comments_tsvector("c.")} @@ q
+"""
+
+
+def fts5_match(terms: list[str]) -> str:
+    """
+    Every word becomes a quoted prefix term and all of them must match.
+    Quoting keeps FTS5 operators and punctuation in user input from being
+    parsed as query syntax.
+    """
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def tsquery(terms: list[str]) -> str:
+    """The same query for to_tsquery: prefix terms joined with AND"""
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class SearchRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(
+        self,
+        terms: list[str],
+        scope: str = "all",
+        limit: int = 20,
+        after: tuple[float, str, int] | None = None,
+    ) -> list:
+        """
+        Hits containing every term as a word prefix, best first: BM25 on
+        SQLite, ts_rank on PostgreSQL. Keyset over (score, kind, id); rows
+        have the columns of _POST_HITS.
+        """
+        if dialect_name(self.session) == "postgresql":
+            post_hits, comment_hits = _POST_HITS_POSTGRESQL, _COMMENT_HITS_POSTGRESQL
+            params = {"match": tsquery(terms), "limit": limit}
+        else:
+            post_hits, comment_hits = _POST_HITS, _COMMENT_HITS
+            params = {"match": fts5_match(terms), "tokens": SNIPPET_TOKENS, "limit": limit}
+        parts = []
+        if scope in ("all", "posts"):
+            parts.append(post_hits)
+        if scope in ("all", "comments"):
+            parts.append(comment_hits)
+        query = f"SELECT * FROM ({' UNION ALL '.join(parts)}) AS hits"
+        if after is not None:
+            query += " WHERE (score, kind, id) > (:after_score, :after_kind, :after_id)"
+            params.update(after_score=after[0], after_kind=after[1], after_id=after[2])
+        query += " ORDER BY score, kind, id LIMIT :limit"
+        result = await self.session.execute(text(query), params)
+        return result.mappings().all()
+
+    async def rebuild(self) -> None:
+        """
+        Create missing FTS tables/triggers and re-index every post and comment.
+        PostgreSQL expression indexes never go stale, so only missing ones are created.
+        """
+        if dialect_name(self.session) == "postgresql":
+            statements = SEARCH_DDL_POSTGRESQL
+        else:
+            statements = [*SEARCH_DDL, *rebuild_statements()]
+        for statement in statements:
+            await self.session.execute(text(statement))
@@ -0,0 +1,187 @@
+from datetime import datetime
+
+from sqlalchemy import delete, exists, func, insert, literal, or_, select, tuple_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.query_advisor import SAMPLE_TIME, explain
+from app.models.friendships import FriendshipModel
+from app.models.posts import PostModel
+from app.models.timeline import TimelineEntryModel
+from app.models.users import UserModel
+from app.repositories.posts import PostRepository
+
+
+class TimelineRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def friend_ids(user_id: int, include_self: bool = False):
+        """Friendship is symmetric: either direction of the edge counts"""
+        selects = [
+            select(FriendshipModel.friend_id.label("id")).where(FriendshipModel.user_id == user_id),
+            select(FriendshipModel.user_id.label("id")).where(FriendshipModel.friend_id == user_id),
+        ]
+        if include_self:
+            selects.append(select(literal(user_id).label("id")))
+        return union(*selects)
+
+    @explain(1)
+    async def get_friendships_count(self, user_id: int) -> int:
+        result = await self.session.execute(
+            select(UserModel.friendships_count).where(UserModel.id == user_id)
+        )
+        return result.scalar() or 0
+
+    async def fan_out(self, post: PostModel, include_friends: bool = True) -> None:
+        """Push a post into the timelines of its author and (optionally) the author's friends"""
+        if include_friends:
+            recipients = self.friend_ids(post.user_id, include_self=True).subquery()
+        else:
+            recipients = select(literal(post.user_id).label("id")).subquery()
+
+        already = exists().where(
+            (TimelineEntryModel.user_id == recipients.c.id)
+            & (TimelineEntryModel.post_id == post.id)
+        )
+        rows = select(
+            recipients.c.id,
+            literal(post.id),
+            literal(post.user_id),
+            literal(post.created_at, type_=PostModel.created_at.type),
+        ).where(~already)
+        await self.session.execute(
+            insert(TimelineEntryModel).from_select(
+                ["user_id", "post_id", "author_id", "created_at"], rows
+            )
+        )
+        await self.trim(select(recipients.c.id))
+
+    async def backfill(self, user_id: int, author_id: int, limit: int) -> None:
+        """Copy the author's latest posts into a reader's timeline"""
+        latest = (
+            select(PostModel.id, PostModel.user_id, PostModel.created_at)
+            .where(PostModel.user_id == author_id)
+            .order_by(PostModel.created_at.desc(), PostModel.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        already = exists().where(
+            (TimelineEntryModel.user_id == user_id)
+            & (TimelineEntryModel.post_id == latest.c.id)
+        )
+        rows = select(literal(user_id), latest.c.id, latest.c.user_id, latest.c.created_at).where(~already)
+        await self.session.execute(
+            insert(TimelineEntryModel).from_select(
+                ["user_id", "post_id", "author_id", "created_at"], rows
+            )
+        )
+        await self.trim(select(literal(user_id)))
+
+    async def remove_author(self, user_id: int, author_id: int) -> None:
+        await self.session.execute(
+            delete(TimelineEntryModel)
+            .where(TimelineEntryModel.user_id == user_id)
+            .where(TimelineEntryModel.author_id == author_id)
+        )
+
+    async def remove_post(self, post_id: int) -> None:
+        await self.session.execute(
+            delete(TimelineEntryModel).where(TimelineEntryModel.post_id == post_id)
+        )
+
+    async def trim(self, user_ids, max_entries: int | None = None) -> None:
+        """Drop everything past the newest `max_entries` rows of each listed timeline"""
+        max_entries = max_entries or settings.TIMELINE_MAX_ENTRIES
+        ranked = (
+            select(
+                TimelineEntryModel.user_id,
+                TimelineEntryModel.post_id,
+                func.row_number()
+                .over(
+                    partition_by=TimelineEntryModel.user_id,
+                    order_by=(TimelineEntryModel.created_at.desc(), TimelineEntryModel.post_id.desc()),
+                )
+                .label("rn"),
+            )
+            .where(TimelineEntryModel.user_id.in_(user_ids))
+            .subquery()
+        )
+        overflow = select(ranked.c.user_id, ranked.c.post_id).where(ranked.c.rn > max_entries)
+        await self.session.execute(
+            delete(TimelineEntryModel).where(
+                tuple_(TimelineEntryModel.user_id, TimelineEntryModel.post_id).in_(overflow)
+            )
+        )
+
+    @explain(1, limit=20, before=(SAMPLE_TIME, 1))
+    async def get_timeline(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        before: tuple[datetime, int] | None = None,
+    ) -> list:
+        """Keyset scan of one reader's timeline: (post, author_name, author_email) rows"""
+        query = (
+            select(
+                PostModel,
+                UserModel.name.label("author_name"),
+                UserModel.email.label("author_email"),
+            )
+            .select_from(TimelineEntryModel)
+            .join(PostModel, PostModel.id == TimelineEntryModel.post_id)
+            .outerjoin(UserModel, UserModel.id == PostModel.user_id)
+            .where(TimelineEntryModel.user_id == user_id)
+        )
+        if before is not None:
+            query = query.where(
+                tuple_(TimelineEntryModel.created_at, TimelineEntryModel.post_id) < tuple_(*before)
+            )
+        else:
+            query = query.offset(skip)
+        result = await self.session.execute(
+            query
+            .limit(limit)
+            .order_by(TimelineEntryModel.created_at.desc(), TimelineEntryModel.post_id.desc())
+        )
+        return result.all()
+
+    @explain(1, 1000)
+    async def get_pull_author_ids(self, user_id: int, threshold: int) -> list[int]:
+        """
+        Friends whose posts are not pushed on write and have to be merged on
+        read. Walks the few users above the threshold (ix_users_friendships_count)
+        and probes the friendship index for each, never the reader's friend list.
+        """
+        is_friend = exists().where(
+            or_(
+                (FriendshipModel.user_id == user_id) & (FriendshipModel.friend_id == UserModel.id),
+                (FriendshipModel.user_id == UserModel.id) & (FriendshipModel.friend_id == user_id),
+            )
+        )
+        result = await self.session.execute(
+            select(UserModel.id)
+            .where(UserModel.friendships_count > threshold)
+            .where(UserModel.id != user_id)
+            .where(is_friend)
+        )
+        return list(result.scalars().all())
+
+    @explain([1, 2], limit=20, before=(SAMPLE_TIME, 1))
+    async def get_authors_posts(
+        self,
+        author_ids: list[int],
+        limit: int = 20,
+        before: tuple[datetime, int] | None = None,
+    ) -> list:
+        query = PostRepository.feed_query().where(PostModel.user_id.in_(author_ids))
+        if before is not None:
+            query = query.where(tuple_(PostModel.created_at, PostModel.id) < tuple_(*before))
+        result = await self.session.execute(
+            query
+            .limit(limit)
+            .order_by(PostModel.created_at.desc(), PostModel.id.desc())
+        )
+        return result.all()
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.dialect import hour_bucket, upsert
+from app.database.query_advisor import SAMPLE_TIME, explain
+from app.models.comments import CommentModel
+from app.models.likes import LikeModel
+from app.models.posts import PostModel
+from app.models.trending import PostScoreModel
+from app.models.users import UserModel
+
+
+class TrendingRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @explain(SAMPLE_TIME, 0, 500)
+    async def get_touched_post_ids(self, since: datetime, after_id: int, limit: int) -> list[int]:
+        """Posts created or engaged with since `since` (activity_at), walked in id order"""
+        result = await self.session.execute(
+            select(PostModel.id)
+            .where(PostModel.activity_at > since)
+            .where(PostModel.id > after_id)
+            .order_by(PostModel.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @explain([1, 2, 3], SAMPLE_TIME)
+    async def get_engagement(self, post_ids: list[int], window_start: datetime) -> list:
+        """
+        Hourly (post_id, kind, bucket, events) counts of likes and comments in the
+        window, plus each post's own creation as a single "post" event.
+        """
+        def hourly(model, kind):
+            bucket = hour_bucket(self.session, model.created_at)
+            return (
+                select(model.post_id, literal(kind).label("kind"), bucket.label("bucket"), func.count().label("events"))
+                .where(model.post_id.in_(post_ids))
+                .where(model.created_at >= window_start)
+                .group_by(model.post_id, bucket)
+            )
+
+        created = select(
+            PostModel.id,
+            literal("post").label("kind"),
+            hour_bucket(self.session, PostModel.created_at).label("bucket"),
+            literal(1).label("events"),
+        ).where(PostModel.id.in_(post_ids))
+
+        result = await self.session.execute(
+            union_all(hourly(LikeModel, "like"), hourly(CommentModel, "comment"), created)
+        )
+        return result.all()
+
+    async def save_scores(self, scores: dict[int, float], computed_at: datetime) -> None:
+        if not scores:
+            return
+        statement = upsert(self.session, PostScoreModel).values([
+            {"post_id": post_id, "score": score, "computed_at": computed_at}
+            for post_id, score in scores.items()
+        ])
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["post_id"],
+                set_={"score": statement.excluded.score, "computed_at": statement.excluded.computed_at},
+            )
+        )
+
+    async def remove_post(self, post_id: int) -> None:
+        await self.session.execute(delete(PostScoreModel).where(PostScoreModel.post_id == post_id))
+
+    @explain(limit=20, before=(0.0, 1))
+    async def get_trending(self, limit: int = 20, before: tuple[float, int] | None = None) -> list:
+        """(post, author_name, author_email, score) rows, hottest first"""
+        query = (
+            select(
+                PostModel,
+                UserModel.name.label("author_name"),
+                UserModel.email.label("author_email"),
+                PostScoreModel.score,
+            )
+            .select_from(PostScoreModel)
+            .join(PostModel, PostModel.id == PostScoreModel.post_id)
+            .outerjoin(UserModel, UserModel.id == PostModel.user_id)
+        )
+        if before is not None:
+            query = query.where(tuple_(PostScoreModel.score, PostScoreModel.post_id) < tuple_(*before))
+        result = await self.session.execute(
+            query
+            .order_by(PostScoreModel.score.desc(), PostScoreModel.post_id.desc())
+            .limit(limit)
+        )
+        return result.all()
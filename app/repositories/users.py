@@ -1,6 +1,7 @@
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import selectinload
 
+from app.models.friendships import FriendshipModel
 from app.models.users import UserModel
 from app.repositories.base import BaseRepository
 from app.schemes.users import SUserGet
@@ -26,3 +27,39 @@ class UsersRepository(BaseRepository):
 
         result = SUserGetWithRels.model_validate(model, from_attributes=True)
         return result
+
+    async def get_id_window(self, after_id: int, size: int) -> tuple[int, int] | None:
+        """First and last user id of the next `size` users after `after_id`"""
+        ids = (
+            select(UserModel.id)
+            .where(UserModel.id > after_id)
+            .order_by(UserModel.id)
+            .limit(size)
+            .subquery()
+        )
+        result = await self.session.execute(select(func.min(ids.c.id), func.max(ids.c.id)))
+        first, last = result.one()
+        if first is None:
+            return None
+        return first, last
+
+    async def reconcile_friendships_counts(self, first_id: int, last_id: int) -> int:
+        """Recompute friendships_count for an id range, return how many rows drifted"""
+        initiated = (
+            select(func.count(FriendshipModel.id))
+            .where(FriendshipModel.user_id == UserModel.id)
+            .scalar_subquery()
+        )
+        received = (
+            select(func.count(FriendshipModel.id))
+            .where(FriendshipModel.friend_id == UserModel.id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id.between(first_id, last_id))
+            .where(UserModel.friendships_count != initiated + received)
+            .values(friendships_count=initiated + received, updated_at=UserModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -33,6 +33,16 @@ class CommentUpdate(BaseModel):
         return v
 
 
+class CommentPreview(BaseModel):
+    """Комментарий, встроенный в ленту (последние N к посту)"""
+    id: int
+    post_id: int
+    user_id: int
+    content: str
+    created_at: datetime
+    author_username: Optional[str] = None
+
+
 class CommentResponse(BaseModel):
     """Ответ с информацией о комментарии"""
     id: int
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class LikeState(BaseModel):
+    """Желаемое состояние лайка"""
+    liked: bool
+
+
+class LikeStateResponse(BaseModel):
+    """Состояние лайка и счётчик после изменения"""
+    liked: bool
+    likes_count: int
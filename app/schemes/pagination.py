@@ -0,0 +1,11 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Страница списка при курсорной пагинации"""
+    items: list[T]
+    next_cursor: str | None = None
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional
 
+from app.schemes.comments import CommentPreview
+
 
 class PostCreate(BaseModel):
     """Схема для создания поста"""
@@ -67,12 +69,25 @@ class PostResponse(BaseModel):
     author_email: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    # Последний лайк или комментарий; только для Last-Modified, в ответ не попадает
+    activity_at: Optional[datetime] = Field(default=None, exclude=True)
     likes_count: int = 0
+    comments_count: int = 0
+    # Лайкнул ли пост текущий пользователь; None для гостей
+    liked_by_me: Optional[bool] = None
+    # Последние комментарии, только при include=comments_preview
+    comments_preview: Optional[list[CommentPreview]] = None
     
     class Config:
         from_attributes = True
 
 
+class PostBatchResponse(BaseModel):
+    """Ответ на пакетный запрос постов по списку id"""
+    items: list[PostResponse]
+    missing: list[int] = []
+
+
 class PostDetailResponse(PostResponse):
     """Детальный ответ с информацией о посте"""
     pass
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """Найденный пост или комментарий"""
+    kind: Literal["post", "comment"]
+    id: int
+    post_id: int
+    user_id: int
+    author_name: Optional[str] = None
+    # Заголовок поста (для комментария — заголовок поста, к которому он оставлен)
+    title: str
+    # Фрагмент текста с совпадениями в <mark>…</mark>
+    snippet: str
+    # BM25 (SQLite) или -ts_rank (PostgreSQL): чем меньше, тем релевантнее
+    score: float
+    created_at: datetime
@@ -1,6 +1,7 @@
 from app.database.db_manager import DBManager
 from app.schemes.comments import CommentCreate, CommentUpdate, CommentResponse
 from app.exceptions.exceptions import CommentNotFound, Forbidden
+from app.utils.cache import feed_cache
 
 
 class CommentService:
@@ -11,6 +12,7 @@ class CommentService:
         """Create a new comment on a post"""
         comment = await self.db.comments.create_comment(comment_data, user_id, post_id)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
         return comment
 
     async def get_comment(self, comment_id: int):
@@ -20,14 +22,14 @@ class CommentService:
             raise CommentNotFound()
         return comment
 
-    async def get_post_comments(self, post_id: int, skip: int = 0, limit: int = 20):
+    async def get_post_comments(self, post_id: int, skip: int = 0, limit: int = 20, before=None):
         """Get all comments for a post"""
-        comments = await self.db.comments.get_post_comments(post_id, skip, limit)
+        comments = await self.db.comments.get_post_comments(post_id, skip, limit, before)
         return comments or []
 
-    async def get_user_comments(self, user_id: int, skip: int = 0, limit: int = 20):
+    async def get_user_comments(self, user_id: int, skip: int = 0, limit: int = 20, before=None):
         """Get all comments by a user"""
-        comments = await self.db.comments.get_user_comments(user_id, skip, limit)
+        comments = await self.db.comments.get_user_comments(user_id, skip, limit, before)
         return comments or []
 
     async def update_comment(self, comment_id: int, comment_data: CommentCreate, current_user_id: int):
@@ -54,4 +56,5 @@ class CommentService:
         
         result = await self.db.comments.delete_comment(comment_id)
         await self.db.commit()
+        feed_cache.invalidate_post(comment.post_id)
         return result
\ No newline at end of file
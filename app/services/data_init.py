@@ -5,11 +5,11 @@ import asyncio
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, text
+from sqlalchemy import exists, select, update
 
 from app.config import settings
 from app.database.db_manager import DBManager
-from app.database.database import async_session_maker
+from app.database.database import async_session_maker, read_session_maker
 from app.services.auth import AuthService
 from app.models.users import UserModel
 from app.schemes.posts import PostCreate
@@ -70,6 +70,38 @@ SAMPLE_POSTS_FULL = [
     {"title": "⭐ Создание портфолио на GitHub", "content": "Ваш GitHub - ваше резюме. Делайте качественные проекты, пишите документацию!"},
 ]
 
+# Created by init_sample_data; its presence means the database is seeded
+SEED_MARKER_EMAIL = "alice@betony.local"
+
+
+async def is_seeded() -> bool:
+    """One indexed lookup (users.email is unique) instead of loading anything"""
+    async with DBManager(session_factory=read_session_maker, side="read") as db:
+        return await db.session.scalar(
+            select(exists().where(UserModel.email == SEED_MARKER_EMAIL))
+        )
+
+
+# Posts, likes or comments written per short-lived DBManager while seeding
+SEED_BATCH = 10
+
+
+def write_db() -> DBManager:
+    return DBManager(session_factory=async_session_maker)
+
+
+async def register_sample_user(email: str, password: str, name: str) -> UserModel:
+    """One user per unit of work, so the writer slot is held for one registration at a time"""
+    async with write_db() as db:
+        user, _ = await AuthService(db).register_and_login(email=email, password=password, name=name)
+        return user
+
+
+def batches(items: list, size: int = SEED_BATCH):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 async def init_sample_data():
     """
     Initialize database with sample data
@@ -80,197 +112,192 @@ async def init_sample_data():
     - Sample posts (50)
     - Sample likes
     - Sample comments
+
+    Every user and every batch of SEED_BATCH rows is its own short DBManager,
+    so requests that write (which wait for the same single-writer slot) get
+    in between them instead of waiting for the whole seed.
     """
     try:
-        async with DBManager(session_factory=async_session_maker) as db:
-            # Check if alice@betony.local exists
-            try:
-                result = await db.session.execute(
-                    select(UserModel).where(UserModel.email == "alice@betony.local")
-                )
-                existing_alice = result.scalars().first()
-            except Exception as migration_error:
-                print(f"[INIT] ⚠️  Database schema issue (likely missing columns): {migration_error}")
-                print("[INIT] ℹ️  This is normal on first run. Continuing with data initialization...")
-                # Try with a raw SQL check that ignores missing columns
-                try:
-                    raw_result = await db.session.execute(
-                        text("SELECT COUNT(*) FROM users WHERE email = 'alice@betony.local'")
-                    )
-                    count = raw_result.scalar()
-                    existing_alice = count > 0
-                except:
-                    existing_alice = False
-            
-            if existing_alice:
-                print("[INIT] ✅ Sample data already exists (alice@betony.local found), skipping initialization")
-                return
-            
-            print("[INIT] 🚀 Starting sample data initialization...")
-            
-            # Create TEST user first (REGULAR USER, NOT ADMIN!)
-            auth_service = AuthService(db)
-            test_user = None
-            try:
-                print(f"[INIT] 🧪 Creating TEST user: Тестовый Пользователь (REGULAR USER)")
-                test_user, token = await auth_service.register_and_login(
-                    email="test@betony.local",
-                    password="test123",
-                    name="Тестовый Пользователь"
+        if await is_seeded():
+            print(f"[INIT] ✅ Sample data already exists ({SEED_MARKER_EMAIL} found), skipping initialization")
+            return
+
+        print("[INIT] 🚀 Starting sample data initialization...")
+
+        # Create TEST user first (REGULAR USER, NOT ADMIN!)
+        test_user = None
+        try:
+            print(f"[INIT] 🧪 Creating TEST user: Тестовый Пользователь (REGULAR USER)")
+            test_user = await register_sample_user(
+                email="test@betony.local",
+                password="test123",
+                name="Тестовый Пользователь"
+            )
+            # TEST USER REMAINS REGULAR - is_admin stays False by default!
+            print(f"[INIT] ✅ TEST user created (REGULAR): {test_user.name} (ID: {test_user.id})")
+        except Exception as e:
+            print(f"[INIT] ❌ Error creating test user: {e}")
+            import traceback
+            traceback.print_exc()
+
+        # Create ADMIN USER - only alice@betony.local
+        admin_user = None
+        try:
+            print(f"[INIT] 👑 Creating ADMIN user: Алиса Джонсон (ADMIN ONLY!)")
+            admin_user = await register_sample_user(
+                email="alice@betony.local",
+                password="password123",
+                name="Алиса Джонсон"
+            )
+            # Set admin flag ONLY for alice@betony.local
+            async with write_db() as db:
+                await db.session.execute(
+                    update(UserModel).where(UserModel.id == admin_user.id).values(is_admin=True)
                 )
-                # TEST USER REMAINS REGULAR - is_admin stays False by default!
-                print(f"[INIT] ✅ TEST user created (REGULAR): {test_user.name} (ID: {test_user.id})")
-            except Exception as e:
-                print(f"[INIT] ❌ Error creating test user: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            # Create ADMIN USER - only alice@betony.local
-            admin_user = None
+                await db.commit()
+            admin_user.is_admin = True
+            print(f"[INIT] ✅ ADMIN user created (WITH ADMIN PRIVILEGES): {admin_user.name} (ID: {admin_user.id})")
+        except Exception as e:
+            print(f"[INIT] ❌ Error creating admin user: {e}")
+            import traceback
+            traceback.print_exc()
+
+        # Create regular sample users (14 more)
+        users_data = [
+            {"email": "bob@betony.local", "password": "password123", "name": "Боб Смит"},
+            {"email": "charlie@betony.local", "password": "password123", "name": "Чарли Браун"},
+            {"email": "diana@betony.local", "password": "password123", "name": "Диана Принс"},
+            {"email": "evan@betony.local", "password": "password123", "name": "Иван Дэвис"},
+            {"email": "fiona@betony.local", "password": "password123", "name": "Фиона Гарсия"},
+            {"email": "george@betony.local", "password": "password123", "name": "Джордж Мартинес"},
+            {"email": "hannah@betony.local", "password": "password123", "name": "Ханна Родригес"},
+            {"email": "ian@betony.local", "password": "password123", "name": "Ян Вилсон"},
+            {"email": "julia@betony.local", "password": "password123", "name": "Юлия Андерсон"},
+            {"email": "kevin@betony.local", "password": "password123", "name": "Кевин Тейлор"},
+            {"email": "lisa@betony.local", "password": "password123", "name": "Лиса Томас"},
+            {"email": "michael@betony.local", "password": "password123", "name": "Майкл Ли"},
+            {"email": "nina@betony.local", "password": "password123", "name": "Нина Уайт"},
+            {"email": "oliver@betony.local", "password": "password123", "name": "Оливер Харрис"},
+        ]
+
+        users = [admin_user] if admin_user else []
+        if test_user:
+            users.append(test_user)
+
+        for user_data in users_data:
             try:
-                print(f"[INIT] 👑 Creating ADMIN user: Алиса Джонсон (ADMIN ONLY!)")
-                admin_user, token = await auth_service.register_and_login(
-                    email="alice@betony.local",
-                    password="password123",
-                    name="Алиса Джонсон"
+                print(f"[INIT] 👤 Creating user: {user_data['name']} (REGULAR)")
+                user = await register_sample_user(
+                    email=user_data["email"],
+                    password=user_data["password"],
+                    name=user_data["name"]
                 )
-                # Set admin flag ONLY for alice@betony.local
-                admin_user.is_admin = True
-                await db.session.commit()
-                print(f"[INIT] ✅ ADMIN user created (WITH ADMIN PRIVILEGES): {admin_user.name} (ID: {admin_user.id})")
+                # All other users are regular - is_admin stays False by default
+                users.append(user)
+                print(f"[INIT] ✅ User created successfully (REGULAR): {user.name} (ID: {user.id})")
             except Exception as e:
-                print(f"[INIT] ❌ Error creating admin user: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            # Create regular sample users (14 more)
-            users_data = [
-                {"email": "bob@betony.local", "password": "password123", "name": "Боб Смит"},
-                {"email": "charlie@betony.local", "password": "password123", "name": "Чарли Браун"},
-                {"email": "diana@betony.local", "password": "password123", "name": "Диана Принс"},
-                {"email": "evan@betony.local", "password": "password123", "name": "Иван Дэвис"},
-                {"email": "fiona@betony.local", "password": "password123", "name": "Фиона Гарсия"},
-                {"email": "george@betony.local", "password": "password123", "name": "Джордж Мартинес"},
-                {"email": "hannah@betony.local", "password": "password123", "name": "Ханна Родригес"},
-                {"email": "ian@betony.local", "password": "password123", "name": "Ян Вилсон"},
-                {"email": "julia@betony.local", "password": "password123", "name": "Юлия Андерсон"},
-                {"email": "kevin@betony.local", "password": "password123", "name": "Кевин Тейлор"},
-                {"email": "lisa@betony.local", "password": "password123", "name": "Лиса Томас"},
-                {"email": "michael@betony.local", "password": "password123", "name": "Майкл Ли"},
-                {"email": "nina@betony.local", "password": "password123", "name": "Нина Уайт"},
-                {"email": "oliver@betony.local", "password": "password123", "name": "Оливер Харрис"},
-            ]
-            
-            users = [admin_user] if admin_user else []
-            if test_user:
-                users.append(test_user)
-            
-            for user_data in users_data:
-                try:
-                    print(f"[INIT] 👤 Creating user: {user_data['name']} (REGULAR)")
-                    user, token = await auth_service.register_and_login(
-                        email=user_data["email"],
-                        password=user_data["password"],
-                        name=user_data["name"]
-                    )
-                    # All other users are regular - is_admin stays False by default
-                    users.append(user)
-                    print(f"[INIT] ✅ User created successfully (REGULAR): {user.name} (ID: {user.id})")
-                except Exception as e:
-                    print(f"[INIT] ❌ Error creating user {user_data['name']}: {e}")
-            
-            if not users:
-                print("[INIT] ❌ No users created, aborting data initialization")
-                return
-            
-            # Create 50 sample posts
-            posts = []
-            print(f"\n[INIT] 📝 Creating 50 sample posts...")
-            for i, post_data in enumerate(SAMPLE_POSTS_FULL, 1):
-                try:
-                    # Alternate between users
-                    user_id = users[i % len(users)].id
-                    post_create = PostCreate(
-                        title=post_data["title"],
-                        content=post_data["content"]
-                    )
-                    post = await db.posts.create_post(post_create, user_id)
-                    await db.commit()
-                    posts.append(post)
-                    print(f"[INIT]   {i}. {post_data['title'][:60]}...")
-                except Exception as e:
-                    print(f"[INIT] ❌ Error creating post: {e}")
-            
-            if not posts:
-                print("[INIT] ❌ No posts created, aborting")
-                return
-            
-            # Create sample likes (random likes on posts)
-            print(f"\n[INIT] ❤️  Adding likes to posts...")
-            like_count = 0
-            for i, post in enumerate(posts):
-                # Each post gets 2-4 likes from random users
-                num_likes = 2 + (i % 3)
-                for j in range(num_likes):
-                    try:
-                        user_id = users[(i + j) % len(users)].id
-                        # Skip if user is post author
-                        if user_id != post.user_id:
-                            like = await db.likes.create_like(post.id, user_id)
-                            await db.commit()
-                            like_count += 1
-                    except:
-                        pass  # Ignore like creation errors (might be duplicate)
-            print(f"[INIT] ✅ Added {like_count} likes")
-            
-            # Create sample comments
-            print(f"\n[INIT] 💬 Adding comments...")
-            comments_data = [
-                "Отличный пост! Спасибо за информацию!",
-                "Очень полезно! Буду использовать эти советы.",
-                "Согласен с каждым словом!",
-                "Это именно то, что мне нужно было знать.",
-                "Спасибо за мотивацию!",
-                "Прекрасное объяснение!",
-                "Буду учиться по вашим советам.",
-                "Очень своевременно!",
-                "Спасибо за ссылки на ресурсы!",
-                "Это была огромной помощью!",
-            ]
-            
-            comment_count = 0
-            for i, post in enumerate(posts[:30]):  # Add comments only to first 30 posts
-                num_comments = 1 + (i % 2)
-                for j in range(num_comments):
+                print(f"[INIT] ❌ Error creating user {user_data['name']}: {e}")
+
+        if not users:
+            print("[INIT] ❌ No users created, aborting data initialization")
+            return
+
+        # Create 50 sample posts
+        posts = []
+        print(f"\n[INIT] 📝 Creating 50 sample posts...")
+        for batch in batches(list(enumerate(SAMPLE_POSTS_FULL, 1))):
+            async with write_db() as db:
+                for i, post_data in batch:
                     try:
-                        user_id = users[(i + j + 1) % len(users)].id
-                        # Skip if user is post author
-                        if user_id != post.user_id:
-                            comment_text = comments_data[(i + j) % len(comments_data)]
-                            comment_create = CommentCreate(content=comment_text)
-                            comment = await db.comments.create_comment(
-                                comment_create,
-                                user_id,
-                                post.id
-                            )
-                            await db.commit()
-                            comment_count += 1
+                        # Alternate between users
+                        user_id = users[i % len(users)].id
+                        post_create = PostCreate(
+                            title=post_data["title"],
+                            content=post_data["content"]
+                        )
+                        post = await db.posts.create_post(post_create, user_id)
+                        await db.commit()
+                        posts.append(post)
+                        print(f"[INIT]   {i}. {post_data['title'][:60]}...")
                     except Exception as e:
-                        pass  # Ignore comment creation errors
-            print(f"[INIT] ✅ Added {comment_count} comments")
-            
-            print(f"\n{'='*60}")
-            print(f"[INIT] ✅ Sample data initialization completed successfully!")
-            print(f"{'='*60}")
-            print(f"[INIT] Created {len(users)} users (1 ADMIN + {len(users)-1} REGULAR)")
-            print(f"[INIT] Created {len(posts)} posts")
-            print(f"[INIT] Created {like_count} likes")
-            print(f"[INIT] Created {comment_count} comments")
-            print(f"\n[INIT] 📌 Test credentials:")
-            print(f"[INIT] ADMIN USER   - Email: alice@betony.local | Password: password123 | Privileges: YES (is_admin=True)")
-            print(f"[INIT] REGULAR USER - Email: test@betony.local | Password: test123 | Privileges: NO (is_admin=False)")
-            print(f"{'='*60}")
-            
+                        print(f"[INIT] ❌ Error creating post: {e}")
+
+        if not posts:
+            print("[INIT] ❌ No posts created, aborting")
+            return
+
+        # Create sample likes (random likes on posts)
+        print(f"\n[INIT] ❤️  Adding likes to posts...")
+        like_count = 0
+        for batch in batches(list(enumerate(posts))):
+            async with write_db() as db:
+                for i, post in batch:
+                    # Each post gets 2-4 likes from random users
+                    num_likes = 2 + (i % 3)
+                    for j in range(num_likes):
+                        try:
+                            user_id = users[(i + j) % len(users)].id
+                            # Skip if user is post author
+                            if user_id != post.user_id:
+                                async with db.session.begin_nested():
+                                    await db.likes.create_like(user_id, post.id)
+                                like_count += 1
+                        except:
+                            pass  # Ignore like creation errors (might be duplicate)
+                await db.commit()
+        print(f"[INIT] ✅ Added {like_count} likes")
+
+        # Create sample comments
+        print(f"\n[INIT] 💬 Adding comments...")
+        comments_data = [
+            "Отличный пост! Спасибо за информацию!",
+            "Очень полезно! Буду использовать эти советы.",
+            "Согласен с каждым словом!",
+            "Это именно то, что мне нужно было знать.",
+            "Спасибо за мотивацию!",
+            "Прекрасное объяснение!",
+            "Буду учиться по вашим советам.",
+            "Очень своевременно!",
+            "Спасибо за ссылки на ресурсы!",
+            "Это была огромной помощью!",
+        ]
+
+        comment_count = 0
+        for batch in batches(list(enumerate(posts[:30]))):  # Add comments only to first 30 posts
+            async with write_db() as db:
+                for i, post in batch:
+                    num_comments = 1 + (i % 2)
+                    for j in range(num_comments):
+                        try:
+                            user_id = users[(i + j + 1) % len(users)].id
+                            # Skip if user is post author
+                            if user_id != post.user_id:
+                                comment_text = comments_data[(i + j) % len(comments_data)]
+                                comment_create = CommentCreate(content=comment_text)
+                                async with db.session.begin_nested():
+                                    await db.comments.create_comment(
+                                        comment_create,
+                                        user_id,
+                                        post.id
+                                    )
+                                comment_count += 1
+                        except Exception as e:
+                            pass  # Ignore comment creation errors
+                await db.commit()
+        print(f"[INIT] ✅ Added {comment_count} comments")
+
+        print(f"\n{'='*60}")
+        print(f"[INIT] ✅ Sample data initialization completed successfully!")
+        print(f"{'='*60}")
+        print(f"[INIT] Created {len(users)} users (1 ADMIN + {len(users)-1} REGULAR)")
+        print(f"[INIT] Created {len(posts)} posts")
+        print(f"[INIT] Created {like_count} likes")
+        print(f"[INIT] Created {comment_count} comments")
+        print(f"\n[INIT] 📌 Test credentials:")
+        print(f"[INIT] ADMIN USER   - Email: alice@betony.local | Password: password123 | Privileges: YES (is_admin=True)")
+        print(f"[INIT] REGULAR USER - Email: test@betony.local | Password: test123 | Privileges: NO (is_admin=False)")
+        print(f"{'='*60}")
+
     except Exception as e:
         print(f"[INIT] ❌ Error initializing sample data: {e}")
         import traceback
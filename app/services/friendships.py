@@ -26,8 +26,8 @@ class FriendshipService:
         await self.db.commit()
         return True
 
-    async def get_user_friends(self, user_id: int, skip: int = 0, limit: int = 20) -> list[FriendshipResponse]:
-        friendships = await self.db.friendships.get_user_friends(user_id, skip, limit)
+    async def get_user_friends(self, user_id: int, skip: int = 0, limit: int = 20, before=None) -> list[FriendshipResponse]:
+        friendships = await self.db.friendships.get_user_friends(user_id, skip, limit, before)
         return [FriendshipResponse.from_orm(f) for f in friendships]
 
     async def get_user_followers(self, user_id: int, skip: int = 0, limit: int = 20) -> list[FriendshipResponse]:
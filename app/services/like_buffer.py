@@ -0,0 +1,256 @@
+"""
+Write-behind buffer for like/unlike intents on hot posts
+
+With LIKE_BUFFER_ENABLED, PUT /posts/{id}/like only reads from the database.
+The intent is kept in memory, one per (user_id, post_id) with the latest
+state winning. A background task writes all buffered intents in a single
+transaction every LIKE_BUFFER_FLUSH_MS, or sooner once LIKE_BUFFER_MAX_EVENTS
+have piled up. Until then readers see the buffered deltas merged into
+likes_count and liked_by_me.
+
+Durability is bounded by the flush interval. The buffer is flushed on
+shutdown, and LIKE_BUFFER_LOG_PATH enables an append-only intent log that is
+replayed on the next start after a crash.
+"""
+import asyncio
+import json
+import os
+import traceback
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.utils.cache import feed_cache
+
+
+@dataclass
+class _Intent:
+    # State the database will hold once earlier batches land
+    base: bool
+    liked: bool
+
+
+@dataclass
+class LikeBufferStats:
+    events: int = 0
+    flushes: int = 0
+    flushed_intents: int = 0
+    failed_flushes: int = 0
+    replayed_intents: int = 0
+
+
+class LikeBuffer:
+    def __init__(
+        self,
+        enabled: bool,
+        flush_interval_ms: int,
+        max_events: int,
+        log_path: str = "",
+        session_factory=async_session_maker,
+    ):
+        self.enabled = enabled
+        self.flush_interval_ms = flush_interval_ms
+        self.max_events = max_events
+        self.log_path = log_path
+        self.session_factory = session_factory
+        self.stats = LikeBufferStats()
+        self._pending: dict[tuple[int, int], _Intent] = {}
+        self._in_flight: dict[tuple[int, int], bool] = {}
+        # likes_count change per post not yet committed (pending + in flight)
+        self._deltas: Counter = Counter()
+        self._events = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    # ---- reads ----
+
+    def delta(self, post_id: int) -> int:
+        return self._deltas.get(post_id, 0)
+
+    def state(self, user_id: int, post_id: int) -> bool | None:
+        """Buffered like state of a pair, None when nothing is buffered for it"""
+        pair = (user_id, post_id)
+        intent = self._pending.get(pair)
+        if intent is not None:
+            return intent.liked
+        return self._in_flight.get(pair)
+
+    # ---- writes ----
+
+    def record(self, user_id: int, post_id: int, liked: bool, stored: bool) -> None:
+        """
+        Buffer an intent. `stored` is the pair's state in the database and is
+        only consulted when nothing is buffered for the pair yet.
+        """
+        pair = (user_id, post_id)
+        intent = self._pending.get(pair)
+        if intent is None:
+            base = self._in_flight.get(pair, stored)
+            if base == liked:
+                return
+            intent = self._pending[pair] = _Intent(base=base, liked=base)
+        elif intent.liked == liked:
+            return
+
+        intent.liked = liked
+        self._deltas[post_id] += 1 if liked else -1
+        if not self._deltas[post_id]:
+            del self._deltas[post_id]
+        if intent.liked == intent.base:
+            del self._pending[pair]
+
+        self._append_log(user_id, post_id, liked)
+        self.stats.events += 1
+        self._events += 1
+        if self._events >= self.max_events:
+            self._wakeup.set()
+        feed_cache.invalidate_post(post_id)
+
+    async def flush(self) -> int:
+        """Write every buffered intent in one transaction; returns how many were written"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._events = 0
+            self._in_flight = {pair: intent.liked for pair, intent in batch.items()}
+            try:
+                async with DBManager(session_factory=self.session_factory) as db:
+                    await db.likes.apply_intents(
+                        likes=[pair for pair, liked in self._in_flight.items() if liked],
+                        unlikes=[pair for pair, liked in self._in_flight.items() if not liked],
+                    )
+                    await db.commit()
+            except Exception:
+                self.stats.failed_flushes += 1
+                self._restore(batch)
+                raise
+            finally:
+                self._in_flight = {}
+
+            for (_, post_id), intent in batch.items():
+                self._deltas[post_id] -= 1 if intent.liked else -1
+                if not self._deltas[post_id]:
+                    del self._deltas[post_id]
+                feed_cache.invalidate_post(post_id)
+            self._rewrite_log()
+            self.stats.flushes += 1
+            self.stats.flushed_intents += len(batch)
+            return len(batch)
+
+    def _restore(self, batch: dict[tuple[int, int], _Intent]) -> None:
+        """Put a failed batch back underneath intents buffered while it was in flight"""
+        for pair, intent in batch.items():
+            newer = self._pending.get(pair)
+            if newer is None:
+                self._pending[pair] = intent
+            elif newer.liked == intent.base:
+                del self._pending[pair]
+            else:
+                newer.base = intent.base
+
+    def clear(self) -> None:
+        """Drop buffered intents without writing them"""
+        self._pending.clear()
+        self._deltas.clear()
+        self._events = 0
+
+    # ---- intent log ----
+
+    def _append_log(self, user_id: int, post_id: int, liked: bool) -> None:
+        if not self.log_path:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            log.write(json.dumps([user_id, post_id, liked]) + "\n")
+
+    def _rewrite_log(self) -> None:
+        """Keep only intents that are still buffered"""
+        if not self.log_path:
+            return
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as log:
+            for (user_id, post_id), intent in self._pending.items():
+                log.write(json.dumps([user_id, post_id, intent.liked]) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        os.replace(tmp_path, self.log_path)
+
+    async def replay_log(self) -> int:
+        """Write intents left in the log by a process that did not shut down cleanly"""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return 0
+        intents: dict[tuple[int, int], bool] = {}
+        with open(self.log_path, encoding="utf-8") as log:
+            for line in log:
+                try:
+                    user_id, post_id, liked = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of a crashed write
+                intents[(user_id, post_id)] = liked
+        if intents:
+            async with DBManager(session_factory=self.session_factory) as db:
+                await db.likes.apply_intents(
+                    likes=[pair for pair, liked in intents.items() if liked],
+                    unlikes=[pair for pair, liked in intents.items() if not liked],
+                )
+                await db.commit()
+            for _, post_id in intents:
+                feed_cache.invalidate_post(post_id)
+        self._rewrite_log()
+        self.stats.replayed_intents += len(intents)
+        return len(intents)
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        replayed = await self.replay_log()
+        if replayed:
+            print(f"[LIKES] Replayed {replayed} buffered like intents from {self.log_path}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[LIKES] Error flushing like buffer: {e}")
+                traceback.print_exc()
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending_intents": len(self._pending),
+            "posts_with_delta": len(self._deltas),
+            "flush_interval_ms": self.flush_interval_ms,
+            "max_events": self.max_events,
+            "log_path": self.log_path or None,
+            **asdict(self.stats),
+        }
+
+
+like_buffer = LikeBuffer(
+    enabled=settings.LIKE_BUFFER_ENABLED,
+    flush_interval_ms=settings.LIKE_BUFFER_FLUSH_MS,
+    max_events=settings.LIKE_BUFFER_MAX_EVENTS,
+    log_path=settings.LIKE_BUFFER_LOG_PATH,
+)
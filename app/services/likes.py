@@ -1,6 +1,9 @@
 from app.database.db_manager import DBManager
+from app.schemes.likes import LikeStateResponse
 from app.schemes.posts import PostResponse
 from app.exceptions.exceptions import AlreadyLiked, PostNotFound
+from app.services.like_buffer import like_buffer
+from app.utils.cache import feed_cache
 
 
 class LikeService:
@@ -19,9 +22,33 @@ class LikeService:
         
         like = await self.db.likes.create_like(user_id, post_id)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
         
         return like
 
+    async def set_like(self, post_id: int, user_id: int, liked: bool) -> LikeStateResponse:
+        """Put the like into the desired state; safe to retry and race"""
+        if like_buffer.enabled:
+            return await self._buffer_like(post_id, user_id, liked)
+        likes_count = await self.db.likes.set_like(user_id, post_id, liked)
+        if likes_count is None:
+            await self.db.rollback()
+            raise PostNotFound()
+        await self.db.commit()
+        feed_cache.invalidate_post(post_id)
+        return LikeStateResponse(liked=liked, likes_count=likes_count)
+
+    async def _buffer_like(self, post_id: int, user_id: int, liked: bool) -> LikeStateResponse:
+        """Write-behind path: only reads here, the write happens on the next flush"""
+        likes_count = await self.db.posts.get_likes_count(post_id)
+        if likes_count is None:
+            raise PostNotFound()
+        stored = like_buffer.state(user_id, post_id)
+        if stored is None:
+            stored = await self.db.likes.get_like(user_id, post_id) is not None
+        like_buffer.record(user_id, post_id, liked, stored)
+        return LikeStateResponse(liked=liked, likes_count=likes_count + like_buffer.delta(post_id))
+
     async def like_post(self, user_id: int, post_id: int) -> dict:
         """Like a post (legacy method)"""
         post = await self.db.posts.get_post_by_id(post_id)
@@ -34,6 +61,7 @@ class LikeService:
         
         await self.db.likes.create_like(user_id, post_id)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
         
         return {"message": "Post liked successfully"}
 
@@ -45,6 +73,7 @@ class LikeService:
         
         await self.db.likes.delete_like_by_user_post(user_id, post_id)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
 
     async def delete_like_by_id(self, like_id: int, user_id: int):
         """Delete a like by its ID"""
@@ -57,6 +86,7 @@ class LikeService:
         
         await self.db.likes.delete_like(like_id)
         await self.db.commit()
+        feed_cache.invalidate_post(like.post_id)
 
     async def unlike_post(self, user_id: int, post_id: int) -> dict:
         """Unlike a post (legacy method)"""
@@ -66,6 +96,7 @@ class LikeService:
         
         await self.db.likes.delete_like_by_user_post(user_id, post_id)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
         
         return {"message": "Post unliked successfully"}
 
@@ -74,9 +105,9 @@ class LikeService:
         likes = await self.db.likes.get_post_likes(post_id)
         return likes or []
 
-    async def get_user_likes(self, user_id: int) -> list:
+    async def get_user_likes(self, user_id: int, skip: int = 0, limit: int | None = None, before=None) -> list:
         """Get all likes by a user"""
-        likes = await self.db.likes.get_user_likes(user_id)
+        likes = await self.db.likes.get_user_likes(user_id, skip, limit, before)
         return likes or []
 
     async def get_like(self, like_id: int):
@@ -1,6 +1,9 @@
 from app.database.db_manager import DBManager
+from app.schemes.comments import CommentPreview
 from app.schemes.posts import PostCreate, PostUpdate, PostResponse
 from app.exceptions.exceptions import PostNotFound, Forbidden
+from app.services.like_buffer import like_buffer
+from app.utils.cache import feed_cache
 
 
 class PostService:
@@ -11,9 +14,10 @@ class PostService:
         # Fix: pass post_data and user_id to repository
         post = await self.db.posts.create_post(post_data, user_id)
         await self.db.commit()
+        feed_cache.invalidate_feeds_of(user_id)
         
-        # Get user info for author fields
-        user = await self.db.users.get_one_or_none(id=user_id)
+        # Author is already loaded by the repository refresh
+        user = post.user
         
         return PostResponse(
             id=post.id,
@@ -24,80 +28,68 @@ class PostService:
             author_email=user.email if user else None,
             created_at=post.created_at,
             updated_at=post.updated_at,
+            activity_at=post.activity_at,
             likes_count=0
         )
 
-    async def get_post(self, post_id: int) -> PostResponse:
-        post = await self.db.posts.get_post_by_id(post_id)
-        if not post:
-            raise PostNotFound()
-        
-        # Get likes count
-        likes = await self.db.likes.get_post_likes(post_id)
-        likes_count = len(likes) if likes else 0
-        
-        # Get user info
-        user = await self.db.users.get_one_or_none(id=post.user_id)
-        
+    @staticmethod
+    def to_response(row) -> PostResponse:
+        post, author_name, author_email = row
         return PostResponse(
             id=post.id,
             title=post.title,
             content=post.content,
             user_id=post.user_id,
-            author_name=user.name if user else None,
-            author_email=user.email if user else None,
+            author_name=author_name,
+            author_email=author_email,
             created_at=post.created_at,
             updated_at=post.updated_at,
-            likes_count=likes_count
+            activity_at=post.activity_at,
+            likes_count=(post.likes_count or 0) + like_buffer.delta(post.id),
+            comments_count=post.comments_count or 0
         )
 
-    async def get_all_posts(self, skip: int = 0, limit: int = 20) -> list[PostResponse]:
-        posts = await self.db.posts.get_all_posts(skip, limit)
-        result = []
-        
+    async def with_liked_by_me(self, posts: list[PostResponse], viewer_id: int | None) -> list[PostResponse]:
+        """Fill `liked_by_me` for a whole page; guests get the posts back untouched"""
+        if viewer_id is None or not posts:
+            return posts
+        liked = await self.db.likes.get_liked_post_ids(viewer_id, [post.id for post in posts])
         for post in posts:
-            likes = await self.db.likes.get_post_likes(post.id)
-            likes_count = len(likes) if likes else 0
-            user = await self.db.users.get_one_or_none(id=post.user_id)
-            
-            result.append(PostResponse(
-                id=post.id,
-                title=post.title,
-                content=post.content,
-                user_id=post.user_id,
-                author_name=user.name if user else None,
-                author_email=user.email if user else None,
-                created_at=post.created_at,
-                updated_at=post.updated_at,
-                likes_count=likes_count
-            ))
-        
-        return result
+            buffered = like_buffer.state(viewer_id, post.id)
+            if buffered is not None:
+                (liked.add if buffered else liked.discard)(post.id)
+        return [post.model_copy(update={"liked_by_me": post.id in liked}) for post in posts]
 
-    async def get_user_posts(self, user_id: int, skip: int = 0, limit: int = 20) -> list[PostResponse]:
-        posts = await self.db.posts.get_user_posts(user_id, skip, limit)
-        result = []
-        
-        # Get user info once
-        user = await self.db.users.get_one_or_none(id=user_id)
-        
-        for post in posts:
-            likes = await self.db.likes.get_post_likes(post.id)
-            likes_count = len(likes) if likes else 0
-            
-            result.append(PostResponse(
-                id=post.id,
-                title=post.title,
-                content=post.content,
-                user_id=post.user_id,
-                author_name=user.name if user else None,
-                author_email=user.email if user else None,
-                created_at=post.created_at,
-                updated_at=post.updated_at,
-                likes_count=likes_count
-            ))
-        
-        return result
+    async def with_comments_preview(self, posts: list[PostResponse], size: int) -> list[PostResponse]:
+        """Attach the latest `size` comments to every post of a page; 0 leaves posts untouched"""
+        if not size or not posts:
+            return posts
+        previews = {post.id: [] for post in posts}
+        for row in await self.db.comments.get_previews(list(previews), size):
+            previews[row["post_id"]].append(CommentPreview(**row))
+        return [post.model_copy(update={"comments_preview": previews[post.id]}) for post in posts]
+
+    async def get_post(self, post_id: int) -> PostResponse:
+        row = await self.db.posts.get_feed_post(post_id)
+        if not row:
+            raise PostNotFound()
+        return self.to_response(row)
+
+    async def get_posts_batch(self, post_ids: list[int]) -> tuple[list[PostResponse], list[int]]:
+        """Posts in the requested order plus the ids that do not exist"""
+        rows = await self.db.posts.get_feed_posts(post_ids)
+        found = {row[0].id: self.to_response(row) for row in rows}
+        items = [found[post_id] for post_id in post_ids if post_id in found]
+        missing = [post_id for post_id in post_ids if post_id not in found]
+        return items, missing
+
+    async def get_all_posts(self, skip: int = 0, limit: int = 20, before=None) -> list[PostResponse]:
+        rows = await self.db.posts.get_feed(skip=skip, limit=limit, before=before)
+        return [self.to_response(row) for row in rows]
+
+    async def get_user_posts(self, user_id: int, skip: int = 0, limit: int = 20, before=None) -> list[PostResponse]:
+        rows = await self.db.posts.get_feed(user_id=user_id, skip=skip, limit=limit, before=before)
+        return [self.to_response(row) for row in rows]
 
     async def update_post(self, post_id: int, post_data: PostUpdate, user_id: int) -> PostResponse:
         post = await self.db.posts.get_post_by_id(post_id)
@@ -107,24 +99,11 @@ class PostService:
         if post.user_id != user_id:
             raise Forbidden()
         
-        updated_post = await self.db.posts.update_post(post_id, post_data)
+        await self.db.posts.update_post(post_id, post_data)
         await self.db.commit()
+        feed_cache.invalidate_post(post_id)
         
-        likes = await self.db.likes.get_post_likes(post_id)
-        likes_count = len(likes) if likes else 0
-        user = await self.db.users.get_one_or_none(id=user_id)
-        
-        return PostResponse(
-            id=updated_post.id,
-            title=updated_post.title,
-            content=updated_post.content,
-            user_id=updated_post.user_id,
-            author_name=user.name if user else None,
-            author_email=user.email if user else None,
-            created_at=updated_post.created_at,
-            updated_at=updated_post.updated_at,
-            likes_count=likes_count
-        )
+        return await self.get_post(post_id)
 
     async def delete_post(self, post_id: int, user_id: int, is_admin: bool = False) -> bool:
         """Delete a post. Only author or admin can delete."""
@@ -136,9 +115,12 @@ class PostService:
         if post.user_id != user_id and not is_admin:
             raise Forbidden()
         
+        await self.db.timeline.remove_post(post_id)
+        await self.db.trending.remove_post(post_id)
         success = await self.db.posts.delete_post(post_id)
         if not success:
             raise PostNotFound()
         
         await self.db.commit()
+        feed_cache.invalidate_feeds_of(post.user_id, post_id)
         return True
\ No newline at end of file
@@ -0,0 +1,48 @@
+import re
+
+from app.database.db_manager import DBManager
+from app.exceptions.exceptions import InvalidCursor
+from app.schemes.pagination import CursorPage
+from app.schemes.search import SearchHit
+from app.utils.pagination import decode_token, encode_token
+
+MAX_TERMS = 10
+
+_TERM = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """The words of free text; the repository matches each as a prefix"""
+    return _TERM.findall(query)[:MAX_TERMS]
+
+
+class SearchService:
+    def __init__(self, db: DBManager):
+        self.db = db
+
+    async def search(
+        self, query: str, scope: str = "all", limit: int = 20, cursor: str | None = None
+    ) -> CursorPage[SearchHit]:
+        after = None
+        if cursor:
+            try:
+                score, kind, row_id = decode_token(cursor)
+                after = float(score), str(kind), int(row_id)
+            except (ValueError, TypeError):
+                raise InvalidCursor()
+
+        terms = search_terms(query)
+        if not terms:
+            return CursorPage[SearchHit](items=[])
+
+        rows = await self.db.search.search(terms, scope, limit + 1, after)
+        items = [SearchHit(**row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_token([last.score, last.kind, last.id])
+        return CursorPage[SearchHit](items=items, next_cursor=next_cursor)
+
+    async def rebuild(self) -> None:
+        await self.db.search.rebuild()
+        await self.db.commit()
@@ -0,0 +1,95 @@
+import traceback
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.models.posts import PostModel
+from app.schemes.posts import PostResponse
+from app.services.posts import PostService
+
+
+class TimelineService:
+    """
+    Friends-only home timeline.
+    Posts are pushed into a per-reader table on write (fan-out-on-write);
+    authors with more than TIMELINE_FANOUT_MAX_FRIENDS friendships are
+    pulled from `posts` on read instead, so a single write stays bounded.
+    users.friendships_count, kept by the friendship writes, makes that call
+    on both sides: a read is one keyset scan of timeline_entries, plus one
+    scan of `posts` only when a friend is above the threshold.
+    """
+
+    def __init__(self, db: DBManager):
+        self.db = db
+
+    async def fan_out_post(self, post_id: int) -> None:
+        post = await self.db.session.get(PostModel, post_id)
+        if not post:
+            return
+        degree = await self.db.timeline.get_friendships_count(post.user_id)
+        await self.db.timeline.fan_out(
+            post, include_friends=degree <= settings.TIMELINE_FANOUT_MAX_FRIENDS
+        )
+        await self.db.commit()
+
+    async def friendship_added(self, user_id: int, friend_id: int) -> None:
+        for reader_id, author_id in ((user_id, friend_id), (friend_id, user_id)):
+            await self.db.timeline.backfill(reader_id, author_id, settings.TIMELINE_MAX_ENTRIES)
+        await self.db.commit()
+
+    async def friendship_removed(self, user_id: int, friend_id: int) -> None:
+        # The pair can still be connected through the reverse edge
+        if await self.db.friendships.get_friendship(user_id, friend_id):
+            return
+        if await self.db.friendships.get_friendship(friend_id, user_id):
+            return
+        await self.db.timeline.remove_author(user_id, friend_id)
+        await self.db.timeline.remove_author(friend_id, user_id)
+        await self.db.commit()
+
+    async def get_timeline(self, user_id: int, skip: int = 0, limit: int = 20, before=None) -> list[PostResponse]:
+        pull_author_ids = await self.db.timeline.get_pull_author_ids(
+            user_id, settings.TIMELINE_FANOUT_MAX_FRIENDS
+        )
+        if not pull_author_ids:
+            rows = await self.db.timeline.get_timeline(user_id, skip, limit, before)
+            return [PostService.to_response(row) for row in rows]
+
+        # Merge the pushed timeline with posts of high fan-out friends
+        window = limit if before is not None else skip + limit
+        pushed = await self.db.timeline.get_timeline(user_id, 0, window, before)
+        pulled = await self.db.timeline.get_authors_posts(pull_author_ids, window, before)
+        merged = {}
+        for row in [*pushed, *pulled]:
+            merged.setdefault(row[0].id, row)
+        rows = sorted(merged.values(), key=lambda row: (row[0].created_at, row[0].id), reverse=True)
+        rows = rows[:limit] if before is not None else rows[skip:skip + limit]
+        return [PostService.to_response(row) for row in rows]
+
+
+async def fan_out_post_task(post_id: int) -> None:
+    """Background step run after a post is created"""
+    try:
+        async with DBManager(session_factory=async_session_maker) as db:
+            await TimelineService(db).fan_out_post(post_id)
+    except Exception as e:
+        print(f"[TIMELINE] Error fanning out post {post_id}: {e}")
+        traceback.print_exc()
+
+
+async def friendship_added_task(user_id: int, friend_id: int) -> None:
+    try:
+        async with DBManager(session_factory=async_session_maker) as db:
+            await TimelineService(db).friendship_added(user_id, friend_id)
+    except Exception as e:
+        print(f"[TIMELINE] Error backfilling timelines of {user_id}/{friend_id}: {e}")
+        traceback.print_exc()
+
+
+async def friendship_removed_task(user_id: int, friend_id: int) -> None:
+    try:
+        async with DBManager(session_factory=async_session_maker) as db:
+            await TimelineService(db).friendship_removed(user_id, friend_id)
+    except Exception as e:
+        print(f"[TIMELINE] Error trimming timelines of {user_id}/{friend_id}: {e}")
+        traceback.print_exc()
@@ -0,0 +1,146 @@
+"""
+Trending posts: time-decayed engagement, precomputed into post_scores
+
+A post's heat is the sum of its events in the last TRENDING_WINDOW_HOURS
+(its own creation, likes, and comments at double weight), each halved every
+TRENDING_HALF_LIFE_HOURS. The stored score is measured against a fixed epoch
+instead of "now", so scores of posts nobody touches stay correctly ordered
+as time passes, and a recompute only has to visit posts that changed.
+"""
+import asyncio
+import math
+import traceback
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.exceptions import InvalidCursor
+from app.schemes.posts import PostResponse
+from app.services.posts import PostService
+from app.utils.pagination import decode_token, encode_token
+
+EPOCH = datetime(2024, 1, 1)
+WEIGHTS = {"post": 1.0, "like": 1.0, "comment": 2.0}
+# Each run re-reads a little of the previous one so commits racing with it are not missed
+RECOMPUTE_OVERLAP = timedelta(seconds=5)
+
+
+def hot_score(events: Iterable[tuple[datetime, float]], half_life_hours: float) -> float:
+    """
+    log2 of sum(weight * 2 ** ((t - EPOCH) / half_life)) over (t, weight) events.
+    Dividing by 2 ** ((now - EPOCH) / half_life) gives the usual decayed score;
+    that factor is the same for every post, so the order never goes stale.
+    """
+    half_life = half_life_hours * 3600
+    exponents = [
+        (at - EPOCH).total_seconds() / half_life + math.log2(weight)
+        for at, weight in events
+        if weight > 0
+    ]
+    if not exponents:
+        return float("-inf")
+    top = max(exponents)
+    return top + math.log2(sum(2 ** (e - top) for e in exponents))
+
+
+class TrendingService:
+    def __init__(self, db: DBManager):
+        self.db = db
+
+    async def recompute(self, since: datetime, now: datetime | None = None) -> int:
+        """Rescore posts touched since `since`, one batch per transaction; returns how many"""
+        now = now or datetime.utcnow()
+        window_start = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        touched = 0
+        after_id = 0
+        while True:
+            post_ids = await self.db.trending.get_touched_post_ids(since, after_id, settings.TRENDING_BATCH_SIZE)
+            if not post_ids:
+                break
+            after_id = post_ids[-1]
+
+            events = defaultdict(list)
+            for post_id, kind, bucket, count in await self.db.trending.get_engagement(post_ids, window_start):
+                events[post_id].append((datetime.fromisoformat(bucket), WEIGHTS[kind] * count))
+            scores = {
+                post_id: hot_score(post_events, settings.TRENDING_HALF_LIFE_HOURS)
+                for post_id, post_events in events.items()
+            }
+            await self.db.trending.save_scores(scores, now)
+            await self.db.commit()
+            touched += len(post_ids)
+        return touched
+
+    async def get_trending(self, limit: int = 20, cursor: str | None = None) -> tuple[list[PostResponse], str | None]:
+        before = None
+        if cursor:
+            try:
+                score, post_id = decode_token(cursor)
+                before = float(score), int(post_id)
+            except (ValueError, TypeError):
+                raise InvalidCursor()
+
+        rows = await self.db.trending.get_trending(limit + 1, before)
+        posts = [PostService.to_response(row[:3]) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_token([last.score, last[0].id])
+        return posts, next_cursor
+
+
+class TrendingRecomputer:
+    """Background loop; each run covers what was touched since the previous one"""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        overlap: timedelta = RECOMPUTE_OVERLAP,
+        session_factory=async_session_maker,
+    ):
+        self.interval_seconds = interval_seconds
+        self.overlap = overlap
+        self.session_factory = session_factory
+        self.last_run_at: datetime | None = None
+        self.last_touched = 0
+        self._since: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        started = datetime.utcnow()
+        since = self._since or started - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        async with DBManager(session_factory=self.session_factory) as db:
+            self.last_touched = await TrendingService(db).recompute(since, started)
+        self._since = started - self.overlap
+        self.last_run_at = started
+        return self.last_touched
+
+    async def start(self) -> None:
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"[TRENDING] Error recomputing scores: {e}")
+                traceback.print_exc()
+            await asyncio.sleep(self.interval_seconds)
+
+
+trending_recomputer = TrendingRecomputer(settings.TRENDING_RECOMPUTE_SECONDS)
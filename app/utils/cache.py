@@ -0,0 +1,140 @@
+"""
+In-process LRU + TTL cache for serialized feed pages
+
+Keys are (endpoint, user filter, page token, limit, comments preview size)
+where the page token is ("offset", skip) or ("cursor", cursor). Each entry remembers which posts it
+contains so writes can drop exactly the pages they affect.
+
+Pages are viewer-agnostic; per-viewer fields such as `liked_by_me` are
+applied to the stored page model after a hit.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Hashable
+
+from app.config import settings
+
+GLOBAL_FEED = "posts"
+USER_FEED = "user_posts"
+
+
+@dataclass
+class CachedPage:
+    etag: str
+    last_modified: str | None
+    # None when the client already holds this version
+    body: bytes | None
+    # The page model the body was rendered from
+    page: Any
+
+
+@dataclass
+class _Entry:
+    value: CachedPage
+    expires_at: float
+    post_ids: frozenset[int]
+    # Offset pages and the first cursor page move when a post is added or removed
+    is_head: bool
+    feed: tuple[str, int | None]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class FeedPageCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._generation = 0
+
+    @staticmethod
+    def make_key(
+        feed: str, user_id: int | None, skip: int, cursor: str | None, limit: int, preview_size: int = 0
+    ) -> tuple:
+        page = ("cursor", cursor) if cursor is not None else ("offset", skip)
+        return feed, user_id, page, limit, preview_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        """Changes on every invalidation; pages built across one must not be stored"""
+        return self._generation
+
+    def get(self, key: Hashable) -> CachedPage | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(self, key: tuple, value: CachedPage, post_ids, generation: int) -> None:
+        if not self.enabled or generation != self._generation:
+            return
+        feed, user_id, page = key[:3]
+        is_head = page[0] == "offset" or not page[1]
+        self._entries[key] = _Entry(
+            value=value,
+            expires_at=time.monotonic() + self.ttl,
+            post_ids=frozenset(post_ids),
+            is_head=is_head,
+            feed=(feed, user_id),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _drop(self, predicate) -> None:
+        self._generation += 1
+        stale = [key for key, entry in self._entries.items() if predicate(entry)]
+        for key in stale:
+            del self._entries[key]
+        self.stats.invalidations += len(stale)
+
+    def invalidate_post(self, post_id: int) -> None:
+        """A post's content or counters changed"""
+        self._drop(lambda entry: post_id in entry.post_ids)
+
+    def invalidate_feeds_of(self, author_id: int, post_id: int | None = None) -> None:
+        """A post was added or removed: every page that shifts or shows it is stale"""
+        feeds = {(GLOBAL_FEED, None), (USER_FEED, author_id)}
+        self._drop(
+            lambda entry: (entry.is_head and entry.feed in feeds)
+            or (post_id is not None and post_id in entry.post_ids)
+        )
+
+    def clear(self) -> None:
+        self._drop(lambda entry: True)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            **asdict(self.stats),
+        }
+
+
+feed_cache = FeedPageCache(
+    max_size=settings.FEED_CACHE_MAX_PAGES,
+    ttl=settings.FEED_CACHE_TTL_SECONDS,
+)
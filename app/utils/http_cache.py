@@ -0,0 +1,86 @@
+"""
+HTTP validators for post and feed responses
+
+ETags are derived from what identifies a rendered post (id, updated_at and
+counters) instead of hashing the serialized body, so a conditional request
+can be answered before anything is rendered. The viewer's `liked_by_me` flag
+is part of the validator, so personalised pages never share an ETag with the
+anonymous one.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import settings
+
+
+def _post_validator(post) -> tuple:
+    return (
+        post.id,
+        post.updated_at.isoformat(),
+        post.likes_count,
+        post.comments_count,
+        getattr(post, "liked_by_me", None),
+        tuple(comment.id for comment in getattr(post, "comments_preview", None) or ()),
+    )
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def post_etag(post) -> str:
+    return make_etag("post", _post_validator(post))
+
+
+def page_etag(posts: Iterable, next_cursor: str | None = None) -> str:
+    return make_etag("page", next_cursor, [_post_validator(post) for post in posts])
+
+
+def last_modified(posts: Iterable) -> str | None:
+    """
+    Newest edit or activity of the posts: likes and comments move activity_at,
+    not updated_at, and they change the counters in the body
+    """
+    stamps = [max(post.updated_at, post.activity_at or post.updated_at) for post in posts]
+    if not stamps:
+        return None
+    newest: datetime = max(stamps)
+    if newest.tzinfo is None:
+        newest = newest.replace(tzinfo=timezone.utc)
+    return format_datetime(newest.replace(microsecond=0), usegmt=True)
+
+
+def is_guest(request: Request) -> bool:
+    return "authorization" not in request.headers and "access_token" not in request.cookies
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def cache_headers(request: Request, etag: str, modified: str | None = None) -> dict:
+    headers = {"ETag": etag, "Vary": "Authorization, Cookie"}
+    if is_guest(request):
+        headers["Cache-Control"] = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}"
+        if modified:
+            headers["Last-Modified"] = modified
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
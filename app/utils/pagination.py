@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers
+
+Lists are ordered by (created_at DESC, id DESC). A cursor is an opaque
+url-safe token holding the (created_at, id) of the last row of a page;
+the next page is everything strictly "before" it.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Callable, Sequence, TypeVar
+
+from app.exceptions.exceptions import InvalidCursor
+
+T = TypeVar("T")
+
+Keyset = tuple[datetime, int]
+
+
+def encode_token(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise InvalidCursor()
+    if not isinstance(values, list):
+        raise InvalidCursor()
+    return values
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return encode_token([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        created_at, row_id = decode_token(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor()
+
+
+def paginate(
+    rows: Sequence[T], limit: int, key: Callable[[T], Keyset]
+) -> tuple[list[T], str | None]:
+    """
+    Trim a `limit + 1` fetch to one page and build the cursor of the next page.
+    The extra row only tells us whether another page exists.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    return items, encode_cursor(*key(items[-1]))
@@ -0,0 +1,143 @@
+"""
+Import time and memory of the app, from python -X importtime
+
+Each run is a fresh interpreter doing `import main` (what every worker pays
+before serving), and a second case that also imports app.admin, i.e. what
+ADMIN_MODE=eager or the first /admin request adds. The report has the best
+of --runs total and the peak RSS per case, the slowest modules by cumulative time and the
+top-level packages by self time. --save writes the numbers as JSON;
+--baseline compares against such a file and exits non-zero when the total
+grew by more than --threshold, so a heavy new import shows up in review.
+
+    python -m benchmarks.bench_import_time --runs 5 --top 15
+    python -m benchmarks.bench_import_time --save import_time.json
+    python -m benchmarks.bench_import_time --baseline import_time.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+CASES = {
+    "import main": "import main",
+    "+ admin": "import main, app.admin",
+}
+
+# Peak RSS in KiB (Linux) after the imports, printed on stdout by the child
+RSS = "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every line of -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run_once(code: str) -> tuple[list[tuple[str, int, int]], int]:
+    env = {
+        **os.environ,
+        "DB_NAME": os.path.join(tempfile.mkdtemp(prefix="betony-import-"), "bench.db"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{code}; {RSS}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr), int(result.stdout.strip().splitlines()[-1])
+
+
+def measure(code: str, runs: int) -> dict:
+    """
+    Best of `runs` fresh interpreters for every module's times and the total
+    (noise only ever adds time), median peak RSS
+    """
+    self_times, cumulative_times, totals, rss = defaultdict(list), defaultdict(list), [], []
+    for _ in range(runs):
+        modules, peak_kib = run_once(code)
+        for name, self_us, cumulative_us in modules:
+            self_times[name].append(self_us)
+            cumulative_times[name].append(cumulative_us)
+        totals.append(sum(self_us for _, self_us, _ in modules))
+        rss.append(peak_kib)
+
+    packages = defaultdict(float)
+    for name, times in self_times.items():
+        packages[name.split(".")[0]] += min(times)
+    return {
+        "total_ms": min(totals) / 1000,
+        "peak_rss_mb": statistics.median(rss) / 1024,
+        "modules": len(self_times),
+        "cumulative_ms": {name: min(times) / 1000 for name, times in cumulative_times.items()},
+        "package_self_ms": {name: us / 1000 for name, us in packages.items()},
+    }
+
+
+def top(values: dict[str, float], count: int) -> list[tuple[str, float]]:
+    return sorted(values.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main(args) -> int:
+    results = {label: measure(code, args.runs) for label, code in CASES.items()}
+
+    print(f"best of {args.runs} fresh interpreters")
+    print(f"{'case':>12}  {'import ms':>9}  {'modules':>7}  {'peak RSS MB':>11}")
+    for label, result in results.items():
+        print(f"{label:>12}  {result['total_ms']:9.0f}  {result['modules']:7d}  {result['peak_rss_mb']:11.1f}")
+
+    main_result = results["import main"]
+    print("\nslowest modules under `import main` (cumulative ms)")
+    for name, ms in top(main_result["cumulative_ms"], args.top):
+        print(f"{ms:9.1f}  {name}")
+    print("\npackages by self time (ms)")
+    for name, ms in top(main_result["package_self_ms"], args.top):
+        print(f"{ms:9.1f}  {name}")
+
+    summary = {
+        label: {key: result[key] for key in ("total_ms", "peak_rss_mb", "modules", "package_self_ms")}
+        for label, result in results.items()
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nsaved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nagainst {args.baseline}")
+        regressed = False
+        for label, result in summary.items():
+            if label not in baseline:
+                continue
+            before, after = baseline[label]["total_ms"], result["total_ms"]
+            change = after / before - 1
+            flag = "  ⚠️  regression" if change > args.threshold else ""
+            regressed |= bool(flag)
+            print(f"{label:>12}  {before:7.0f} -> {after:7.0f} ms  {change:+6.1%}{flag}")
+            grown = {
+                name: ms - baseline[label]["package_self_ms"].get(name, 0.0)
+                for name, ms in result["package_self_ms"].items()
+            }
+            for name, delta in top(grown, 5):
+                if delta >= 5:
+                    print(f"{'':>14}{name}: +{delta:.1f} ms")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier --save to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed growth of the total, 0.10 = 10%%")
+    sys.exit(main(parser.parse_args()))
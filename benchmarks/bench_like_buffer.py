@@ -0,0 +1,128 @@
+"""
+Sustained likes/sec with and without the write-behind like buffer
+
+Every operation is what one PUT /posts/{id}/like request does: open a
+DBManager session and call LikeService.set_like. Likes are concentrated on a
+few hot posts, which is the case the buffer is for.
+
+    python -m benchmarks.bench_like_buffer --ops 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DB_NAME", os.path.join(tempfile.mkdtemp(prefix="betony-bench-"), "bench.db"))
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.database.database import Base, async_session_maker, engine
+from app.database.db_manager import DBManager
+from app.models.likes import LikeModel
+from app.models.posts import PostModel
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+from app.services.like_buffer import like_buffer
+from app.services.likes import LikeService
+
+
+async def seed(users: int, posts: int) -> tuple[list[int], list[int]]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(RoleModel).values(id=1, name="user", description="bench"))
+        await conn.execute(insert(UserModel), [
+            {"id": i, "name": f"bench{i}", "email": f"bench{i}@bench.io", "hashed_password": "-", "role_id": 1}
+            for i in range(1, users + 1)
+        ])
+        await conn.execute(insert(PostModel), [
+            {"id": i, "title": f"hot {i}", "content": "…", "user_id": 1} for i in range(1, posts + 1)
+        ])
+    return list(range(1, users + 1)), list(range(1, posts + 1))
+
+
+async def reset() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(delete(LikeModel))
+        await conn.execute(update(PostModel).values(likes_count=0))
+
+
+async def check_counters() -> tuple[int, int]:
+    async with async_session_maker() as session:
+        stored = (await session.execute(select(func.count(LikeModel.id)))).scalar()
+        counted = (await session.execute(select(func.sum(PostModel.likes_count)))).scalar() or 0
+    return stored, counted
+
+
+async def run(ops: list[tuple[int, int, bool]], concurrency: int, buffered: bool) -> dict:
+    like_buffer.enabled = buffered
+    if buffered:
+        await like_buffer.start()
+    pending = iter(ops)
+    latencies: list[float] = []
+
+    async def worker():
+        for user_id, post_id, liked in pending:
+            started = time.perf_counter()
+            async with DBManager(session_factory=async_session_maker) as db:
+                await LikeService(db).set_like(post_id, user_id, liked)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        if buffered:
+            # The final flush is part of the cost
+            await like_buffer.stop()
+    elapsed = time.perf_counter() - started
+    stored, counted = await check_counters()
+    return {
+        "elapsed": elapsed,
+        "rate": len(ops) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": statistics.quantiles(latencies, n=100)[98] * 1000,
+        "stored": stored,
+        "counted": counted,
+        "flushes": like_buffer.stats.flushes,
+    }
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    user_ids, post_ids = await seed(args.users, args.posts)
+    ops = [
+        (rng.choice(user_ids), rng.choice(post_ids), rng.random() < args.like_ratio)
+        for _ in range(args.ops)
+    ]
+    print(f"{args.ops} like/unlike requests, {args.users} users, {args.posts} hot posts, "
+          f"concurrency {args.concurrency}")
+
+    results = {}
+    for name, buffered in (("direct", False), ("buffered", True)):
+        await reset()
+        like_buffer.stats.flushes = 0
+        results[name] = await run(ops, args.concurrency, buffered)
+        r = results[name]
+        print(f"{name:>9}: {r['rate']:8.0f} likes/s  p50 {r['p50_ms']:6.2f} ms  p99 {r['p99_ms']:6.2f} ms  "
+              f"flushes {r['flushes']:4d}  likes stored {r['stored']} / counted {r['counted']}")
+
+    if results["direct"]["stored"] != results["buffered"]["stored"]:
+        print("!! buffered run ended in a different state than the direct run")
+    print(f"speedup: {results['buffered']['rate'] / results['direct']['rate']:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--like-ratio", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
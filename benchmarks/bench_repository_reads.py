@@ -0,0 +1,96 @@
+"""
+BaseRepository reads: ORM objects + per-row model_validate vs the Core fast path
+
+"orm" is get_filtered / get_one_or_none as they were: select(Model), ORM
+hydration into the session, then schema.model_validate per row, with the
+select() rebuilt on every call. "core" is the current BaseRepository: column
+select, one TypeAdapter call per result, cached statements. "projection"
+fetches only id and name.
+
+    python -m benchmarks.bench_repository_reads --rows 10000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DB_NAME", os.path.join(tempfile.mkdtemp(prefix="betony-bench-"), "bench.db"))
+
+from sqlalchemy import insert, select
+
+from app.database.database import Base, async_session_maker, engine
+from app.database.db_manager import DBManager
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+
+
+async def orm_get_filtered(repo) -> list:
+    result = await repo.session.execute(select(repo.model))
+    return [repo.schema.model_validate(model, from_attributes=True) for model in result.scalars().all()]
+
+
+async def orm_get_one_or_none(repo, **filter_by):
+    result = await repo.session.execute(select(repo.model).filter_by(**filter_by))
+    model = result.scalars().one_or_none()
+    return None if model is None else repo.schema.model_validate(model, from_attributes=True)
+
+
+async def timed(operation, repeat: int) -> float:
+    """Median ms of `repeat` runs, each in a fresh unit of work (empty identity map)"""
+    timings = []
+    for _ in range(repeat):
+        async with DBManager(session_factory=async_session_maker) as db:
+            started = time.perf_counter()
+            await operation(db.users)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(args) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(RoleModel).values(id=1, name="user", description="bench"))
+        await conn.execute(insert(UserModel), [
+            {"name": f"bench{i}", "email": f"bench{i}@bench.io", "hashed_password": "x" * 60, "role_id": 1}
+            for i in range(args.rows)
+        ])
+
+    async def lookups(repo, get_one):
+        for user_id in range(1, args.lookups + 1):
+            await get_one(repo, id=user_id)
+
+    cases = {
+        f"list {args.rows} rows": {
+            "orm": orm_get_filtered,
+            "core": lambda repo: repo.get_filtered(),
+            "projection": lambda repo: repo.get_filtered(projection=("id", "name")),
+        },
+        f"{args.lookups} get_one_or_none": {
+            "orm": lambda repo: lookups(repo, orm_get_one_or_none),
+            "core": lambda repo: lookups(repo, lambda r, **kw: r.get_one_or_none(**kw)),
+            "projection": lambda repo: lookups(repo, lambda r, **kw: r.get_one_or_none(projection=("id", "name"), **kw)),
+        },
+    }
+
+    print(f"median ms of {args.repeat} runs")
+    print(f"{'case':>22}  {'orm':>8}  {'core':>8}  {'projection':>10}")
+    for label, paths in cases.items():
+        results = {}
+        for name, operation in paths.items():
+            await timed(operation, 1)
+            results[name] = await timed(operation, args.repeat)
+        print(f"{label:>22}  {results['orm']:8.1f}  {results['core']:8.1f}  {results['projection']:10.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=7)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments))
@@ -0,0 +1,121 @@
+"""
+Per-request overhead of the DBManager dependency, eager vs lazy
+
+"eager" is DBManager as it was before sessions and repositories became lazy:
+every request builds a session and all repositories on entry (the write side
+also takes the writer slot and BEGIN IMMEDIATE there) and always rolls back
+and closes on exit. "lazy" is the current DBManager. Requests go through the
+whole ASGI app in process (no sockets), one at a time:
+
+    /health                 no database dependency, the floor
+    /auth/me without token  DBDep resolved, 401 before any query
+    POST /posts/ no token   write-side DBDep resolved, 401 before any query
+    /auth/me with token     DBDep resolved, one primary key lookup
+
+    python -m benchmarks.bench_request_overhead --requests 3000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DB_NAME", os.path.join(tempfile.mkdtemp(prefix="betony-bench-"), "bench.db"))
+
+import httpx
+from fastapi import Request
+
+from app.api.dependencies import READ_METHODS, get_db
+from app.database.database import Base, async_session_maker, engine, read_session_maker
+from app.database.db_manager import REPOSITORIES, DBManager
+from app.database.writer import write_queue
+from main import app
+
+
+class EagerDBManager(DBManager):
+    async def __aenter__(self):
+        for name in REPOSITORIES:
+            getattr(self, name)
+        try:
+            await self.begin_write()
+        except BaseException:
+            await self._close()
+            raise
+        return self
+
+    async def _close(self):
+        try:
+            await self.session.rollback()
+            await self.session.close()
+        finally:
+            if self._holds_writer:
+                self._holds_writer = False
+                write_queue.release()
+
+
+async def get_db_eager(request: Request):
+    if request.method in READ_METHODS:
+        manager = EagerDBManager(session_factory=read_session_maker, side="read")
+    else:
+        manager = EagerDBManager(session_factory=async_session_maker)
+    async with manager as db:
+        yield db
+
+
+async def measure(client: httpx.AsyncClient, method: str, path: str, headers: dict, count: int) -> list[float]:
+    timings = []
+    body = {"title": "bench", "content": "bench"} if method == "POST" else None
+    for _ in range(count):
+        started = time.perf_counter()
+        await client.request(method, path, headers=headers, json=body)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+async def main(args) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = await client.post(
+                "/auth/register",
+                json={"name": "bench", "email": "bench@bench.io", "password": "secret1"},
+            )
+        token = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        cases = [
+            ("/health", "GET", "/health", {}),
+            ("/auth/me (401)", "GET", "/auth/me", {}),
+            ("POST /posts (401)", "POST", "/posts/", {}),
+            ("/auth/me", "GET", "/auth/me", token),
+        ]
+        print(f"{args.requests} sequential requests per case, median µs per request")
+        print(f"{'case':>17}  {'eager':>8}  {'lazy':>8}  {'saved':>6}")
+        for label, method, path, headers in cases:
+            medians = {}
+            for mode in ("eager", "lazy"):
+                if mode == "eager":
+                    app.dependency_overrides[get_db] = get_db_eager
+                else:
+                    app.dependency_overrides.pop(get_db, None)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await measure(client, method, path, headers, args.warmup)
+                    medians[mode] = statistics.median(await measure(client, method, path, headers, args.requests))
+            saved = 1 - medians["lazy"] / medians["eager"]
+            print(f"{label:>17}  {medians['eager']:8.0f}  {medians['lazy']:8.0f}  {saved:6.0%}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=200)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments))
@@ -0,0 +1,101 @@
+"""
+Compare the SQLite connection profiles on the feed and like workloads
+
+Each profile runs in its own process against a fresh database, because the
+profile is fixed when the engine is created. The feed workload is concurrent
+/posts/ page loads (PostService.get_all_posts at random offsets). The like
+workload is concurrent LikeService.set_like calls on a few hot posts.
+
+    python -m benchmarks.bench_sqlite_profiles --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = ("durable", "balanced", "throughput")
+
+
+async def worker_main(args) -> None:
+    from sqlalchemy import insert
+
+    from app.database.database import async_session_maker, engine
+    from app.database.db_manager import DBManager
+    from app.models.posts import PostModel
+    from app.services.likes import LikeService
+    from app.services.posts import PostService
+    from benchmarks.bench_like_buffer import seed
+
+    rng = random.Random(args.seed)
+    user_ids, hot_post_ids = await seed(args.users, 5)
+    async with engine.begin() as conn:
+        await conn.execute(insert(PostModel), [
+            {"title": f"post {i}", "content": "текст " * rng.randint(5, 200), "user_id": rng.choice(user_ids)}
+            for i in range(args.posts)
+        ])
+
+    async def run(op, count: int) -> float:
+        remaining = iter(range(count))
+
+        async def worker():
+            for _ in remaining:
+                async with DBManager(session_factory=async_session_maker) as db:
+                    await op(db)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return count / (time.perf_counter() - started)
+
+    async def load_feed(db):
+        await PostService(db).get_all_posts(skip=rng.randrange(0, args.posts - 20), limit=20)
+
+    async def like(db):
+        await LikeService(db).set_like(rng.choice(hot_post_ids), rng.choice(user_ids), rng.random() < 0.7)
+
+    result = {
+        "feed": await run(load_feed, args.requests),
+        "likes": await run(like, args.requests),
+    }
+    await engine.dispose()
+    print(json.dumps(result))
+
+
+def main(args) -> None:
+    print(f"{args.requests} requests per workload, concurrency {args.concurrency}, "
+          f"{args.posts} posts, {args.users} users")
+    print(f"{'profile':>10}  {'feed pages/s':>12}  {'likes/s':>8}")
+    for profile in PROFILES:
+        env = {
+            **os.environ,
+            "SQLITE_PROFILE": profile,
+            "DB_NAME": os.path.join(tempfile.mkdtemp(prefix=f"betony-{profile}-"), "bench.db"),
+        }
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sqlite_profiles", "--worker", *sys.argv[1:]],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{profile:>10}  {result['feed']:12.0f}  {result['likes']:8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.worker:
+        asyncio.run(worker_main(arguments))
+    else:
+        main(arguments)
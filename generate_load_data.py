@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic data for load tests: users, a power-law friendship graph,
+posts with a realistic length distribution, Zipf-distributed likes and
+comments.
+
+- Friendships: preferential attachment (Barabási–Albert), so a few users
+  have thousands of friends and most have a handful; stored both ways.
+- Posts: authors drawn by a Zipf activity curve, created_at spread over
+  --days in id order, log-normal title and body lengths.
+- Likes and comments: per-post counts follow a Zipf popularity curve;
+  posts.likes_count / comments_count are written to match.
+
+Rows stream through BaseRepository.add_bulk (executemany chunks under the
+bound-parameter limit) and are committed every --commit-every rows. On SQLite
+each table's secondary indexes and FTS trigger are dropped for its load and
+rebuilt after it (--keep-indexes to skip that).
+
+The same --seed gives the same rows; timestamps end at the current time
+unless --end pins them. Generated users log in with password "password123".
+timeline_entries and trending scores are not generated; the trending
+recompute fills the latter.
+
+The JSON stats summary (row counts, distributions, seconds per table) is
+printed at the end and written to --stats, for benchmark suites to read.
+
+The process uses the "throughput" SQLite profile unless SQLITE_PROFILE is set.
+
+Usage: python generate_load_data.py --users 100000 --posts 1000000 --likes 10000000 \\
+           [--comments 2000000] [--friends 20] [--seed 42] [--stats load_stats.json]
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import os
+import random
+import time
+from array import array
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+
+os.environ.setdefault("SQLITE_PROFILE", "throughput")
+
+from sqlalchemy import bindparam, func, select, text, update
+
+from app.database.database import async_session_maker, engine
+from app.database.db_manager import DBManager
+from app.database.migrations import ensure_schema
+from app.models.comments import CommentModel
+from app.models.friendships import FriendshipModel
+from app.models.likes import LikeModel
+from app.models.posts import PostModel
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+from app.repositories.base import BaseRepository
+from app.services.auth import AuthService
+
+WORDS = (
+    "python fastapi sqlite postgres async await запрос индекс кэш очередь пост лайк друг лента "
+    "комментарий сервер клиент релиз баг тест деплой docker kubernetes frontend backend дизайн "
+    "производительность память диск сеть задержка транзакция миграция схема поиск тренд профиль "
+    "сегодня вчера завтра проект команда идея опыт совет вопрос ответ спасибо отлично интересно "
+    "the a to and of in is it for on with that this was are be have not but what all"
+).split()
+
+# Log-normal parameters (median characters, sigma) and bounds
+TITLE_LENGTH = (40, 0.4, 10, 200)
+POST_LENGTH = (280, 0.9, 20, 5000)
+COMMENT_LENGTH = (80, 0.8, 2, 1000)
+
+
+def corpus(rng: random.Random, size: int = 1 << 20) -> str:
+    """A long run of random words; texts are slices of it, which is far cheaper than joining words per row"""
+    words = rng.choices(WORDS, k=size // 6)
+    return " ".join(words)[:size]
+
+
+class TextSource:
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.text = corpus(rng)
+
+    def sample(self, shape: tuple[float, float, int, int]) -> str:
+        median, sigma, low, high = shape
+        length = min(high, max(low, int(self.rng.lognormvariate(math.log(median), sigma))))
+        start = self.rng.randrange(len(self.text) - length)
+        return self.text[start:start + length].strip() or "…"
+
+
+def zipf_counts(total: int, items: int, exponent: float, cap: int, rng: random.Random) -> list[int]:
+    """`items` counts summing to about `total`, Zipf by rank, at most `cap` each, in random item order"""
+    weights = [rank ** -exponent for rank in range(1, items + 1)]
+    suffix = list(accumulate(reversed(weights)))[::-1] + [0.0]
+    # The head of the curve is cut at `cap`; spread what it loses over the rest
+    capped, scale = 0, total / suffix[0]
+    while capped < items and weights[capped] * scale > cap:
+        capped += 1
+        scale = max(0.0, total - capped * cap) / suffix[capped] if capped < items else 0.0
+    counts = [min(cap, int(weight * scale + rng.random())) for weight in weights]
+    rng.shuffle(counts)
+    return counts
+
+
+def zipf_cum_weights(items: int, exponent: float, rng: random.Random) -> list[float]:
+    """Cumulative Zipf weights over `items`, ranks shuffled so the most active ones are not the first ids"""
+    ranks = list(range(1, items + 1))
+    rng.shuffle(ranks)
+    cumulative, running = [], 0.0
+    for rank in ranks:
+        running += rank ** -exponent
+        cumulative.append(running)
+    return cumulative
+
+
+def preferential_attachment(users: int, per_user: int, rng: random.Random):
+    """Undirected edges (a, b) of a Barabási–Albert graph on 0..users-1, `per_user` edges per new node"""
+    per_user = max(1, min(per_user, users - 1))
+    # Every edge endpoint once, so a uniform pick from it is a degree-weighted pick of a node
+    endpoints = array("l", range(per_user))
+    for node in range(per_user, users):
+        targets = set()
+        while len(targets) < per_user:
+            targets.add(endpoints[rng.randrange(len(endpoints))])
+        for target in targets:
+            yield node, target
+            endpoints.append(target)
+            endpoints.append(node)
+
+
+def distribution(values) -> dict:
+    ordered = sorted(values)
+    if not ordered:
+        return {"mean": 0, "p50": 0, "p90": 0, "p99": 0, "max": 0}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": pick(0.5),
+        "p90": pick(0.9),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+class Progress:
+    def __init__(self, table: str, total: int):
+        self.table, self.total, self.done = table, total, 0
+        self.started = time.perf_counter()
+
+    def advance(self, rows: int) -> None:
+        self.done += rows
+        elapsed = time.perf_counter() - self.started
+        share = f" ({self.done / self.total:.0%})" if self.total else ""
+        print(f"[GENERATE] {self.table}: {self.done:,}/{self.total:,}{share}, {self.done / elapsed:,.0f} rows/s")
+
+    @property
+    def seconds(self) -> float:
+        return round(time.perf_counter() - self.started, 2)
+
+
+class TableWriter(BaseRepository):
+    """add_bulk for any model; most repositories here do not extend BaseRepository"""
+    def __init__(self, session, model):
+        super().__init__(session)
+        self.model = model
+
+
+async def write(model, rows, total: int, args, first_id: int = 0) -> tuple[int, float]:
+    """
+    Stream `rows` into the model's table, one transaction per --commit-every
+    rows. The next batch is generated in a thread while the current one is
+    written; SQLite releases the GIL, so the two overlap.
+    """
+    progress = Progress(model.__tablename__, total)
+    async with bulk_load(model.__tablename__, first_id, args.keep_indexes):
+        async with DBManager(session_factory=async_session_maker) as db:
+            repository = TableWriter(db.session, model)
+            batch = list(islice(rows, args.commit_every))
+            while batch:
+                upcoming = asyncio.create_task(asyncio.to_thread(lambda: list(islice(rows, args.commit_every))))
+                await repository.add_bulk(batch)
+                await db.commit()
+                progress.advance(len(batch))
+                batch = await upcoming
+    return progress.done, progress.seconds
+
+
+@asynccontextmanager
+async def bulk_load(table: str, first_id: int, keep_indexes: bool):
+    """
+    Drop the secondary indexes and the FTS insert trigger of `table` for the
+    load, then rebuild them: CREATE INDEX sorts once, where inserting rows in
+    random key order keeps missing the page cache, and one INSERT ... SELECT
+    into the FTS table is about three times faster than the per-row trigger.
+    Everything is put back even if the load fails. SQLite only.
+    """
+    if engine.dialect.name != "sqlite":
+        yield
+        return
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        rows = await db.session.execute(
+            text(
+                "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = :table AND sql IS NOT NULL "
+                "AND (type = 'index' OR name = :trigger)"
+            ),
+            {"table": table, "trigger": f"{table}_fts_ai"},
+        )
+        dropped = [(kind, name, ddl) for kind, name, ddl in rows if kind == "trigger" or not keep_indexes]
+        for kind, name, _ in dropped:
+            await db.session.execute(text(f"DROP {kind.upper()} {name}"))
+        await db.commit()
+
+    try:
+        yield
+    finally:
+        started = time.perf_counter()
+        async with DBManager(session_factory=async_session_maker) as db:
+            for kind, _, ddl in dropped:
+                if kind == "trigger":
+                    fts = f"{table}_fts"
+                    columns = ", ".join(
+                        row[1] for row in await db.session.execute(text(f"PRAGMA table_info({fts})"))
+                    )
+                    await db.session.execute(
+                        text(f"INSERT INTO {fts}(rowid, {columns}) SELECT id, {columns} FROM {table} WHERE id >= :first"),
+                        {"first": first_id},
+                    )
+                await db.session.execute(text(ddl))
+            await db.commit()
+        if dropped:
+            print(f"[GENERATE] {table}: rebuilt {', '.join(name for _, name, _ in dropped)} "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+
+async def set_friendships_counts(user_base: int, degrees: list[int]) -> None:
+    """users.friendships_count: each edge is stored both ways, so two rows per friend"""
+    users = UserModel.__table__
+    async with DBManager(session_factory=async_session_maker) as db:
+        await db.session.execute(
+            update(users)
+            .where(users.c.id == bindparam("b_id"))
+            .values(friendships_count=bindparam("b_count"), updated_at=users.c.updated_at),
+            [{"b_id": user_base + i, "b_count": 2 * degree} for i, degree in enumerate(degrees) if degree],
+        )
+        await db.commit()
+
+
+async def next_ids() -> dict[str, int]:
+    async with DBManager(session_factory=async_session_maker) as db:
+        ids = {}
+        for model in (UserModel, PostModel, LikeModel, CommentModel, FriendshipModel):
+            ids[model.__tablename__] = (await db.session.scalar(select(func.max(model.id)))) or 0
+        if await db.session.get(RoleModel, 1) is None:
+            await TableWriter(db.session, RoleModel).add_bulk([{"id": 1, "name": "user", "description": "Default user role"}])
+            await db.commit()
+    return ids
+
+
+async def generate(args) -> dict:
+    rng = random.Random(args.seed)
+    text = TextSource(rng)
+    started = time.perf_counter()
+    now = args.end or datetime.utcnow().replace(microsecond=0)
+    window = timedelta(days=args.days).total_seconds()
+    first = now - timedelta(days=args.days)
+
+    print(f"[GENERATE] Schema {await ensure_schema(engine)}")
+    last_ids = await next_ids()
+    user_base, post_base = last_ids["users"] + 1, last_ids["posts"] + 1
+    seconds = {}
+
+    # Users
+    password = AuthService.hash_password("password123")
+    users = (
+        {
+            "id": user_base + i,
+            "name": f"load{user_base + i:07d}",
+            "email": f"load{user_base + i}@load.betony.local",
+            "hashed_password": password,
+            "role_id": 1,
+            "is_admin": False,
+            "created_at": first + timedelta(seconds=window * i / args.users),
+        }
+        for i in range(args.users)
+    )
+    _, seconds["users"] = await write(UserModel, users, args.users, args)
+
+    # Friendships, both directions of every edge
+    degrees = [0] * args.users
+
+    def friendships():
+        for a, b in preferential_attachment(args.users, args.friends // 2, rng):
+            degrees[a] += 1
+            degrees[b] += 1
+            created_at = first + timedelta(seconds=rng.random() * window)
+            yield {"user_id": user_base + a, "friend_id": user_base + b, "created_at": created_at}
+            yield {"user_id": user_base + b, "friend_id": user_base + a, "created_at": created_at}
+
+    expected_friendships = 2 * max(0, args.users - args.friends // 2) * max(1, args.friends // 2)
+    friendship_rows, seconds["friendships"] = await write(FriendshipModel, friendships(), expected_friendships, args)
+    await set_friendships_counts(user_base, degrees)
+
+    # Per-post like and comment counts first, so the posts carry matching counters
+    like_counts = zipf_counts(args.likes, args.posts, args.zipf, args.users, rng)
+    comment_counts = zipf_counts(args.comments, args.posts, args.zipf, 10 * args.users, rng)
+    author_weights = zipf_cum_weights(args.users, args.activity_zipf, rng)
+    post_times = [window * i / args.posts + rng.random() * 60 for i in range(args.posts)]
+    post_lengths = array("l")
+
+    def posts():
+        for i in range(args.posts):
+            author = bisect.bisect(author_weights, rng.random() * author_weights[-1])
+            content = text.sample(POST_LENGTH)
+            post_lengths.append(len(content))
+            created_at = first + timedelta(seconds=post_times[i])
+            yield {
+                "id": post_base + i,
+                "title": text.sample(TITLE_LENGTH),
+                "content": content,
+                "user_id": user_base + min(author, args.users - 1),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "activity_at": created_at,
+                "likes_count": like_counts[i],
+                "comments_count": comment_counts[i],
+            }
+
+    _, seconds["posts"] = await write(PostModel, posts(), args.posts, args, post_base)
+
+    def reaction_time(i: int) -> datetime:
+        # Most engagement lands within a day of the post, never after now
+        delay = min(rng.expovariate(1 / 21600), window - post_times[i])
+        return first + timedelta(seconds=post_times[i] + delay)
+
+    def likes():
+        for i, count in enumerate(like_counts):
+            for liker in rng.sample(range(args.users), count):
+                yield {"user_id": user_base + liker, "post_id": post_base + i, "created_at": reaction_time(i)}
+
+    like_rows, seconds["likes"] = await write(LikeModel, likes(), sum(like_counts), args)
+
+    def comments():
+        for i, count in enumerate(comment_counts):
+            for _ in range(count):
+                yield {
+                    "content": text.sample(COMMENT_LENGTH),
+                    "user_id": user_base + rng.randrange(args.users),
+                    "post_id": post_base + i,
+                    "created_at": reaction_time(i),
+                }
+
+    comment_rows, seconds["comments"] = await write(
+        CommentModel, comments(), sum(comment_counts), args, last_ids["comments"] + 1
+    )
+
+    total_seconds = round(time.perf_counter() - started, 2)
+    total_rows = args.users + friendship_rows + args.posts + like_rows + comment_rows
+    return {
+        "seed": args.seed,
+        "database": engine.url.render_as_string(hide_password=True),
+        "rows": {
+            "users": args.users,
+            "friendships": friendship_rows,
+            "posts": args.posts,
+            "likes": like_rows,
+            "comments": comment_rows,
+        },
+        "id_ranges": {
+            "users": [user_base, user_base + args.users - 1],
+            "posts": [post_base, post_base + args.posts - 1],
+        },
+        "friends_per_user": distribution(degrees),
+        "posts_per_user_zipf": args.activity_zipf,
+        "likes_per_post": distribution(like_counts),
+        "comments_per_post": distribution(comment_counts),
+        "post_length_chars": distribution(post_lengths),
+        "seconds": {**seconds, "total": total_seconds},
+        "rows_per_second": round(total_rows / total_seconds),
+    }
+
+
+async def main(args) -> None:
+    stats = await generate(args)
+    await engine.dispose()
+    summary = json.dumps(stats, indent=2, ensure_ascii=False)
+    if args.stats:
+        with open(args.stats, "w") as f:
+            f.write(summary)
+        print(f"[GENERATE] Stats written to {args.stats}")
+    print(summary)
+    print(f"[GENERATE] ✅ Done in {stats['seconds']['total']:.1f}s, {stats['rows_per_second']:,} rows/s")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--likes", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=200_000)
+    parser.add_argument("--friends", type=int, default=20, help="average friends per user")
+    parser.add_argument("--days", type=int, default=90, help="time span the data is spread over")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="latest timestamp, default now (UTC)")
+    parser.add_argument("--zipf", type=float, default=1.0, help="exponent of likes/comments per post")
+    parser.add_argument("--activity-zipf", type=float, default=0.8, help="exponent of posts per user")
+    parser.add_argument("--commit-every", type=int, default=200_000)
+    parser.add_argument("--keep-indexes", action="store_true",
+                        help="insert with indexes in place; faster when adding little to a large database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stats", help="write the JSON stats summary to this file")
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    arguments = parser.parse_args()
+    if arguments.users < 2 or arguments.posts < 1:
+        parser.error("need at least 2 users and 1 post")
+    asyncio.run(main(arguments))
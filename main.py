@@ -1,11 +1,12 @@
 import os
 import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.api.auth import router as auth_router
 from app.api.posts import router as posts_router
@@ -13,12 +14,112 @@ from app.api.friendships import router as friendships_router
 from app.api.comments import router as comments_router
 from app.api.likes import router as likes_router
 from app.api.friends import router as friends_router  # NEW
+from app.api.diagnostics import router as diagnostics_router
+from app.api.search import router as search_router
+from app.api.middleware import QueryStatsMiddleware
+from app.lazy_admin import LazyAdmin
 from app.config import settings
-from app.database.database import Base
-from app.services.data_init import init_sample_data
-from app.admin import setup_admin
+from app.database.database import Base, async_session_maker, engine, read_engine
+from app.database.migrations import ensure_schema, prewarm
+from app.database.query_advisor import run_advisor
+from app.services.data_init import init_sample_data, is_seeded
+from app.services.like_buffer import like_buffer
+from app.services.trending import trending_recomputer
 
-app = FastAPI(title="Betony", version="1.0.0")
+@contextmanager
+def startup_phase(name: str, timings: dict):
+    started = time.perf_counter()
+    yield
+    timings[name] = (time.perf_counter() - started) * 1000
+    print(f"[APP] ✅ {name}: {timings[name]:.1f} ms")
+
+
+async def seed_sample_data():
+    try:
+        started = time.perf_counter()
+        await init_sample_data()
+        print(f"[APP] Sample data seeded in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except Exception as e:
+        print(f"[APP] ⚠️  Sample data seeding failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup on the shared engines: Alembic schema check, pool warm-up, admin
+    (only with ADMIN_MODE=eager), background work. Sample data is opt-in (SEED_SAMPLE_DATA) and by default
+    seeded in the background, so the server takes traffic right away; the seed
+    writes in short units of work, so request writes are not held behind it.
+    """
+    print("[APP] Starting application...")
+    started = time.perf_counter()
+    timings = {}
+    seeding = None
+    try:
+        with startup_phase("schema", timings):
+            print(f"[APP] Schema {await ensure_schema(engine)}")
+
+        with startup_phase("connection pools", timings):
+            await asyncio.gather(
+                prewarm(engine, settings.DB_POOL_PREWARM),
+                prewarm(read_engine, settings.DB_POOL_PREWARM),
+            )
+
+        if settings.SEED_SAMPLE_DATA:
+            with startup_phase("seed check", timings):
+                seeded = await is_seeded()
+            if seeded:
+                print("[APP] Sample data already present")
+            elif settings.SEED_IN_BACKGROUND:
+                print("[APP] Seeding sample data in the background...")
+                seeding = asyncio.create_task(seed_sample_data())
+            else:
+                with startup_phase("seed", timings):
+                    await seed_sample_data()
+
+        if settings.ADMIN_MODE == "eager":
+            with startup_phase("admin", timings):
+                try:
+                    from app.admin import setup_admin
+
+                    setup_admin(app, engine)
+                    print("[APP] 🎉 Admin panel available at: http://localhost:8000/admin")
+                except Exception as e:
+                    print(f"[APP] ⚠️  Could not setup admin panel: {e}")
+        elif settings.ADMIN_MODE == "lazy":
+            print("[APP] Admin panel loads on first request: http://localhost:8000/admin")
+
+        if settings.DEBUG:
+            with startup_phase("query plan advisor", timings):
+                await run_advisor(async_session_maker, set(Base.metadata.tables))
+
+        with startup_phase("background tasks", timings):
+            if like_buffer.enabled:
+                await like_buffer.start()
+                print("[APP] Like buffer enabled, flushing every "
+                      f"{like_buffer.flush_interval_ms} ms or {like_buffer.max_events} events")
+            await trending_recomputer.start()
+    except Exception as e:
+        print(f"[APP] Error during startup: {e}")
+        import traceback
+        traceback.print_exc()
+
+    print(f"[APP] Ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+    yield
+
+    # Stop background work and write buffered likes before the process exits
+    if seeding is not None and not seeding.done():
+        # A half-seeded database would pass the seed check next time
+        print("[APP] Waiting for sample data seeding to finish...")
+        await seeding
+    await trending_recomputer.stop()
+    if like_buffer.enabled:
+        print("[APP] Flushing like buffer...")
+        await like_buffer.stop()
+    await asyncio.gather(engine.dispose(), read_engine.dispose())
+
+
+app = FastAPI(title="Betony", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -29,6 +130,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.query_stats_enabled:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=settings.DEBUG,
+        n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+    )
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(BASE_DIR, "app", "frontend")
 
@@ -49,37 +157,6 @@ async def health():
     return {"status": "ok"}
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Create database tables and initialize sample data on startup"""
-    print("[APP] Starting application...")
-    print("[APP] Creating database tables...")
-    try:
-        engine = create_async_engine(settings.get_db_url)
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        print("[APP] Database tables created successfully!")
-        
-        # Initialize sample data
-        print("[APP] Initializing sample data...")
-        await init_sample_data()
-        print("[APP] Sample data initialized successfully!")
-        
-        # Setup SQLAdmin
-        print("[APP] Setting up admin panel...")
-        try:
-            setup_admin(app, engine)
-            print("[APP] 🎉 Admin panel available at: http://localhost:8000/admin")
-        except Exception as e:
-            print(f"[APP] ⚠️  Could not setup admin panel: {e}")
-        
-        await engine.dispose()
-    except Exception as e:
-        print(f"[APP] Error during startup: {e}")
-        import traceback
-        traceback.print_exc()
-
-
 # Include routers
 app.include_router(auth_router)
 app.include_router(posts_router)
@@ -87,6 +164,12 @@ app.include_router(comments_router)
 app.include_router(likes_router)
 app.include_router(friendships_router)
 app.include_router(friends_router)  # NEW
+app.include_router(search_router)
+app.include_router(diagnostics_router)
+
+# SQLAdmin is imported and built on the first /admin request, see app/lazy_admin.py
+if settings.ADMIN_MODE == "lazy":
+    app.mount("/admin", LazyAdmin(engine), name="admin")
 
 
 if __name__ == "__main__":
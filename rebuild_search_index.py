@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Build or rebuild the FTS5 search indexes (posts_fts, comments_fts).
+
+Creates the virtual tables and sync triggers if a database predates them,
+re-reads every post and comment into the index, and merges the index
+b-trees. Safe to run on a live database; it takes one write transaction.
+
+Usage: python rebuild_search_index.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.services.search import SearchService
+
+
+async def rebuild_search_index() -> None:
+    started = time.perf_counter()
+    async with DBManager(session_factory=async_session_maker) as db:
+        await SearchService(db).rebuild()
+    print(f"[SEARCH] ✅ Search index rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    asyncio.run(rebuild_search_index())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Recompute posts.likes_count / posts.comments_count from the likes and
+comments tables, and users.friendships_count from friendships, to repair
+counter drift.
+
+Rows are walked in id order in fixed-size batches, one short transaction
+per batch, so the writer lock is never held for long on large tables.
+
+Usage: python reconcile_counters.py [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+
+
+async def reconcile_counters(batch_size: int = 1000) -> int:
+    """Return the number of posts and users whose counters were corrected"""
+    fixed = 0
+    started = time.perf_counter()
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        for table, repository, reconcile in (
+            ("posts", db.posts, db.posts.reconcile_counters),
+            ("users", db.users, db.users.reconcile_friendships_counts),
+        ):
+            last_id = 0
+            while True:
+                window = await repository.get_id_window(last_id, batch_size)
+                if window is None:
+                    break
+                first_id, last_id = window
+
+                fixed += await reconcile(first_id, last_id)
+                await db.commit()
+
+                print(f"[RECONCILE] {table} up to id {last_id}: {fixed} corrected so far")
+
+    print(f"[RECONCILE] ✅ Done in {time.perf_counter() - started:.2f}s, {fixed} rows corrected")
+    return fixed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(reconcile_counters(args.batch_size))
@@ -0,0 +1,90 @@
+import pytest
+
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.schemes.roles import SRoleAdd
+from app.schemes.users import SUserGet
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_filtered_reads_validate_into_the_schema(client, register):
+    for name in ("alice", "bobby", "carol"):
+        await register(name)
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        users = await db.users.get_filtered()
+        assert [type(user) for user in users] == [SUserGet] * 3
+        assert [user.name for user in users] == ["alice", "bobby", "carol"]
+        assert db.session.identity_map.keys() == set()
+
+        page = await db.users.get_filtered(1, 1)
+        assert [user.name for user in page] == ["bobby"]
+        assert [user.name for user in await db.users.get_filtered(name="carol", role_id=None)] == ["carol"]
+
+        brief = await db.users.get_filtered(projection=("id", "name"))
+        assert brief[0].model_dump() == {"id": users[0].id, "name": "alice"}
+
+        assert (await db.users.get_one_or_none(email="bobby@test.io")) is None
+        bobby = await db.users.get_one_or_none(id=users[1].id)
+        assert bobby == users[1]
+        assert (await db.users.get_one_or_none(projection=("name",), id=users[1].id)).name == "bobby"
+
+
+async def test_statements_are_built_once_per_shape(client):
+    async with DBManager(session_factory=async_session_maker) as db:
+        first = db.users._select(("id", "name"), ("email",), paginated=False)
+        assert db.users._select(("id", "name"), ("email",), paginated=False) is first
+        assert db.roles._select(("id", "name"), ("name",), paginated=False) is not first
+
+
+async def test_add_bulk_streams_chunks_and_returns_ids(client, count_queries):
+    produced = []
+
+    def roles():
+        for i in range(250):
+            produced.append(i)
+            yield {"name": f"role{i}", "description": None}
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        ids = await db.roles.add_bulk(roles(), returning=True, chunk_size=100)
+        await db.commit()
+        names = {role.id: role.name for role in await db.roles.get_all()}
+
+    assert len(produced) == len(ids) == 250
+    assert sorted(names[role_id] for role_id in ids) == sorted(f"role{i}" for i in range(250))
+    assert sum(statement.startswith("INSERT INTO roles") for statement in count_queries) == 3
+
+
+async def test_add_bulk_on_conflict(client):
+    async with DBManager(session_factory=async_session_maker) as db:
+        await db.roles.add_bulk([SRoleAdd(name="a", description="old"), SRoleAdd(name="b", description="old")])
+
+        ids = await db.roles.add_bulk(
+            [{"name": "a", "description": "new"}, {"name": "c", "description": "new"}],
+            returning=True, on_conflict="ignore", conflict_keys=["name"],
+        )
+        assert len(ids) == 1
+
+        await db.roles.add_bulk(
+            [{"name": "b", "description": "new"}],
+            on_conflict="update", conflict_keys=["name"],
+        )
+        await db.commit()
+        roles = {role.name: role.description for role in await db.roles.get_all()}
+
+    assert roles == {"a": "old", "b": "new", "c": "new"}
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        with pytest.raises(ObjectAlreadyExistsError):
+            await db.roles.add_bulk([{"name": "a", "description": None}])
+
+
+async def test_add_bulk_chunks_fit_the_parameter_limit(client, count_queries, monkeypatch):
+    monkeypatch.setattr("app.repositories.base.max_bind_params", lambda session: 10)
+    async with DBManager(session_factory=async_session_maker) as db:
+        await db.roles.add_bulk({"name": f"role{i}", "description": None} for i in range(12))
+        await db.commit()
+    # 2 columns per row, 10 parameters: chunks of 5, 5 and 2 rows
+    assert sum(statement.startswith("INSERT INTO roles") for statement in count_queries) == 3
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.database import engine
+from reconcile_counters import reconcile_counters
+
+pytestmark = pytest.mark.anyio
+
+
+async def _post(client, headers) -> int:
+    response = await client.post("/posts/", json={"title": "title", "content": "content"}, headers=headers)
+    return response.json()["id"]
+
+
+async def test_like_and_comment_writes_maintain_counters(client, register):
+    _, alice = await register()
+    _, bob = await register()
+    post_id = await _post(client, alice)
+    created = (await client.get(f"/posts/{post_id}")).json()
+
+    await client.post(f"/posts/{post_id}/like", headers=alice)
+    await client.post(f"/posts/{post_id}/like", headers=bob)
+    comment = (await client.post(f"/posts/{post_id}/comments", json={"content": "hi"}, headers=bob)).json()
+
+    post = (await client.get(f"/posts/{post_id}")).json()
+    assert (post["likes_count"], post["comments_count"]) == (2, 1)
+    # Likes and comments are not edits of the post
+    assert post["updated_at"] == created["updated_at"]
+
+    await client.delete(f"/posts/{post_id}/like", headers=bob)
+    await client.delete(f"/posts/{post_id}/comments/{comment['id']}", headers=bob)
+
+    post = (await client.get(f"/posts/{post_id}")).json()
+    assert (post["likes_count"], post["comments_count"]) == (1, 0)
+
+
+async def test_reconcile_repairs_drift(client, register):
+    _, alice = await register()
+    post_ids = [await _post(client, alice) for _ in range(5)]
+    await client.post(f"/posts/{post_ids[0]}/like", headers=alice)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE posts SET likes_count = 42, comments_count = 7 WHERE id IN (1, 4)"))
+
+    assert await reconcile_counters(batch_size=2) == 2
+
+    posts = {p["id"]: p for p in (await client.get("/posts/")).json()}
+    assert posts[post_ids[0]]["likes_count"] == 1
+    assert posts[post_ids[3]]["likes_count"] == 0
+    assert all(p["comments_count"] == 0 for p in posts.values())
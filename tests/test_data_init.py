@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database.database import async_session_maker
+from app.models.posts import PostModel
+from app.models.users import UserModel
+from app.services.data_init import SAMPLE_POSTS_FULL, init_sample_data, is_seeded
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_request_writes_interleave_with_seeding(client, register):
+    _, alice = await register()
+    seeding = asyncio.create_task(init_sample_data())
+
+    # Wait until the seed is underway, then write through the API
+    while not await is_seeded():
+        await asyncio.sleep(0.01)
+    response = await client.post("/posts/", json={"title": "во время", "content": "c"}, headers=alice)
+    assert response.status_code == 201, response.text
+    assert not seeding.done()
+
+    await seeding
+    async with async_session_maker() as session:
+        posts = await session.scalar(select(func.count()).select_from(PostModel))
+        admin = await session.scalar(select(UserModel.is_admin).where(UserModel.email == "alice@betony.local"))
+    assert posts == len(SAMPLE_POSTS_FULL) + 1
+    assert admin
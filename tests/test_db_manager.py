@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event, func, insert, select
+
+from app.database.database import async_session_maker, engine, read_engine, read_session_maker
+from app.database.db_manager import DBManager
+from app.database.writer import write_queue
+from app.models.roles import RoleModel
+from app.repositories.posts import PostRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_session_and_repositories_are_created_on_first_use(client):
+    async with DBManager(session_factory=read_session_maker, side="read") as db:
+        assert db._session is None
+        assert "posts" not in vars(db)
+
+        assert isinstance(db.posts, PostRepository)
+        assert db.posts is db.posts
+        assert db.posts.session is db.session
+        with pytest.raises(AttributeError):
+            db.missing
+
+
+async def test_requests_that_never_query_take_no_connection(client, register):
+    _, alice = await register()
+    checkouts = []
+
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    event.listen(read_engine.sync_engine.pool, "checkout", _checkout)
+    try:
+        assert (await client.get("/auth/me")).status_code == 401
+        assert checkouts == []
+
+        assert (await client.get("/auth/me", headers=alice)).status_code == 200
+        assert len(checkouts) == 1
+    finally:
+        event.remove(read_engine.sync_engine.pool, "checkout", _checkout)
+
+
+@pytest.mark.sqlite_only
+async def test_write_side_claims_the_writer_on_first_write(client):
+    async with DBManager(session_factory=async_session_maker) as db:
+        assert db._session is None and not db._holds_writer
+        db.posts
+        assert not db._holds_writer
+
+        # Reads go through the read pool until something writes
+        assert (await db.session.execute(select(1))).scalar() == 1
+        assert not db._holds_writer
+
+        await db.session.execute(insert(RoleModel).values(name="editor", description="d"))
+        assert db._holds_writer
+        assert (await db.session.execute(select(func.count()).select_from(RoleModel))).scalar() == 1
+    assert not db._holds_writer
+
+
+@pytest.mark.sqlite_only
+async def test_rejected_writes_never_queue_for_the_writer(client):
+    transactions = write_queue.stats.transactions
+    checkouts = []
+
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    event.listen(engine.sync_engine.pool, "checkout", _checkout)
+    try:
+        response = await client.post("/posts/", json={"title": "t", "content": "c"})
+        assert response.status_code == 401
+        assert checkouts == []
+        assert write_queue.stats.transactions == transactions
+    finally:
+        event.remove(engine.sync_engine.pool, "checkout", _checkout)
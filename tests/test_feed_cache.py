@@ -0,0 +1,49 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stats(client) -> dict:
+    return (await client.get("/diagnostics/cache")).json()
+
+
+async def _post(client, headers, title: str) -> int:
+    response = await client.post("/posts/", json={"title": title, "content": "content"}, headers=headers)
+    return response.json()["id"]
+
+
+async def test_repeat_reads_are_served_from_cache(client, register, count_queries):
+    _, alice = await register()
+    await _post(client, alice, "first")
+
+    first = await client.get("/posts/")
+    before = await _stats(client)
+    count_queries.clear()
+    second = await client.get("/posts/")
+
+    assert second.json() == first.json()
+    assert count_queries == []
+    assert (await _stats(client))["hits"] == before["hits"] + 1
+
+
+async def test_writes_invalidate_affected_pages(client, register):
+    _, alice = await register()
+    post_ids = [await _post(client, alice, f"post {i}") for i in range(4)]
+
+    head = (await client.get("/posts/", params={"cursor": "", "limit": 2})).json()
+    tail = (await client.get("/posts/", params={"cursor": head["next_cursor"], "limit": 2})).json()
+
+    # A like on a post of the second page only drops that page
+    await client.post(f"/posts/{post_ids[0]}/like", headers=alice)
+    assert (await client.get("/posts/", params={"cursor": head["next_cursor"], "limit": 2})).json() != tail
+    hits = (await _stats(client))["hits"]
+    await client.get("/posts/", params={"cursor": "", "limit": 2})
+    assert (await _stats(client))["hits"] == hits + 1
+
+    # A new post shifts the head page but not keyset pages further down
+    await _post(client, alice, "newest")
+    new_head = (await client.get("/posts/", params={"cursor": "", "limit": 2})).json()
+    assert new_head["items"][0]["title"] == "newest"
+    hits = (await _stats(client))["hits"]
+    await client.get("/posts/", params={"cursor": head["next_cursor"], "limit": 2})
+    assert (await _stats(client))["hits"] == hits + 1
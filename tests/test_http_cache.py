@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.database import engine
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_post_etag_round_trip(client, register):
+    _, alice = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    response = await client.get(f"/posts/{post_id}")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public")
+    assert "last-modified" in response.headers
+
+    cached = await client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    await client.post(f"/posts/{post_id}/like", headers=alice)
+    changed = await client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["likes_count"] == 1
+
+
+async def test_feed_page_etag(client, register):
+    _, alice = await register()
+    await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)
+
+    first = await client.get("/posts/")
+    etag = first.headers["etag"]
+    assert (await client.get("/posts/", headers={"If-None-Match": f'W/{etag}, "other"'})).status_code == 304
+
+    # Signed-in readers get their own representation (liked_by_me) and validator
+    mine = await client.get("/posts/", headers=alice)
+    assert mine.headers["etag"] != etag
+    private = await client.get("/posts/", headers={**alice, "If-None-Match": mine.headers["etag"]})
+    assert private.status_code == 304
+    assert private.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in private.headers
+
+    await client.post("/posts/", json={"title": "t2", "content": "c"}, headers=alice)
+    assert (await client.get("/posts/", headers={"If-None-Match": etag})).status_code == 200
+
+
+async def test_engagement_moves_last_modified(client, register):
+    _, alice = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE posts SET updated_at = '2020-01-01 00:00:00', activity_at = '2020-01-01 00:00:00'"))
+
+    before = await client.get(f"/posts/{post_id}")
+    assert before.headers["last-modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+
+    # A like is not an edit (updated_at stays), but the body and validators change
+    await client.post(f"/posts/{post_id}/like", headers=alice)
+    after = await client.get(f"/posts/{post_id}")
+    assert after.json()["updated_at"] == before.json()["updated_at"]
+    assert "activity_at" not in after.json()
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.headers["last-modified"] != before.headers["last-modified"]
+
+    page = await client.get("/posts/")
+    assert page.headers["last-modified"] == after.headers["last-modified"]
@@ -0,0 +1,30 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.database.database import engine
+from app.lazy_admin import LazyAdmin
+from main import app
+
+pytestmark = pytest.mark.anyio
+
+
+def test_main_app_mounts_the_stub():
+    mount = next(route for route in app.routes if getattr(route, "name", None) == "admin")
+    assert isinstance(mount.app, LazyAdmin)
+
+
+async def test_admin_is_built_on_first_request(client):
+    stub = LazyAdmin(engine)
+    host = FastAPI()
+    host.mount("/admin", stub, name="admin")
+    assert not stub.loaded and stub.routes == []
+
+    transport = httpx.ASGITransport(app=host)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as admin_client:
+        response = await admin_client.get("/admin/")
+        assert response.status_code == 200
+        assert stub.loaded
+        # url_for("admin:...") resolves through the stub's routes
+        assert "http://test/admin/statics/" in response.text
+        assert (await admin_client.get("/admin/user-model/list")).status_code == 200
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.database.database import async_session_maker
+from app.database.writer import write_queue
+from app.models.likes import LikeModel
+from app.services.like_buffer import LikeBuffer, like_buffer
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stored_likes() -> int:
+    async with async_session_maker() as session:
+        return (await session.execute(select(func.count(LikeModel.id)))).scalar()
+
+
+@pytest.fixture
+def buffered(monkeypatch):
+    monkeypatch.setattr(like_buffer, "enabled", True)
+    yield like_buffer
+    like_buffer.clear()
+
+
+async def test_buffered_likes_are_visible_before_flush(client, register, buffered):
+    _, alice = await register()
+    users = [await register() for _ in range(3)]
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    for _, headers in users:
+        response = await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=headers)
+    assert response.json() == {"liked": True, "likes_count": 3}
+    # A like and its undo cancel out inside the buffer
+    await client.put(f"/posts/{post_id}/like", json={"liked": False}, headers=users[0][1])
+    await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=users[0][1])
+
+    assert await _stored_likes() == 0
+    post = (await client.get(f"/posts/{post_id}", headers=users[1][1])).json()
+    assert post["likes_count"] == 3
+    assert post["liked_by_me"] is True
+
+    assert await buffered.flush() == 3
+    assert await _stored_likes() == 3
+    assert buffered.delta(post_id) == 0
+    assert (await client.get(f"/posts/{post_id}")).json()["likes_count"] == 3
+
+
+async def test_intent_log_is_replayed(client, register, tmp_path):
+    _, alice = await register()
+    bob_id, _ = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    log_path = str(tmp_path / "likes.log")
+    crashed = LikeBuffer(enabled=True, flush_interval_ms=1000, max_events=100, log_path=log_path)
+    crashed.record(bob_id, post_id, True, stored=False)
+    assert await _stored_likes() == 0
+
+    restarted = LikeBuffer(enabled=True, flush_interval_ms=1000, max_events=100, log_path=log_path)
+    assert await restarted.replay_log() == 1
+    assert await _stored_likes() == 1
+    assert (await client.get(f"/posts/{post_id}")).json()["likes_count"] == 1
+    assert open(log_path).read() == ""
+
+
+@pytest.mark.sqlite_only
+async def test_buffered_likes_never_queue_for_the_writer(client, register, buffered):
+    _, alice = await register()
+    _, bob = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    transactions = write_queue.stats.transactions
+    for liked in (True, False, True):
+        response = await client.put(f"/posts/{post_id}/like", json={"liked": liked}, headers=bob)
+        assert response.status_code == 200
+    assert write_queue.stats.transactions == transactions
+
+    assert await buffered.flush() == 1
+    assert write_queue.stats.transactions == transactions + 1
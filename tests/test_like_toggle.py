@@ -0,0 +1,47 @@
+import anyio
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_put_like_is_idempotent(client, register, count_queries):
+    _, alice = await register()
+    _, bob = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    count_queries.clear()
+    liked = await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=bob)
+    assert liked.json() == {"liked": True, "likes_count": 1}
+    # Besides loading the current user: the like write and the counter update
+    assert [q.split()[0] for q in count_queries] == ["SELECT", "INSERT", "UPDATE"], count_queries
+
+    again = await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=bob)
+    assert again.json() == {"liked": True, "likes_count": 1}
+    assert len((await client.get(f"/posts/{post_id}/likes")).json()) == 1
+
+    unliked = await client.put(f"/posts/{post_id}/like", json={"liked": False}, headers=bob)
+    assert unliked.json() == {"liked": False, "likes_count": 0}
+    again = await client.put(f"/posts/{post_id}/like", json={"liked": False}, headers=bob)
+    assert again.json() == {"liked": False, "likes_count": 0}
+
+
+async def test_concurrent_likes_never_duplicate(client, register):
+    _, alice = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+
+    async def like():
+        response = await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=alice)
+        assert response.status_code == 200
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(like)
+
+    assert len((await client.get(f"/posts/{post_id}/likes")).json()) == 1
+    assert (await client.get(f"/posts/{post_id}")).json()["likes_count"] == 1
+
+
+async def test_put_like_on_missing_post(client, register):
+    _, alice = await register()
+    response = await client.put("/posts/999/like", json={"liked": True}, headers=alice)
+    assert response.status_code == 404
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database.database import async_session_maker
+from app.models.likes import LikeModel
+from app.models.posts import PostModel
+from generate_load_data import build_parser, generate, zipf_counts
+from reconcile_counters import reconcile_counters
+
+pytestmark = pytest.mark.anyio
+
+ARGS = ["--users", "40", "--posts", "200", "--likes", "1500", "--comments", "300",
+        "--friends", "6", "--commit-every", "250", "--end", "2024-06-01T12:00:00"]
+
+
+def test_zipf_counts_hit_the_total_under_the_cap():
+    counts = zipf_counts(5000, 300, 1.0, 30, random.Random(1))
+    assert max(counts) == 30
+    assert abs(sum(counts) - 5000) < 50
+
+
+async def test_generated_data_is_consistent(client, register):
+    await register()
+    stats = await generate(build_parser().parse_args(ARGS))
+
+    assert stats["rows"]["posts"] == 200
+    assert stats["rows"]["friendships"] == stats["friends_per_user"]["mean"] * 40
+    assert abs(stats["rows"]["likes"] - 1500) < 50
+    assert stats["id_ranges"]["users"] == [2, 41]
+
+    async with async_session_maker() as session:
+        likes = await session.scalar(select(func.count()).select_from(LikeModel))
+        newest = await session.scalar(select(func.max(PostModel.created_at)))
+    assert likes == stats["rows"]["likes"]
+    assert newest.isoformat() <= "2024-06-01T12:00:00"
+    # The stored counters already match the rows
+    assert await reconcile_counters(batch_size=100) == 0
+
+    # Generated posts were indexed, and the FTS trigger is back for new ones
+    assert (await client.get("/search", params={"q": "python"})).json()["items"]
+    _, alice = await register()
+    post = (await client.post("/posts/", json={"title": "загрузка", "content": "c"}, headers=alice)).json()
+    hits = (await client.get("/search", params={"q": "загрузка"})).json()["items"]
+    assert [hit["id"] for hit in hits] == [post["id"]]
@@ -0,0 +1,147 @@
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.database import Base
+from app.database.migrations import ensure_schema, include_object
+from app.services.data_init import SEED_MARKER_EMAIL, is_seeded
+
+pytestmark = pytest.mark.anyio
+
+# What the original startup's create_all built from the baseline models
+BASELINE_SCHEMA = [
+    """CREATE TABLE roles (
+        id INTEGER NOT NULL, name VARCHAR(50) NOT NULL, description VARCHAR(255),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id), UNIQUE (name))""",
+    """CREATE TABLE users (
+        id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, email VARCHAR(100) NOT NULL,
+        hashed_password VARCHAR(300) NOT NULL, is_admin BOOLEAN NOT NULL, role_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id), UNIQUE (email), FOREIGN KEY(role_id) REFERENCES roles (id))""",
+    """CREATE TABLE posts (
+        id INTEGER NOT NULL, title VARCHAR(200) NOT NULL, content TEXT NOT NULL, user_id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, likes_count INTEGER NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id))""",
+    """CREATE TABLE friendships (
+        id INTEGER NOT NULL, user_id INTEGER NOT NULL, friend_id INTEGER NOT NULL, created_at DATETIME NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id), FOREIGN KEY(friend_id) REFERENCES users (id))""",
+    """CREATE TABLE comments (
+        id INTEGER NOT NULL, content TEXT NOT NULL, user_id INTEGER NOT NULL, post_id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id), FOREIGN KEY(post_id) REFERENCES posts (id))""",
+    """CREATE TABLE likes (
+        id INTEGER NOT NULL, user_id INTEGER NOT NULL, post_id INTEGER NOT NULL, created_at DATETIME NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id), FOREIGN KEY(post_id) REFERENCES posts (id))""",
+]
+
+BASELINE_DATA = [
+    "INSERT INTO roles (id, name) VALUES (1, 'user')",
+    "INSERT INTO users (id, name, email, hashed_password, is_admin, role_id) VALUES "
+    "(1, 'alice', 'a@x.io', 'h', 0, 1), (2, 'bob', 'b@x.io', 'h', 0, 1)",
+    "INSERT INTO posts (id, title, content, user_id, created_at, updated_at, likes_count) VALUES "
+    "(1, 'привет', 'мир', 1, '2024-01-01', '2024-01-01', 0)",
+    "INSERT INTO comments (content, user_id, post_id, created_at, updated_at) VALUES "
+    "('hi', 2, 1, '2024-01-01', '2024-01-01')",
+    # No unique constraints before 005 and 008: a double like and a repeated friendship
+    "INSERT INTO likes (user_id, post_id, created_at) VALUES (2, 1, '2024-01-01'), (2, 1, '2024-01-02')",
+    "INSERT INTO friendships (user_id, friend_id, created_at) VALUES (1, 2, '2024-01-01'), (1, 2, '2024-01-02')",
+]
+
+
+def _diff(connection):
+    context = MigrationContext.configure(connection, opts={"include_object": include_object})
+    return compare_metadata(context, Base.metadata)
+
+
+def _indexes(connection) -> list[tuple]:
+    """
+    (table, columns, unique) of every index SQLite keeps, table constraints'
+    autoindexes included: compare_metadata does not see those
+    """
+    indexes = []
+    tables = connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'").scalars().all()
+    for table in tables:
+        for _, name, unique, origin, _ in connection.exec_driver_sql(f"PRAGMA index_list('{table}')"):
+            if origin == "pk":
+                continue
+            columns = tuple(row[2] for row in connection.exec_driver_sql(f"PRAGMA index_info('{name}')"))
+            indexes.append((table, columns, bool(unique)))
+    return sorted(indexes)
+
+
+async def _model_indexes(tmp_path) -> list[tuple]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'models.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            return await conn.run_sync(_indexes)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.sqlite_only
+async def test_migrations_build_the_model_schema(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrated.db'}")
+    try:
+        assert (await ensure_schema(engine)).startswith("upgraded empty database")
+        assert (await ensure_schema(engine)).startswith("up to date")
+        async with engine.connect() as conn:
+            assert await conn.run_sync(_diff) == []
+            # No unique index twice, e.g. 001's table constraints next to 005/008's
+            assert await conn.run_sync(_indexes) == await _model_indexes(tmp_path)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.sqlite_only
+async def test_baseline_create_all_databases_are_upgraded(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'baseline.db'}")
+    try:
+        async with engine.begin() as conn:
+            for statement in BASELINE_SCHEMA + BASELINE_DATA:
+                await conn.execute(text(statement))
+        assert (await ensure_schema(engine)).startswith("baseline create_all schema stamped at 001_initial")
+        assert (await ensure_schema(engine)).startswith("up to date")
+
+        async with engine.connect() as conn:
+            assert await conn.run_sync(_diff) == []
+            assert await conn.run_sync(_indexes) == await _model_indexes(tmp_path)
+            counters = (await conn.execute(text("SELECT likes_count, comments_count FROM posts"))).one()
+            assert tuple(counters) == (1, 1)
+            assert await conn.scalar(text("SELECT COUNT(*) FROM friendships")) == 1
+            assert await conn.scalar(text("SELECT rowid FROM posts_fts WHERE posts_fts MATCH 'привет'")) == 1
+            assert await conn.scalar(text("SELECT COUNT(*) FROM timeline_entries WHERE user_id = 2")) == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.sqlite_only
+async def test_create_all_databases_are_stamped(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # An index added to the model after the table was created
+            await conn.execute(text("DROP INDEX ix_posts_user_created"))
+        assert (await ensure_schema(engine)).startswith("create_all schema stamped")
+        assert (await ensure_schema(engine)).startswith("up to date")
+        async with engine.connect() as conn:
+            assert await conn.run_sync(_diff) == []
+    finally:
+        await engine.dispose()
+
+
+async def test_seed_check(client, register):
+    assert await is_seeded() is False
+    await client.post(
+        "/auth/register",
+        json={"name": "alice", "email": SEED_MARKER_EMAIL, "password": "secret1"},
+    )
+    assert await is_seeded() is True
@@ -0,0 +1,67 @@
+import pytest
+
+from app.api.friends import get_my_friends
+from app.database.database import read_session_maker
+from app.database.db_manager import DBManager
+from app.database.nplusone import NPlusOneError, fingerprint
+from app.models.users import UserModel
+
+pytestmark = pytest.mark.anyio
+
+
+async def _with_friends(client, register, count: int):
+    me, headers = await register()
+    for _ in range(count):
+        friend_id, _ = await register()
+        response = await client.post(f"/auth/users/{friend_id}/friend", headers=headers)
+        assert response.status_code in (200, 201), response.text
+    return me, headers
+
+
+def test_fingerprint_strips_literals():
+    assert fingerprint("SELECT * FROM users WHERE id = 7 AND name = 'x''y'") == \
+        fingerprint("SELECT * FROM users\n WHERE id = ? AND name = ?")
+    assert fingerprint("SELECT * FROM likes WHERE post_id IN (?, ?, ?)") == \
+        fingerprint("SELECT * FROM likes WHERE post_id IN (?, ?)")
+
+
+async def test_repeats_are_reported_with_call_site(client, register, n_plus_one):
+    _, headers = await register()
+    with pytest.raises(NPlusOneError) as error:
+        with n_plus_one(threshold=2):
+            for _ in range(4):
+                await client.get("/auth/me", headers=headers)
+    assert "FROM users" in str(error.value)
+    assert "app/api/dependencies.py" in str(error.value)
+
+
+async def test_auth_friends_is_one_query(client, register, n_plus_one):
+    _, headers = await _with_friends(client, register, 5)
+    with n_plus_one(threshold=1):
+        response = await client.get("/auth/friends", headers=headers)
+    assert len(response.json()) == 5
+
+
+async def test_get_my_friends_is_one_query(client, register, n_plus_one):
+    me, _ = await _with_friends(client, register, 5)
+    async with DBManager(session_factory=read_session_maker, side="read") as db:
+        user = await db.session.get(UserModel, me)
+        with n_plus_one(threshold=1):
+            friends = await get_my_friends(db=db, current_user=user)
+    assert len(friends) == 5
+    assert all("added_at" in friend for friend in friends)
+
+
+async def test_post_lists_have_no_n_plus_one(client, register, n_plus_one):
+    authors = [await register() for _ in range(3)]
+    for author_id, headers in authors:
+        for i in range(4):
+            post = (await client.post("/posts/", json={"title": f"t{i}", "content": "c"}, headers=headers)).json()
+            await client.post(f"/posts/{post['id']}/comments", json={"content": "hi"}, headers=headers)
+            await client.put(f"/posts/{post['id']}/like", json={"liked": True}, headers=headers)
+
+    author_id, headers = authors[0]
+    with n_plus_one(threshold=1):
+        assert len((await client.get("/posts/", headers=headers)).json()) == 12
+    with n_plus_one(threshold=1):
+        assert len((await client.get(f"/posts/user/{author_id}", headers=headers)).json()) == 4
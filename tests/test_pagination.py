@@ -0,0 +1,72 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_posts(client, headers, count: int) -> list[int]:
+    ids = []
+    for i in range(count):
+        response = await client.post("/posts/", json={"title": f"post {i}", "content": "content"}, headers=headers)
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def test_cursor_pages_are_stable_when_new_posts_arrive(client, register):
+    _, headers = await register()
+    post_ids = await _create_posts(client, headers, 5)
+
+    first = (await client.get("/posts/", params={"cursor": "", "limit": 2})).json()
+    assert [p["id"] for p in first["items"]] == list(reversed(post_ids))[:2]
+    assert first["next_cursor"]
+
+    await _create_posts(client, headers, 2)
+
+    seen = [p["id"] for p in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = (await client.get("/posts/", params={"cursor": cursor, "limit": 2})).json()
+        seen += [p["id"] for p in page["items"]]
+        cursor = page["next_cursor"]
+
+    assert seen == list(reversed(post_ids))
+
+
+async def test_offset_mode_still_returns_a_plain_list(client, register):
+    user_id, headers = await register()
+    await _create_posts(client, headers, 3)
+
+    response = await client.get(f"/posts/user/{user_id}", params={"skip": 1, "limit": 1})
+    assert isinstance(response.json(), list)
+    assert len(response.json()) == 1
+
+
+async def test_comments_cursor_pagination(client, register):
+    _, headers = await register()
+    [post_id] = await _create_posts(client, headers, 1)
+    for i in range(3):
+        await client.post(f"/posts/{post_id}/comments", json={"content": f"comment {i}"}, headers=headers)
+
+    page = (await client.get(f"/posts/{post_id}/comments", params={"cursor": "", "limit": 2})).json()
+    assert [c["content"] for c in page["items"]] == ["comment 2", "comment 1"]
+    last = (await client.get(f"/posts/{post_id}/comments", params={"cursor": page["next_cursor"], "limit": 2})).json()
+    assert [c["content"] for c in last["items"]] == ["comment 0"]
+    assert last["next_cursor"] is None
+
+
+async def test_invalid_cursor_is_rejected(client):
+    response = await client.get("/posts/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+async def test_legacy_lists_keep_their_default_page_size(client, register):
+    user_id, headers = await register()
+    post_ids = await _create_posts(client, headers, 105)
+    for post_id in post_ids:
+        await client.post(f"/posts/{post_id}/like", headers=headers)
+    for i in range(25):
+        await client.post(f"/posts/{post_ids[0]}/comments", json={"content": f"comment {i}"}, headers=headers)
+
+    # /likes/user was never limited, comment listings returned 20
+    assert len((await client.get(f"/likes/user/{user_id}")).json()) == 105
+    assert len((await client.get(f"/likes/user/{user_id}", params={"cursor": ""})).json()["items"]) == 100
+    assert len((await client.get(f"/posts/{post_ids[0]}/comments")).json()) == 20
@@ -0,0 +1,110 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _seed_feed(client, register, posts: int = 5):
+    authors = [await register() for _ in range(posts)]
+    post_ids = []
+    for _, headers in authors:
+        response = await client.post("/posts/", json={"title": "title", "content": "content"}, headers=headers)
+        post_ids.append(response.json()["id"])
+    for _, headers in authors:
+        for post_id in post_ids[:3]:
+            await client.post(f"/posts/{post_id}/like", headers=headers)
+    return authors, post_ids
+
+
+async def test_feed_is_assembled_without_n_plus_one(client, register, count_queries):
+    await _seed_feed(client, register)
+
+    count_queries.clear()
+    response = await client.get("/posts/", params={"limit": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert len(count_queries) <= 2, count_queries
+
+
+async def test_feed_returns_author_and_like_count(client, register):
+    authors, post_ids = await _seed_feed(client, register)
+
+    posts = {p["id"]: p for p in (await client.get("/posts/")).json()}
+    assert posts[post_ids[0]]["likes_count"] == 5
+    assert posts[post_ids[4]]["likes_count"] == 0
+    assert posts[post_ids[0]]["author_name"] == "user0001"
+
+    user_id, _ = authors[1]
+    user_posts = (await client.get(f"/posts/user/{user_id}")).json()
+    assert [p["id"] for p in user_posts] == [post_ids[1]]
+    assert user_posts[0]["likes_count"] == 5
+
+    single = (await client.get(f"/posts/{post_ids[2]}")).json()
+    assert single["likes_count"] == 5
+    assert single["author_email"] == "user3@test.io"
+
+
+async def test_liked_by_me_is_resolved_in_one_query(client, register, count_queries):
+    authors, post_ids = await _seed_feed(client, register)
+    viewer = authors[0][1]
+
+    await client.get("/posts/")  # warm the shared page cache
+    count_queries.clear()
+    guest = (await client.get("/posts/")).json()
+    assert count_queries == []
+    assert {p["liked_by_me"] for p in guest} == {None}
+
+    mine = {p["id"]: p["liked_by_me"] for p in (await client.get("/posts/", headers=viewer)).json()}
+    assert len(count_queries) == 1, count_queries
+    assert mine == {post_id: post_id in post_ids[:3] for post_id in post_ids}
+
+    single = (await client.get(f"/posts/{post_ids[4]}", headers=viewer)).json()
+    assert single["liked_by_me"] is False
+    batch = (await client.get("/posts/batch", params={"ids": post_ids[0]}, headers=viewer)).json()
+    assert batch["items"][0]["liked_by_me"] is True
+
+
+async def test_feed_embeds_comment_previews_in_one_query(client, register, count_queries):
+    authors, post_ids = await _seed_feed(client, register, posts=3)
+    for n in range(4):
+        await client.post(f"/posts/{post_ids[0]}/comments", json={"content": f"c{n}"}, headers=authors[n % 2][1])
+    await client.post(f"/posts/{post_ids[1]}/comments", json={"content": "only"}, headers=authors[2][1])
+
+    count_queries.clear()
+    response = await client.get("/posts/", params={"include": "comments_preview", "preview_size": 2})
+    assert len(count_queries) == 2, count_queries
+
+    posts = {p["id"]: p for p in response.json()}
+    first = posts[post_ids[0]]
+    assert [c["content"] for c in first["comments_preview"]] == ["c3", "c2"]
+    assert first["comments_preview"][0]["author_username"] == "user0002"
+    assert first["comments_count"] == 4
+    assert [c["content"] for c in posts[post_ids[1]]["comments_preview"]] == ["only"]
+    assert posts[post_ids[2]]["comments_preview"] == []
+
+    assert (await client.get("/posts/")).json()[0]["comments_preview"] is None
+    assert (await client.get("/posts/", params={"include": "everything"})).status_code == 422
+
+    await client.post(f"/posts/{post_ids[0]}/comments", json={"content": "c4"}, headers=authors[0][1])
+    posts = {p["id"]: p for p in (await client.get("/posts/", params={"include": "comments_preview", "preview_size": 2})).json()}
+    assert [c["content"] for c in posts[post_ids[0]]["comments_preview"]] == ["c4", "c3"]
+
+
+async def test_batch_lookup_keeps_order_and_reports_missing(client, register, count_queries):
+    _, post_ids = await _seed_feed(client, register, posts=3)
+
+    count_queries.clear()
+    response = await client.get("/posts/batch", params={"ids": f"{post_ids[2]},999,{post_ids[0]}"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["id"] for p in body["items"]] == [post_ids[2], post_ids[0]]
+    assert body["items"][1]["likes_count"] == 3
+    assert body["missing"] == [999]
+    assert len(count_queries) == 1
+
+
+async def test_batch_lookup_validates_ids(client):
+    assert (await client.get("/posts/batch", params={"ids": "1,x"})).status_code == 422
+    too_many = ",".join(str(i) for i in range(1, 302))
+    assert (await client.get("/posts/batch", params={"ids": too_many})).status_code == 422
@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.database import Base, async_session_maker, engine
+from app.database.query_advisor import advise
+
+pytestmark = [pytest.mark.anyio, pytest.mark.sqlite_only]
+
+
+async def test_hot_queries_use_indexes(client):
+    warnings = await advise(async_session_maker, set(Base.metadata.tables))
+    assert warnings == []
+
+
+async def test_missing_index_is_reported(client):
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_comments_post_created"))
+
+    warnings = await advise(async_session_maker, {"comments"})
+    assert {w.query for w in warnings} >= {"CommentRepository.get_post_comments", "CommentRepository.get_previews"}
+    assert all(w.table == "comments" and w.detail.startswith("SCAN") for w in warnings)
@@ -0,0 +1,49 @@
+import re
+
+import httpx
+import pytest
+
+from app.api.middleware import QueryStatsMiddleware
+from app.database.database import engine, read_engine
+from app.database.query_stats import collect_queries, track_queries, untrack_queries
+from main import app
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def debug_client(client):
+    """The app as DEBUG=true serves it: statement tracking on and stats headers sent"""
+    for target in (engine, read_engine):
+        track_queries(target)
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=QueryStatsMiddleware(app, headers=True)),
+            base_url="http://test",
+        ) as debug_client:
+            yield debug_client
+    finally:
+        for target in (engine, read_engine):
+            untrack_queries(target)
+
+
+async def test_responses_carry_query_stats(debug_client, register):
+    _, alice = await register()
+    for i in range(3):
+        await debug_client.post("/posts/", json={"title": f"t{i}", "content": "c"}, headers=alice)
+
+    response = await debug_client.get("/posts/", headers=alice)
+    queries = int(response.headers["X-DB-Queries"])
+    assert queries > 0
+    timing = re.fullmatch(r'db;dur=([\d.]+);desc="(\d+) queries, (\d+) rows"', response.headers["Server-Timing"])
+    assert timing and int(timing.group(2)) == queries
+    assert int(timing.group(3)) >= 3
+
+    response = await debug_client.get("/health")
+    assert response.headers["X-DB-Queries"] == "0"
+
+
+async def test_nothing_is_counted_while_untracked(client, register):
+    with collect_queries() as stats:
+        await register()
+    assert stats.count == 0
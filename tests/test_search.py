@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.services.search import SearchService
+
+pytestmark = pytest.mark.anyio
+
+
+async def _post(client, headers, title, content):
+    response = await client.post("/posts/", json={"title": title, "content": content}, headers=headers)
+    return response.json()["id"]
+
+
+async def _search(client, **params):
+    response = await client.get("/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_cyrillic_search_is_case_insensitive_and_prefix(client, register):
+    _, alice = await register()
+    in_title = await _post(client, alice, "Привет из Москвы", "Просто текст")
+    in_body = await _post(client, alice, "Заметка", "Всем привет и хорошего дня")
+    await _post(client, alice, "Другое", "Ничего общего")
+    await client.post(f"/posts/{in_body}/comments", json={"content": "ПРИВЕТСТВУЮ всех"}, headers=alice)
+
+    hits = (await _search(client, q="привет"))["items"]
+    assert {(h["kind"], h["post_id"]) for h in hits} == {("post", in_title), ("post", in_body), ("comment", in_body)}
+    # A title hit outranks a body hit
+    posts = [h["id"] for h in hits if h["kind"] == "post"]
+    assert posts == [in_title, in_body]
+    assert "<mark>" in hits[0]["snippet"]
+
+    assert [h["id"] for h in (await _search(client, q="моск"))["items"]] == [in_title]
+    assert [h["kind"] for h in (await _search(client, q="привет", scope="comments"))["items"]] == ["comment"]
+    # FTS5 syntax in user input is treated as plain words
+    assert (await _search(client, q='"OR* (NEAR'))["items"] == []
+
+
+async def test_index_follows_edits_and_deletes(client, register):
+    _, alice = await register()
+    post_id = await _post(client, alice, "Старый заголовок", "текст")
+
+    await client.put(f"/posts/{post_id}", json={"title": "Новый заголовок"}, headers=alice)
+    await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=alice)
+    assert (await _search(client, q="старый"))["items"] == []
+    assert [h["id"] for h in (await _search(client, q="новый"))["items"]] == [post_id]
+
+    await client.delete(f"/posts/{post_id}", headers=alice)
+    assert (await _search(client, q="новый"))["items"] == []
+
+
+async def test_search_pages_with_keyset_cursor(client, register):
+    _, alice = await register()
+    for n in range(5):
+        await _post(client, alice, f"Пост {n}", "лето " * (n + 1))
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = await _search(client, q="лето", limit=2, **({"cursor": cursor} if cursor else {}))
+        seen += [h["id"] for h in page["items"]]
+        cursor = page["next_cursor"]
+    assert len(seen) == len(set(seen)) == 5
+
+    assert (await client.get("/search", params={"q": "лето", "cursor": "x"})).status_code == 400
+
+
+async def test_rebuild_restores_index(client, register):
+    _, alice = await register()
+    post_id = await _post(client, alice, "Осень", "листья")
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        await db.session.execute(text("INSERT INTO posts_fts(posts_fts) VALUES('delete-all')"))
+        await db.commit()
+    assert (await _search(client, q="осень"))["items"] == []
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        await SearchService(db).rebuild()
+    assert [h["id"] for h in (await _search(client, q="осень"))["items"]] == [post_id]
@@ -0,0 +1,16 @@
+import pytest
+
+pytestmark = [pytest.mark.anyio, pytest.mark.sqlite_only]
+
+
+async def test_connections_run_with_the_configured_profile(client):
+    report = (await client.get("/diagnostics/sqlite")).json()
+
+    assert report["profile"] == "balanced"
+    actual = report["actual"]
+    assert actual["journal_mode"] == "wal"
+    assert actual["synchronous"] == 1  # NORMAL
+    assert actual["busy_timeout"] == 5000
+    assert actual["cache_size"] == -64000
+    assert actual["temp_store"] == 2  # MEMORY
+    assert actual["mmap_size"] == report["configured"]["mmap_size"]
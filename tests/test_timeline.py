@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.models.users import UserModel
+
+pytestmark = pytest.mark.anyio
+
+
+async def _post(client, headers, title: str) -> int:
+    response = await client.post("/posts/", json={"title": title, "content": "content"}, headers=headers)
+    return response.json()["id"]
+
+
+async def _timeline_titles(client, headers, **params) -> list[str]:
+    response = await client.get("/posts/timeline", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return [p["title"] for p in response.json()]
+
+
+async def test_timeline_follows_friendships(client, register):
+    _, alice = await register()
+    bob_id, bob = await register()
+    _, carol = await register()
+
+    await _post(client, bob, "bob before")
+    await _post(client, carol, "carol")
+    await client.post(f"/auth/users/{bob_id}/friend", headers=alice)
+    await _post(client, bob, "bob after")
+    await _post(client, alice, "alice")
+
+    assert await _timeline_titles(client, alice) == ["alice", "bob after", "bob before"]
+    assert await _timeline_titles(client, bob) == ["alice", "bob after", "bob before"]
+
+    await client.delete(f"/auth/users/{bob_id}/friend", headers=alice)
+    assert await _timeline_titles(client, alice) == ["alice"]
+
+
+async def test_timeline_is_capped(client, register, monkeypatch):
+    monkeypatch.setattr(settings, "TIMELINE_MAX_ENTRIES", 2)
+    _, alice = await register()
+    for i in range(4):
+        await _post(client, alice, f"post {i}")
+
+    assert await _timeline_titles(client, alice, limit=10) == ["post 3", "post 2"]
+
+
+async def test_high_fanout_authors_are_merged_on_read(client, register, monkeypatch):
+    monkeypatch.setattr(settings, "TIMELINE_FANOUT_MAX_FRIENDS", 0)
+    _, alice = await register()
+    bob_id, bob = await register()
+    await client.post(f"/auth/users/{bob_id}/friend", headers=alice)
+
+    await _post(client, alice, "alice")
+    await _post(client, bob, "bob")
+
+    assert await _timeline_titles(client, alice) == ["bob", "alice"]
+    page = (await client.get("/posts/timeline", headers=alice, params={"cursor": "", "limit": 1})).json()
+    assert [p["title"] for p in page["items"]] == ["bob"]
+    page = (await client.get("/posts/timeline", headers=alice, params={"cursor": page["next_cursor"], "limit": 1})).json()
+    assert [p["title"] for p in page["items"]] == ["alice"]
+
+
+async def test_friendships_count_follows_add_and_remove(client, register, monkeypatch):
+    monkeypatch.setattr(settings, "TIMELINE_FANOUT_MAX_FRIENDS", 1)
+    alice_id, alice = await register()
+    bob_id, bob = await register()
+    carol_id, carol = await register()
+
+    async def counts() -> list[int]:
+        async with async_session_maker() as session:
+            rows = await session.execute(
+                select(UserModel.friendships_count).where(UserModel.id.in_((alice_id, bob_id, carol_id))).order_by(UserModel.id)
+            )
+            return list(rows.scalars())
+
+    await client.post(f"/auth/users/{bob_id}/friend", headers=alice)
+    await client.post(f"/auth/users/{carol_id}/friend", headers=alice)
+    assert await counts() == [2, 1, 1]
+
+    # Alice is now above the threshold: pulled on read instead of pushed
+    await _post(client, alice, "alice")
+    assert await _timeline_titles(client, bob) == ["alice"]
+
+    await client.delete(f"/auth/users/{carol_id}/friend", headers=alice)
+    assert await counts() == [1, 1, 0]
+    assert await _timeline_titles(client, carol) == []
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.trending import TrendingRecomputer, hot_score
+
+pytestmark = pytest.mark.anyio
+
+
+def test_recent_engagement_outweighs_old():
+    now = datetime(2026, 10, 18, 12)
+    fresh = hot_score([(now, 1.0), (now, 3.0)], half_life_hours=12)
+    stale = hot_score([(now - timedelta(hours=24), 1.0), (now - timedelta(hours=24), 10.0)], half_life_hours=12)
+    assert fresh > stale  # 4 now beats 11 a day (two half-lives) ago
+
+
+async def test_trending_ranks_and_recomputes_incrementally(client, register):
+    users = [await register() for _ in range(6)]
+    alice = users[0][1]
+    ids = {}
+    for name in ("liked", "commented", "quiet"):
+        ids[name] = (await client.post("/posts/", json={"title": name, "content": "c"}, headers=alice)).json()["id"]
+    for _, headers in users[1:4]:
+        await client.put(f"/posts/{ids['liked']}/like", json={"liked": True}, headers=headers)
+    await client.post(f"/posts/{ids['commented']}/comments", json={"content": "!"}, headers=users[1][1])
+
+    recomputer = TrendingRecomputer(interval_seconds=0, overlap=timedelta(0))
+    assert await recomputer.run_once() == 3
+
+    page = (await client.get("/posts/trending")).json()
+    assert [p["id"] for p in page["items"]] == [ids["liked"], ids["commented"], ids["quiet"]]
+
+    for _, headers in users[1:6]:
+        await client.put(f"/posts/{ids['quiet']}/like", json={"liked": True}, headers=headers)
+    # Only the post that got new engagement is rescored
+    assert await recomputer.run_once() == 1
+
+    first = (await client.get("/posts/trending", params={"limit": 2})).json()
+    assert [p["id"] for p in first["items"]] == [ids["quiet"], ids["liked"]]
+    rest = (await client.get("/posts/trending", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    assert [p["id"] for p in rest["items"]] == [ids["commented"]]
+    assert rest["next_cursor"] is None
+
+    await client.delete(f"/posts/{ids['quiet']}", headers=alice)
+    assert ids["quiet"] not in [p["id"] for p in (await client.get("/posts/trending")).json()["items"]]
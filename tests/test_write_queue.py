@@ -0,0 +1,91 @@
+import sqlite3
+
+import anyio
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import engine, read_engine, read_session_maker
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue, WriteQueueStats, write_queue
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.sqlite_only
+async def test_get_requests_read_through_the_read_pool(client, register):
+    _, alice = await register()
+    statements = {"read": [], "write": []}
+
+    def _collect(side):
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements[side].append(statement)
+        return _before_cursor_execute
+
+    listeners = [(read_engine, _collect("read")), (engine, _collect("write"))]
+    for target, listener in listeners:
+        event.listen(target.sync_engine, "before_cursor_execute", listener)
+    try:
+        await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)
+        # The user lookup reads; the writer is only claimed for the INSERT
+        assert statements["read"] and all(statement.startswith("SELECT") for statement in statements["read"])
+        assert statements["write"][0] == "BEGIN IMMEDIATE"
+        assert statements["write"][1].startswith("INSERT INTO posts")
+
+        statements["write"].clear()
+        assert (await client.get("/posts/", headers=alice)).status_code == 200
+        assert statements["read"] and statements["write"] == []
+    finally:
+        for target, listener in listeners:
+            event.remove(target.sync_engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.sqlite_only
+async def test_read_side_cannot_write(client):
+    async with DBManager(session_factory=read_session_maker, side="read") as db:
+        assert db.side == "read"
+        with pytest.raises(OperationalError, match="readonly"):
+            await db.session.execute(text("INSERT INTO roles (name, description) VALUES ('x', 'y')"))
+
+
+@pytest.mark.sqlite_only
+async def test_concurrent_writes_wait_in_the_queue(client, register):
+    _, alice = await register()
+    post_id = (await client.post("/posts/", json={"title": "t", "content": "c"}, headers=alice)).json()["id"]
+    likers = [await register() for _ in range(8)]
+    write_queue.stats = WriteQueueStats()
+
+    statuses = []
+
+    async def like(headers):
+        response = await client.put(f"/posts/{post_id}/like", json={"liked": True}, headers=headers)
+        statuses.append(response.status_code)
+
+    async with anyio.create_task_group() as tg:
+        for _, headers in likers:
+            tg.start_soon(like, headers)
+
+    assert statuses == [200] * len(likers)
+    assert (await client.get(f"/posts/{post_id}")).json()["likes_count"] == len(likers)
+    stats = write_queue.snapshot()
+    assert stats["transactions"] == len(likers)
+    assert stats["max_depth"] > 1
+    assert stats["depth"] == 0
+
+
+async def test_busy_is_retried_with_backoff():
+    queue = WriteQueue(busy_retries=2, busy_backoff_ms=1)
+    failures = iter([True, True, False])
+
+    async def begin():
+        if next(failures):
+            raise OperationalError("BEGIN IMMEDIATE", {}, sqlite3.OperationalError("database is locked"))
+        return "began"
+
+    assert await queue.retry_busy(begin) == "began"
+    assert queue.stats.busy_retries == 2
+
+    failures = iter([True] * 3)
+    with pytest.raises(OperationalError):
+        await queue.retry_busy(begin)
+    assert queue.stats.busy_failures == 1